@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmarks for the WiFi Stress Log Analyzer.
+
+Usage:
+  python3 analyzer_bench.py filenames --count 200000
+  python3 analyzer_bench.py metadata --log-dir <folder>
+  python3 analyzer_bench.py suite --count 100000 --json bench.json [--root /tmp/corpus]
+  python3 analyzer_bench.py compare baseline.json bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import wifi_stress_log_analyzer as analyzer
+from log_corpus import BODY_SIZES, generate_filenames, generate_log_tree
+
+# compare: a step is reported as a regression when it is this much slower.
+REGRESSION_TOLERANCE = 0.10
+
+
+def _reference_parse(name: str) -> Optional[analyzer.LogRecord]:
+    # Per-name logic of the original parse_log_directory_raw loop.
+    if not name.lower().endswith(".txt"):
+        return None
+    if analyzer._is_excluded_by_name(name):
+        return None
+    return analyzer._try_parse_record_from_filename(name)
+
+
+def _time_parser(parse: Callable[[str], Optional[analyzer.LogRecord]], names: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for name in names:
+            parse(name)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_filenames(count: int, seed: int, repeat: int) -> int:
+    names = list(generate_filenames(count, seed=seed))
+
+    mismatches = 0
+    for name in names:
+        if _reference_parse(name) != analyzer._parse_log_filename(name):
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH: {name!r}")
+
+    ref_s = _time_parser(_reference_parse, names, repeat)
+    fast_s = _time_parser(analyzer._parse_log_filename, names, repeat)
+
+    print(f"Corpus: {count} names (seed {seed}), best of {repeat}")
+    print(f"  regex + strptime : {count / ref_s:12,.0f} files/s")
+    print(f"  fast path        : {count / fast_s:12,.0f} files/s  ({ref_s / fast_s:.2f}x)")
+    print(f"  mismatches       : {mismatches}")
+    return 1 if mismatches else 0
+
+
+def bench_metadata(log_dir: str, repeat: int) -> int:
+    records = analyzer.parse_log_directory_raw(log_dir)
+    if not records:
+        print(f"No logs in {log_dir}")
+        return 1
+    paths = [r.path for r in records]
+
+    def _run(read: Callable[[str], object]) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for path in paths:
+                read(path)
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    full_s = _run(analyzer.parse_log_content_metrics)
+    head_tail_s = _run(analyzer.read_log_metadata)
+    count = len(paths)
+
+    print(f"Logs: {count} in {log_dir}, best of {repeat} (warm page cache)")
+    print(f"  full body scan   : {count / full_s:12,.0f} files/s")
+    print(f"  header + footer  : {count / head_tail_s:12,.0f} files/s  ({full_s / head_tail_s:.2f}x)")
+    return 0
+
+
+def _timed(results: Dict[str, dict], name: str, items: int, fn: Callable[[], object]) -> object:
+    t0 = time.perf_counter()
+    value = fn()
+    seconds = time.perf_counter() - t0
+    results[name] = {
+        "seconds": round(seconds, 6),
+        "items": items,
+        "items_per_s": round(items / seconds, 1) if seconds > 0 else None,
+    }
+    print(f"  {name:<18} {seconds:9.3f} s  {items:>10,} items  {items / max(seconds, 1e-9):12,.0f} /s", flush=True)
+    return value
+
+
+def run_suite(
+    root: str,
+    count: int,
+    seed: int,
+    body: str,
+    layout: str,
+    content_sample: int,
+    generate: bool = True,
+) -> dict:
+    """Time each analyzer stage on a generated log tree; returns a JSON-ready dict."""
+    results: Dict[str, dict] = {}
+    print(f"Corpus: {count:,} files ({body} bodies, {layout}) under {root}", flush=True)
+    generate_s = None
+    if generate:
+        t0 = time.perf_counter()
+        generate_log_tree(root, count, seed=seed, body=body, layout=layout)
+        generate_s = round(time.perf_counter() - t0, 3)
+        print(f"  generated in {generate_s:.1f} s", flush=True)
+
+    folders = [root] if layout == "flat" else sorted(e.path for e in os.scandir(root) if e.is_dir())
+
+    def _parse_all() -> List[analyzer.LogRecord]:
+        raw: List[analyzer.LogRecord] = []
+        for folder in folders:
+            raw.extend(analyzer.parse_log_directory_raw(folder))
+        raw.sort(key=lambda r: r.dt)
+        return raw
+
+    raw = _timed(results, "parse_directory", count, _parse_all)
+    _timed(results, "merge_roots", count, lambda: list(analyzer.parse_log_roots_merged([root])))
+    deduped = _timed(results, "dedupe", len(raw), lambda: analyzer._dedupe_keep_latest_by_sn(raw))
+
+    out_dir = tempfile.mkdtemp(prefix="analyzer_bench_")
+    try:
+
+        def _report() -> None:
+            acc = analyzer.ReportAccumulator().extend(raw)
+            csv_path, txt_path = analyzer.report_paths(out_dir, "BENCH")
+            acc.write_csv(csv_path, "BENCH")
+            acc.write_yield_txt(txt_path, "BENCH")
+
+        _timed(results, "report", len(raw), _report)
+
+        # GUI re-runs: aggregates cached per record snapshot, new logs added on top.
+        cache = analyzer.ReportCache()
+        head = raw[: len(raw) - len(raw) // 100]
+        cache.put("bench", head, analyzer.ReportAccumulator().extend(head), {})
+
+        def _cached_report() -> None:
+            acc, failures, pending = cache.take("bench", raw)
+            acc.extend(pending)
+            cache.put("bench", raw, acc, failures)
+            csv_path, txt_path = analyzer.report_paths(out_dir, "BENCH")
+            acc.write_csv(csv_path, "BENCH")
+            acc.write_yield_txt(txt_path, "BENCH")
+
+        _timed(results, "report_delta_1pct", len(raw), _cached_report)
+        _timed(results, "report_cached", len(raw), _cached_report)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    if analyzer.np is not None:
+        _timed(results, "stats", len(raw), lambda: analyzer.compute_yield_stats(raw))
+
+    if BODY_SIZES[body][0]:
+        sample = raw[:content_sample] if content_sample else raw
+        _timed(results, "metadata", len(sample), lambda: analyzer.parse_log_metadata(sample))
+        metrics = _timed(results, "contents", len(sample), lambda: analyzer.parse_log_contents(sample))
+        if analyzer.np is not None:
+            _timed(results, "trend", len(sample), lambda: analyzer.TrendDetector().add(sample, metrics))
+        fails = [r for r in sample if r.result == "FAIL"]
+        _timed(results, "classify_failures", len(fails), lambda: analyzer.classify_failures(fails))
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "analyzer_version": analyzer.APP_VERSION,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "corpus": {
+            "count": count,
+            "seed": seed,
+            "body": body,
+            "layout": layout,
+            "records": len(raw),
+            "final_records": len(deduped),
+            "generate_seconds": generate_s,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline_path: str, current_path: str, tolerance: float) -> int:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(current_path, "r", encoding="utf-8") as f:
+        current = json.load(f)
+
+    corpus_keys = ("count", "seed", "body", "layout")
+    if any(baseline["corpus"].get(k) != current["corpus"].get(k) for k in corpus_keys):
+        print("Warning: corpus differs between the two runs; rates are still compared.")
+
+    regressions = 0
+    print(f"{'step':<18} {'baseline /s':>14} {'current /s':>14} {'change':>8}")
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base.get("items_per_s") or not cur.get("items_per_s"):
+            continue
+        change = cur["items_per_s"] / base["items_per_s"] - 1.0
+        flag = ""
+        if change < -tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<18} {base['items_per_s']:>14,.0f} {cur['items_per_s']:>14,.0f} {change:>+7.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="WiFi Stress Log Analyzer benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fn = sub.add_parser("filenames", help="Filename parser throughput (fast path vs regex)")
+    fn.add_argument("--count", type=int, default=200000)
+    fn.add_argument("--seed", type=int, default=0)
+    fn.add_argument("--repeat", type=int, default=3)
+
+    md = sub.add_parser("metadata", help="Header/footer metadata reads vs full log body scan")
+    md.add_argument("--log-dir", required=True)
+    md.add_argument("--repeat", type=int, default=3)
+
+    su = sub.add_parser("suite", help="Generate a log tree and time parse/dedupe/report/stats/content stages")
+    su.add_argument("--count", type=int, default=10000, help="Files in the corpus (1k .. 10M)")
+    su.add_argument("--seed", type=int, default=0)
+    su.add_argument("--body", choices=sorted(BODY_SIZES), default="short")
+    su.add_argument("--layout", choices=["dated", "flat"], default="dated")
+    su.add_argument("--root", help="Corpus folder (default: a temp folder, removed afterwards)")
+    su.add_argument("--reuse", action="store_true", help="--root already holds the corpus; do not generate it")
+    su.add_argument(
+        "--content-sample",
+        type=int,
+        default=100000,
+        help="Logs used for the metadata/content/classify steps (0 = all; default: %(default)s)",
+    )
+    su.add_argument("--json", metavar="PATH", help="Write the results as JSON")
+
+    cp = sub.add_parser("compare", help="Compare two suite JSON files; exit 1 on regressions")
+    cp.add_argument("baseline")
+    cp.add_argument("current")
+    cp.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "suite":
+        root = args.root or tempfile.mkdtemp(prefix="wifi_log_corpus_")
+        try:
+            result = run_suite(
+                root,
+                args.count,
+                args.seed,
+                args.body,
+                args.layout,
+                args.content_sample,
+                generate=not args.reuse,
+            )
+        finally:
+            if not args.root:
+                shutil.rmtree(root, ignore_errors=True)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"Results: {args.json}")
+        return 0
+    if args.command == "compare":
+        return compare_results(args.baseline, args.current, args.tolerance)
+    if args.command == "filenames":
+        return bench_filenames(args.count, args.seed, args.repeat)
+    if args.command == "metadata":
+        return bench_metadata(args.log_dir, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,10 @@
 # - Explicit exit code handling: ok=1 → exit 0 (pass), ok=0 → exit 1 (fail)
 # - Ensures GUI can properly read test results even when HCI device fails
 # - Prevents test from hanging indefinitely when hci0/hciX devices don't appear
+#
+# 2026-10-19: Machine-readable markers (-m/--markers before the MAC, or QC_MARKERS=1)
+# - Prints "@@QC <event> key=value ... t=<DUT uptime>" lines: begin/end of the
+#   test, every l2ping attempt and the final verdict (also on the early exits)
 #################################################################################
 
 RSSI_LIMIT=-60
@@ -36,11 +40,26 @@ stop_existing_processes() {
 #    or: bash bt_ping.sh E8:48:B8:C8:20:00
 # If not set, will use scan result
 BT_TARGET_MAC=${BT_MAC:-""}
+# Usage with markers: bash bt_ping.sh -m E8:48:B8:C8:20:00
+QC_MARKERS=${QC_MARKERS:-0}
+if [ "$1" = "-m" ] || [ "$1" = "--markers" ]; then
+    QC_MARKERS=1
+    shift
+fi
 # Check if MAC is provided as command-line argument
 if [ -n "$1" ]; then
     BT_TARGET_MAC="$1"
 fi
 
+# Print one machine-readable marker line: @@QC <event> key=value ... t=<DUT uptime seconds>
+qc_marker() {
+    [ "$QC_MARKERS" = "1" ] || return 0
+    read -r qc_up qc_rest </proc/uptime
+    echo "@@QC $* t=$qc_up"
+}
+
+qc_marker begin phase=bt
+
 WIFI_DEV=/sys/bus/mmc/devices/mmc?\:0001/mmc?\:0001\:1/device
 WIFI_CHIP_ID=$(cat $WIFI_DEV)
 platform=$(tr </sys/firmware/devicetree/base/model '[:upper:]' '[:lower:]')
@@ -195,6 +214,8 @@ if [ -z "$hciif" ]; then
         echo "Bluetooth Test Result: FAILED"
         echo "Reason: HCI device not detected"
         echo "========================================"
+        qc_marker end phase=bt result=FAIL reason=hci
+        qc_marker verdict test=bt result=FAIL
         exit 1
 fi
 
@@ -215,6 +236,8 @@ then
        if [ "$bt_status" -eq 0 ]; then
                echo "Error: BT device failed to come up"
                echo "Bluetooth Test Result: FAILED (Device not ready)"
+               qc_marker end phase=bt result=FAIL reason=down
+               qc_marker verdict test=bt result=FAIL
                exit 1
        fi
        echo "BT device is up and ready"
@@ -285,14 +308,19 @@ then
                                         echo "L2ping result: $stats"
                                         
                                         # Check for packet loss
-                                        if echo "$stats" | grep -q "0% loss"; then
+                                        # (a plain "0% loss" match would also accept "100% loss")
+                                        loss=$(echo "$stats" | grep -o '[0-9]*% loss' | head -n 1 | cut -d'%' -f1)
+                                        loss=${loss:-100}
+                                        if [ "$loss" -eq 0 ]; then
                                                 echo "Attempt $attempt: PASSED"
+                                                qc_marker attempt phase=bt n=$attempt loss=$loss result=PASS
                                                 passed_tests=$((passed_tests + 1))
                                                 ok=1
                                                 echo "Test passed on attempt $attempt - skipping remaining attempts"
                                                 break
                                         else
                                                 echo "Attempt $attempt: FAILED"
+                                                qc_marker attempt phase=bt n=$attempt loss=$loss result=FAIL
                                                 failed_tests=$((failed_tests + 1))
                                                 if [ $attempt -lt $MAX_ATTEMPTS ]; then
                                                         echo "Retrying..."
@@ -380,11 +408,15 @@ if [ $ok -eq 1 ]; then
         echo "========================================"
         echo "Bluetooth Test: PASSED"
         echo "========================================"
+        qc_marker end phase=bt result=PASS
+        qc_marker verdict test=bt result=PASS
         exit 0
 else
         echo ""
         echo "========================================"
         echo "Bluetooth Test: FAILED"
         echo "========================================"
+        qc_marker end phase=bt result=FAIL
+        qc_marker verdict test=bt result=FAIL
         exit 1
 fi
\ No newline at end of file
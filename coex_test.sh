@@ -0,0 +1,74 @@
+#!/bin/bash
+
+#################################################################################
+# WiFi + Bluetooth Coexistence Test
+#
+# Runs wifi_test.sh and bt_ping.sh at the same time so that l2ping runs while
+# iperf loads the WiFi link, and a unit needs one test cycle instead of two.
+#
+# Usage: bash coex_test.sh [-m] BT_MAC [wifi_test.sh options]
+#   -m, --markers   pass -m to bt_ping.sh (give wifi_test.sh its own -m)
+#   e.g. bash coex_test.sh -m E8:48:B8:C8:20:00 -d l2 -s solo -m
+#
+# Every output line is tagged "[WIFI] " or "[BT] ". bt_ping.sh starts when the
+# first iperf attempt starts, or after wifi_test.sh if it ends before iperf.
+# The last line is "[COEX] done wifi=<exit code> bt=<exit code>".
+#
+# Change Log:
+# -----------
+# 2026-10-19: First version (GUI "WiFi+BT" BT priority)
+#################################################################################
+
+WIFI_FIFO=/tmp/coexwififo
+BT_RC_FILE=/tmp/coex_bt_rc
+
+BT_MARKERS=""
+if [ "$1" = "-m" ] || [ "$1" = "--markers" ]; then
+    BT_MARKERS="-m"
+    shift
+fi
+BT_TARGET_MAC=$1
+if [ -z "$BT_TARGET_MAC" ]; then
+    echo "Usage: bash coex_test.sh [-m] BT_MAC [wifi_test.sh options]"
+    exit 1
+fi
+shift
+
+# Ctrl+C only reaches this shell (background jobs ignore SIGINT): take both tests down with it
+trap 'trap - INT TERM; kill 0 2>/dev/null; exit 130' INT TERM
+
+# Run bt_ping.sh with "[BT] " tagged output; its exit code goes to BT_RC_FILE
+start_bt() {
+    rm -f $BT_RC_FILE
+    (
+        bash bt_ping.sh $BT_MARKERS "$BT_TARGET_MAC" 2>&1
+        echo $? > $BT_RC_FILE
+    ) | while IFS= read -r line; do
+        printf '[BT] %s\n' "$line"
+    done &
+    BT_PID=$!
+}
+
+BT_PID=""
+rm -f $WIFI_FIFO
+mkfifo $WIFI_FIFO
+bash wifi_test.sh "$@" >$WIFI_FIFO 2>&1 &
+WIFI_PID=$!
+
+while IFS= read -r line; do
+    printf '[WIFI] %s\n' "$line"
+    if [ -z "$BT_PID" ] && [[ "$line" == *"Starting iperf test now"* ]]; then
+        start_bt
+    fi
+done <$WIFI_FIFO
+wait $WIFI_PID
+wifi_rc=$?
+rm -f $WIFI_FIFO
+
+# WiFi failed before iperf (no interface, no AP, ...): BT is still judged on its own
+[ -n "$BT_PID" ] || start_bt
+wait $BT_PID
+bt_rc=$(cat $BT_RC_FILE 2>/dev/null || echo 1)
+
+echo "[COEX] done wifi=$wifi_rc bt=$bt_rc"
+[ "$wifi_rc" -eq 0 ] && [ "$bt_rc" -eq 0 ]
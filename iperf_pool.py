@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""iperf2 server pool for the WiFi stress test line.
+
+Replaces the static iperfsrv_1/iperfsrv_2 units (one server on 5001 for 5G and one
+on 5002 for 2.4G, shared by every DUT of SOLO/STA-A/STA-B): N servers on a port
+range, health-checked and restarted, and one port leased to each running test so
+that concurrent DUTs never share a server socket.
+
+The test GUI leases a port before it starts wifi_test.sh, passes it as
+"-p <port>" and releases it when the test ends. Leases expire after their TTL, so
+a crashed GUI cannot hold a port forever.
+
+Usage:
+  python3 iperf_pool.py serve --ports 5001-5008 [--iperf /usr/bin/iperf] [--control 0.0.0.0:5100]
+  python3 iperf_pool.py lease --owner STA-A [--pool 192.168.200.2:5100]   (prints the port)
+  python3 iperf_pool.py release 5003
+  python3 iperf_pool.py status
+  python3 iperf_pool.py selftest [--iperf ./iperf]                          (loopback)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+DEFAULT_PORTS = "5001-5008"
+DEFAULT_CONTROL = "127.0.0.1:5100"
+DEFAULT_LOG_DIR = "/var/log"
+IPERF_INTERVAL_S = 5  # server report interval, as in iperfsrv_*.service
+
+HEALTH_INTERVAL_S = 2.0
+START_GRACE_S = 3.0  # a new server gets this long to start listening
+RESTART_DELAY_S = 3.0  # RestartSec of the old units
+LEASE_TTL_S = 3600  # longer than the longest test level; the GUI releases earlier
+CLIENT_TIMEOUT_S = 3.0
+
+_TCP_LISTEN = "0A"  # socket state in /proc/net/tcp
+
+
+class PoolError(RuntimeError):
+    pass
+
+
+def parse_port_range(text: str) -> List[int]:
+    """"5001-5008" or "5001,5003,5005" -> ports."""
+    ports: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(p) for p in part.split("-", 1))
+            ports.extend(range(lo, hi + 1))
+        else:
+            ports.append(int(part))
+    if not ports or any(not 0 < p < 65536 for p in ports):
+        raise ValueError(f"Invalid port range: {text!r}")
+    return sorted(set(ports))
+
+
+def parse_address(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def default_iperf_binary() -> str:
+    return shutil.which("iperf") or "/usr/bin/iperf"
+
+
+def listening_ports() -> Optional[Set[int]]:
+    """TCP ports in LISTEN state, from /proc/net/tcp{,6}; None where /proc is not available.
+
+    Used instead of a test connection: an iperf2 server logs every connection it
+    accepts, and those logs are read by the test tooling.
+    """
+    ports: Set[int] = set()
+    found = False
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 3 and fields[3] == _TCP_LISTEN:
+                        ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+            found = True
+        except OSError:
+            continue
+    return ports if found else None
+
+
+def _can_connect(port: int, host: str = "127.0.0.1") -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=1.0):
+            return True
+    except OSError:
+        return False
+
+
+@dataclass
+class Lease:
+    port: int
+    owner: str
+    granted: float
+    expires: float
+
+
+class IperfServer:
+    """One `iperf -s` process; output is appended to iperf2-server-<port>.log."""
+
+    def __init__(self, iperf: str, port: int, log_dir: str, bind: str = ""):
+        self.iperf = iperf
+        self.port = port
+        self.bind = bind
+        self.log_path = os.path.join(log_dir, f"iperf2-server-{port}.log")
+        self.proc: Optional[subprocess.Popen] = None
+        self.started = 0.0
+        self.stopped = 0.0
+        self.restarts = 0
+        self.healthy = False
+        self.error = ""
+
+    def command(self) -> List[str]:
+        cmd = [self.iperf, "-s", "-i", str(IPERF_INTERVAL_S), "-p", str(self.port)]
+        if self.bind:
+            cmd += ["-B", self.bind]
+        return cmd
+
+    def start(self) -> None:
+        self.healthy = False
+        try:
+            with open(self.log_path, "ab") as log:
+                self.proc = subprocess.Popen(
+                    self.command(),
+                    stdin=subprocess.DEVNULL,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,  # Ctrl+C on the pool does not hit the servers first
+                )
+            self.error = ""
+        except OSError as e:
+            self.proc = None
+            self.error = str(e)
+        self.started = time.monotonic()
+
+    def stop(self) -> None:
+        proc, self.proc = self.proc, None
+        self.healthy = False
+        self.stopped = time.monotonic()
+        if proc is None or proc.poll() is not None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+
+class IperfPool:
+    """Servers on a port range plus the port leases; thread-safe."""
+
+    def __init__(self, iperf: str, ports: List[int], log_dir: str, bind: str = ""):
+        self.servers: Dict[int, IperfServer] = {p: IperfServer(iperf, p, log_dir, bind) for p in ports}
+        self.leases: Dict[int, Lease] = {}
+        self._last_release: Dict[int, float] = {p: 0.0 for p in ports}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            for server in self.servers.values():
+                server.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            for server in self.servers.values():
+                server.stop()
+
+    def check(self) -> List[str]:
+        """Health pass: restart dead or non-listening servers; returns what happened."""
+        events: List[str] = []
+        now = time.monotonic()
+        listening = listening_ports()
+        with self._lock:
+            self._expire(time.time())
+            for port, s in self.servers.items():
+                if s.proc is None:
+                    if now - s.stopped >= RESTART_DELAY_S:
+                        reason = s.error or "was down"
+                        s.restarts += 1
+                        s.start()
+                        failed = f", start failed: {s.error}" if s.error else ""
+                        events.append(f"port {port}: restarted ({reason}){failed}")
+                    continue
+                if not s.running():
+                    s.error = f"exited with code {s.proc.returncode}"
+                    events.append(f"port {port}: {s.error}")
+                    s.stop()
+                    continue
+                ok = port in listening if listening is not None else _can_connect(port)
+                if ok:
+                    s.healthy = True
+                elif now - s.started >= START_GRACE_S:
+                    s.error = "not listening"
+                    events.append(f"port {port}: not listening, stopping")
+                    s.stop()
+        return events
+
+    def _expire(self, now: float) -> None:
+        for port in [p for p, lease in self.leases.items() if lease.expires <= now]:
+            del self.leases[port]
+            self._last_release[port] = time.monotonic()
+
+    def lease(self, owner: str, ttl: float = LEASE_TTL_S) -> Lease:
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            free = [p for p, s in self.servers.items() if s.healthy and p not in self.leases]
+            if not free:
+                raise PoolError("no free healthy iperf server")
+            # Least recently released first: a server gets time to settle between tests.
+            port = min(free, key=lambda p: (self._last_release[p], p))
+            lease = self.leases[port] = Lease(port, owner, now, now + ttl)
+            return lease
+
+    def release(self, port: int, owner: str = "") -> bool:
+        with self._lock:
+            lease = self.leases.get(port)
+            if lease is None or (owner and lease.owner != owner):
+                return False
+            del self.leases[port]
+            self._last_release[port] = time.monotonic()
+            return True
+
+    def status(self) -> dict:
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            servers = []
+            for port, s in self.servers.items():
+                lease = self.leases.get(port)
+                servers.append(
+                    {
+                        "port": port,
+                        "pid": s.proc.pid if s.running() else None,
+                        "healthy": s.healthy,
+                        "restarts": s.restarts,
+                        "error": s.error,
+                        "owner": lease.owner if lease else "",
+                        "lease_left_s": round(lease.expires - now) if lease else None,
+                    }
+                )
+            return {"servers": servers}
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        try:
+            if op == "lease":
+                lease = self.lease(str(request.get("owner", "")), float(request.get("ttl", LEASE_TTL_S)))
+                return {"ok": True, "port": lease.port, "expires_in": round(lease.expires - lease.granted)}
+            if op == "release":
+                return {"ok": self.release(int(request["port"]), str(request.get("owner", "")))}
+            if op == "status":
+                return {"ok": True, **self.status()}
+        except PoolError as e:
+            return {"ok": False, "error": str(e)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": f"bad request: {e}"}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+
+# --------------------------------------------------------------------------------------
+# Control socket (one JSON object per line)
+# --------------------------------------------------------------------------------------
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {"ok": False, "error": "invalid JSON"}
+            else:
+                reply = self.server.pool.handle(request)
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], pool: IperfPool):
+        super().__init__(address, _ControlHandler)
+        self.pool = pool
+
+
+def pool_request(address: str, request: dict, timeout: float = CLIENT_TIMEOUT_S) -> dict:
+    """Send one request to a running pool; raises PoolError when it cannot be reached."""
+    try:
+        with socket.create_connection(parse_address(address), timeout=timeout) as sock:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except (OSError, ValueError) as e:
+        raise PoolError(f"iperf pool {address} not reachable: {e}") from e
+    if not line:
+        raise PoolError(f"iperf pool {address} closed the connection")
+    return json.loads(line)
+
+
+def lease_port(address: str, owner: str, ttl: float = LEASE_TTL_S, timeout: float = CLIENT_TIMEOUT_S) -> int:
+    reply = pool_request(address, {"op": "lease", "owner": owner, "ttl": ttl}, timeout)
+    if not reply.get("ok"):
+        raise PoolError(reply.get("error", "lease refused"))
+    return int(reply["port"])
+
+
+def release_port(address: str, port: int, owner: str = "", timeout: float = CLIENT_TIMEOUT_S) -> bool:
+    return bool(pool_request(address, {"op": "release", "port": port, "owner": owner}, timeout).get("ok"))
+
+
+# --------------------------------------------------------------------------------------
+# Commands
+# --------------------------------------------------------------------------------------
+
+
+def _print_status(status: dict) -> None:
+    print(f"{'port':>6} {'pid':>8} {'health':>8} {'restarts':>8}  owner")
+    for s in status["servers"]:
+        health = "ok" if s["healthy"] else "DOWN"
+        owner = f"{s['owner']} ({s['lease_left_s']} s left)" if s["owner"] else "-"
+        error = f"  [{s['error']}]" if s["error"] and not s["healthy"] else ""
+        print(f"{s['port']:>6} {s['pid'] or '-':>8} {health:>8} {s['restarts']:>8}  {owner}{error}")
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    pool = IperfPool(args.iperf, parse_port_range(args.ports), args.log_dir, args.bind)
+    try:
+        control = ControlServer(parse_address(args.control), pool)
+    except OSError as e:
+        print(f"Cannot open control socket {args.control}: {e}")
+        return 1
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    pool.start()
+    threading.Thread(target=control.serve_forever, daemon=True).start()
+    print(f"iperf pool: ports {args.ports} ({args.iperf}), control {args.control}", flush=True)
+    try:
+        while not stop.wait(HEALTH_INTERVAL_S):
+            for event in pool.check():
+                print(f"[{time.strftime('%H:%M:%S')}] {event}", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        control.shutdown()
+        control.server_close()
+        pool.stop()
+    return 0
+
+
+def run_selftest(args: argparse.Namespace) -> int:
+    """Loopback check: lease every server, run one client per lease, kill and restart a server."""
+    import tempfile
+
+    ports = parse_port_range(args.ports)
+    log_dir = tempfile.mkdtemp(prefix="iperf_pool_")
+    pool = IperfPool(args.iperf, ports, log_dir, "127.0.0.1")
+    control = ControlServer(("127.0.0.1", 0), pool)
+    address = f"127.0.0.1:{control.server_address[1]}"
+    threading.Thread(target=control.serve_forever, daemon=True).start()
+    failures: List[str] = []
+
+    def _expect(ok: bool, what: str) -> None:
+        print(f"  {'PASS' if ok else 'FAIL'}  {what}", flush=True)
+        if not ok:
+            failures.append(what)
+
+    def _wait_healthy(deadline_s: float) -> bool:
+        end = time.monotonic() + deadline_s
+        while time.monotonic() < end:
+            pool.check()
+            if all(s.healthy for s in pool.servers.values()):
+                return True
+            time.sleep(0.2)
+        return False
+
+    print(f"Self test: {args.iperf} on 127.0.0.1, ports {args.ports}, logs in {log_dir}")
+    pool.start()
+    try:
+        _expect(_wait_healthy(START_GRACE_S + 2), "all servers listening")
+
+        leased = [lease_port(address, f"selftest-{i}") for i in range(len(ports))]
+        _expect(sorted(leased) == ports, f"one lease per server: {leased}")
+        try:
+            lease_port(address, "selftest-extra")
+            _expect(False, "pool exhausted -> lease refused")
+        except PoolError:
+            _expect(True, "pool exhausted -> lease refused")
+
+        # One client per leased port, all at once: no two tests share a server socket.
+        clients = [
+            subprocess.Popen(
+                [args.iperf, "-c", "127.0.0.1", "-p", str(p), "-t", str(args.duration), "-f", "m"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+            for p in leased
+        ]
+        for p, client in zip(leased, clients):
+            out, _ = client.communicate(timeout=args.duration + 30)
+            _expect(client.returncode == 0 and "Mbits/sec" in out, f"client on port {p} got throughput")
+
+        victim = pool.servers[leased[0]]
+        victim.proc.kill()
+        victim.proc.wait()
+        _expect(_wait_healthy(RESTART_DELAY_S + START_GRACE_S + 4), f"port {victim.port} restarted after kill")
+
+        _expect(not release_port(address, leased[0], owner="selftest-1"), "release by another owner refused")
+        _expect(all(release_port(address, p, owner=f"selftest-{i}") for i, p in enumerate(leased)),
+                "all leases released")
+        _expect(not release_port(address, leased[0]), "double release refused")
+        _expect(lease_port(address, "selftest-again", ttl=0.5) in ports, "lease after release")
+        time.sleep(0.6)
+        status = pool_request(address, {"op": "status"})
+        _expect(not any(s["owner"] for s in status["servers"]), "expired lease reclaimed")
+    except PoolError as e:
+        _expect(False, str(e))
+    finally:
+        control.shutdown()
+        control.server_close()
+        pool.stop()
+
+    print("Self test:", "FAIL" if failures else "PASS")
+    return 1 if failures else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="iperf2 server pool with per-test port leases")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sv = sub.add_parser("serve", help="Run the servers and the lease control socket")
+    sv.add_argument("--ports", default=DEFAULT_PORTS, help="Server ports (default: %(default)s)")
+    sv.add_argument("--iperf", default=default_iperf_binary(), help="iperf2 binary (default: %(default)s)")
+    sv.add_argument("--bind", default="", help="Address the servers bind to (iperf -B; default: all)")
+    sv.add_argument("--control", default=DEFAULT_CONTROL, help="Lease control HOST:PORT (default: %(default)s)")
+    sv.add_argument("--log-dir", default=DEFAULT_LOG_DIR, help="Server log folder (default: %(default)s)")
+
+    ls = sub.add_parser("lease", help="Lease a server port (prints it)")
+    ls.add_argument("--owner", default=socket.gethostname())
+    ls.add_argument("--ttl", type=float, default=LEASE_TTL_S)
+
+    rl = sub.add_parser("release", help="Release a leased port")
+    rl.add_argument("port", type=int)
+    rl.add_argument("--owner", default="", help="Only release the port if OWNER holds it (default: any owner)")
+
+    sub.add_parser("status", help="Show servers and leases")
+
+    st = sub.add_parser("selftest", help="Loopback test of the pool with a local iperf binary")
+    st.add_argument("--iperf", default=default_iperf_binary())
+    st.add_argument("--ports", default="5201-5204")
+    st.add_argument("--duration", type=int, default=2, help="Client test length in seconds")
+
+    for p in (ls, rl, sub.choices["status"]):
+        p.add_argument("--pool", default=os.environ.get("IPERF_POOL", DEFAULT_CONTROL), help="Pool control HOST:PORT")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            return run_serve(args)
+        if args.command == "selftest":
+            return run_selftest(args)
+        if args.command == "lease":
+            print(lease_port(args.pool, args.owner, args.ttl))
+            return 0
+        if args.command == "release":
+            return 0 if release_port(args.pool, args.port, args.owner) else 1
+        if args.command == "status":
+            _print_status(pool_request(args.pool, {"op": "status"}))
+            return 0
+    except (PoolError, ValueError) as e:
+        print(str(e))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Incremental reader of the iperf2 server logs (/var/log/iperf2-server-<port>.log).
+
+The servers started by iperfsrv_*.service / iperf_pool.py append their reports to
+these files. IperfServerLogs tails them (offset + inode, so logrotate is handled),
+cuts the output into one segment per client test run (the -P 3 connections of one
+wifi_test.sh attempt) and keeps the recent segments. The test GUI joins them to the
+DUT test by client IP and time window, so the saved log shows the receiver-side
+rate next to the DUT-reported [SUM].
+
+iperf2 server output carries no wall-clock time: segments are stamped when their
+lines are read, so the tailer has to run while the tests run (poll about once per
+second; a poll with nothing new is one stat() and one empty read()).
+
+Usage:
+  python3 iperf_server_log.py follow ["/var/log/iperf2-server-*.log"]
+  python3 iperf_server_log.py parse /var/log/iperf2-server-5001.log
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LOG_GLOB = "/var/log/iperf2-server-*.log"
+
+SEGMENT_JOIN_S = 3.0  # connections of one client within this time form one test run (-P 3)
+SEGMENT_IDLE_S = 15.0  # a segment without output for this long is closed (server -i 5)
+STALL_FRACTION = 0.1  # interval below this fraction of the segment median = stall
+MISMATCH_FRACTION = 0.10  # DUT [SUM] vs server rate difference flagged in the saved log
+KEEP_SEGMENTS = 512  # closed segments kept per log file for the join
+RESCAN_POLLS = 30  # re-glob for new server logs (new pool ports) every N polls
+
+_CONNECT_RE = re.compile(r"^\[\s*(\d+)\] local (\S+) port (\d+) connected with (\S+) port (\d+)")
+_INTERVAL_RE = re.compile(
+    # "[  4]  0.0- 5.0 sec  20.1 MBytes  33.7 Mbits/sec" (iperf 2.0) / "[  1] 0.00-5.00 sec ..." (2.1)
+    r"^\[\s*(\d+|SUM)\]\s+([\d.]+)\s*-\s*([\d.]+) sec\s+([\d.]+) ([KMG]?)Bytes\s+([\d.]+) ([KMG]?)bits/sec"
+)
+_MBITS = {"": 1e-6, "K": 1e-3, "M": 1.0, "G": 1e3}
+
+
+@dataclass
+class ServerSegment:
+    """One client test run as seen by the server (all its parallel streams)."""
+
+    server_port: int
+    client_ip: str
+    start: Optional[float]  # epoch when the first connection was read (None: offline parse)
+    end: Optional[float] = None
+    streams: int = 0
+    # (t0, t1) -> summed Mbits/sec of the streams' interval reports
+    intervals: Dict[Tuple[float, float], float] = field(default_factory=dict)
+    finals: Dict[int, float] = field(default_factory=dict)  # stream id -> whole-run Mbits/sec
+    final_seconds: float = 0.0
+    closed: bool = False
+
+    @property
+    def mbits(self) -> Optional[float]:
+        """Receiver-side rate of the run: sum of the stream totals, else the interval mean."""
+        if self.finals:
+            return sum(self.finals.values())
+        if self.intervals:
+            return sum(self.intervals.values()) / len(self.intervals)
+        return None
+
+    def anomalies(self) -> List[str]:
+        notes: List[str] = []
+        sums = sorted(self.intervals.values())
+        if len(sums) >= 3:
+            median = sums[len(sums) // 2]
+            stalls = [k for k, v in sorted(self.intervals.items()) if v < STALL_FRACTION * median]
+            if stalls:
+                notes.append("stall " + ", ".join(f"{t0:.0f}-{t1:.0f}s" for t0, t1 in stalls[:5]))
+        if self.streams and len(self.finals) < self.streams and self.closed:
+            notes.append(f"{self.streams - len(self.finals)} stream(s) without a final report")
+        return notes
+
+
+class ServerLogParser:
+    """Turns server log lines into ServerSegments."""
+
+    def __init__(self, keep: int = KEEP_SEGMENTS):
+        self.segments: Deque[ServerSegment] = deque(maxlen=keep)  # closed, oldest first
+        self.open: List[ServerSegment] = []
+        self._by_stream: Dict[str, ServerSegment] = {}  # iperf stream id -> its segment
+        self._seen_interval: Dict[str, bool] = {}
+
+    def feed(self, line: str, now: Optional[float]) -> None:
+        if not line.startswith("["):
+            return
+        m = _CONNECT_RE.match(line)
+        if m:
+            stream, server_port, client_ip = m.group(1), int(m.group(3)), m.group(4)
+            seg = next(
+                (
+                    s
+                    for s in reversed(self.open)
+                    if s.client_ip == client_ip
+                    and s.server_port == server_port
+                    and (now is None or s.start is None or now - s.start <= SEGMENT_JOIN_S)
+                    and not s.intervals
+                ),
+                None,
+            )
+            if seg is None:
+                seg = ServerSegment(server_port, client_ip, now, now)
+                self.open.append(seg)
+            seg.streams += 1
+            self._by_stream[stream] = seg
+            self._seen_interval[stream] = False
+            return
+
+        m = _INTERVAL_RE.match(line)
+        if not m or m.group(1) == "SUM":
+            return  # [SUM] lines are rebuilt from the stream lines
+        stream = m.group(1)
+        seg = self._by_stream.get(stream)
+        if seg is None:
+            return
+        t0, t1 = float(m.group(2)), float(m.group(3))
+        mbits = float(m.group(6)) * _MBITS[m.group(7)]
+        seg.end = now
+        if t0 == 0.0 and self._seen_interval[stream]:
+            # "0.0-120.0 sec": the stream's whole-run report; the stream is done.
+            seg.finals[int(stream)] = mbits
+            seg.final_seconds = max(seg.final_seconds, t1)
+            del self._by_stream[stream]
+            if len(seg.finals) >= seg.streams:
+                self._close(seg)
+            return
+        self._seen_interval[stream] = True
+        key = (t0, t1)
+        seg.intervals[key] = seg.intervals.get(key, 0.0) + mbits
+
+    def _close(self, seg: ServerSegment) -> None:
+        seg.closed = True
+        if seg in self.open:
+            self.open.remove(seg)
+        for stream in [k for k, s in self._by_stream.items() if s is seg]:
+            del self._by_stream[stream]
+        self.segments.append(seg)
+
+    def close_idle(self, now: float) -> None:
+        for seg in list(self.open):
+            if seg.end is not None and now - seg.end >= SEGMENT_IDLE_S:
+                self._close(seg)
+
+    def close_all(self) -> None:
+        for seg in list(self.open):
+            self._close(seg)
+
+
+class IperfLogTailer:
+    """Follows one server log by byte offset; survives truncation and rename-rotation."""
+
+    def __init__(self, path: str, from_start: bool = False):
+        self.path = path
+        self.parser = ServerLogParser()
+        self._f = None
+        self._inode: Optional[int] = None
+        self._partial = b""
+        self._open(from_start)
+
+    def _open(self, from_start: bool) -> None:
+        try:
+            self._f = open(self.path, "rb")
+        except OSError:
+            self._f, self._inode = None, None
+            return
+        st = os.fstat(self._f.fileno())
+        self._inode = st.st_ino
+        if not from_start:
+            self._f.seek(st.st_size)  # only what is written from now on
+        self._partial = b""
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    @property
+    def offset(self) -> int:
+        return self._f.tell() if self._f is not None else 0
+
+    def _drain(self, now: Optional[float]) -> None:
+        data = self._f.read()
+        if not data:
+            return
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()  # incomplete last line: wait for the rest
+        for raw in lines:
+            self.parser.feed(raw.decode("utf-8", "replace").rstrip("\r"), now)
+
+    def poll(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        if self._f is None:
+            self._open(from_start=True)  # the file appeared after we started
+            if self._f is None:
+                return
+        self._drain(now)
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            st = None
+        if st is None or st.st_ino != self._inode:
+            # Rotated away (the old file is fully read above): follow the new file from its start.
+            self.close()
+            if st is not None:
+                self._open(from_start=True)
+                self._drain(now)
+        elif st.st_size < self.offset:
+            # Truncated in place (copytruncate).
+            self._f.seek(0)
+            self._partial = b""
+            self._drain(now)
+        self.parser.close_idle(now)
+
+
+class IperfServerLogs:
+    """All server logs matching a glob (new pool ports are picked up on the way)."""
+
+    def __init__(self, pattern: str = DEFAULT_LOG_GLOB, from_start: bool = False):
+        self.pattern = pattern
+        self.tailers: Dict[str, IperfLogTailer] = {}
+        self._polls = 0
+        self._scan(from_start)
+
+    def _scan(self, from_start: bool) -> None:
+        for path in sorted(glob.glob(self.pattern)):
+            if path not in self.tailers:
+                self.tailers[path] = IperfLogTailer(path, from_start)
+
+    def __bool__(self) -> bool:
+        return bool(self.tailers)
+
+    def poll(self, now: Optional[float] = None) -> None:
+        self._polls += 1
+        if self._polls % RESCAN_POLLS == 0:
+            self._scan(from_start=True)  # a log created after start is read from its beginning
+        for tailer in self.tailers.values():
+            tailer.poll(now)
+
+    def close(self) -> None:
+        for tailer in self.tailers.values():
+            tailer.close()
+
+    def segments(self) -> Iterable[ServerSegment]:
+        for tailer in self.tailers.values():
+            yield from tailer.parser.segments
+            yield from tailer.parser.open
+
+    def match(self, client_ips: Iterable[str], start: float, end: float) -> List[ServerSegment]:
+        """Segments of these client IPs that started inside [start, end], in time order."""
+        ips = set(client_ips)
+        found = [
+            s for s in self.segments() if s.client_ip in ips and s.start is not None and start <= s.start <= end
+        ]
+        return sorted(found, key=lambda s: s.start)
+
+
+# --------------------------------------------------------------------------------------
+# Join with the DUT log
+# --------------------------------------------------------------------------------------
+
+_DUT_IP_RE = re.compile(r"IP address: (\d+\.\d+\.\d+\.\d+)")
+_DUT_BAND_RE = re.compile(r"Starting (5G|2\.4G) Band Test")
+_DUT_PORT_RE = re.compile(r"^\s+Using iperf server port: (\d+)")  # per attempt, not the -p echo
+_DUT_RESULT_RE = re.compile(r"Result: (?:PASSED|FAILED) \((\d+(?:\.\d+)?) MBits/sec")
+
+
+def dut_client_ips(log_text: str) -> List[str]:
+    return sorted(set(_DUT_IP_RE.findall(log_text)))
+
+
+def dut_attempts(log_text: str) -> List[Tuple[str, int, Optional[float]]]:
+    """(band, server port, DUT [SUM] Mbits/sec or None) per iperf attempt of wifi_test.sh."""
+    attempts: List[Tuple[str, int, Optional[float]]] = []
+    band = ""
+    for line in log_text.splitlines():
+        m = _DUT_BAND_RE.search(line)
+        if m:
+            band = m.group(1)
+            continue
+        m = _DUT_PORT_RE.search(line)
+        if m:
+            attempts.append((band, int(m.group(1)), None))
+            continue
+        m = _DUT_RESULT_RE.search(line)
+        if m and attempts and attempts[-1][2] is None:
+            attempts[-1] = (attempts[-1][0], attempts[-1][1], float(m.group(1)))
+    return attempts
+
+
+def format_server_section(segments: List[ServerSegment], log_text: str) -> List[str]:
+    """Lines for the saved log: each DUT attempt next to the server segment of its port."""
+    by_port: Dict[int, List[ServerSegment]] = {}
+    for seg in segments:
+        by_port.setdefault(seg.server_port, []).append(seg)
+
+    lines: List[str] = []
+    for band, port, dut_mbits in dut_attempts(log_text):
+        queue = by_port.get(port)
+        seg = queue.pop(0) if queue else None
+        dut_text = f"{dut_mbits:.0f}" if dut_mbits is not None else "-"
+        if seg is None:
+            lines.append(f"{band:<4} port {port}: DUT [SUM] {dut_text} Mbits/sec, server: no matching connection")
+            continue
+        server = seg.mbits
+        notes = seg.anomalies()
+        if server and dut_mbits is not None and abs(dut_mbits - server) > MISMATCH_FRACTION * server:
+            notes.append(f"DUT/server differ by {(dut_mbits - server) / server:+.0%}")
+        when = datetime.fromtimestamp(seg.start).strftime("%H:%M:%S") if seg.start is not None else "-"
+        server_text = f"{server:.1f}" if server is not None else "-"
+        lines.append(
+            f"{band:<4} port {port} {when} {seg.client_ip}: DUT [SUM] {dut_text} Mbits/sec, "
+            f"server {server_text} Mbits/sec ({seg.streams} stream(s))" + (f" [{'; '.join(notes)}]" if notes else "")
+        )
+    return lines
+
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+
+
+def _describe(seg: ServerSegment) -> str:
+    when = datetime.fromtimestamp(seg.start).strftime("%Y-%m-%d %H:%M:%S") if seg.start is not None else "-"
+    rate = f"{seg.mbits:.1f}" if seg.mbits is not None else "-"
+    notes = "; ".join(seg.anomalies())
+    return (
+        f"{when}  port {seg.server_port}  {seg.client_ip:<15}  {rate:>8} Mbits/sec  "
+        f"{seg.streams} stream(s), {seg.final_seconds:.0f} s" + (f"  [{notes}]" if notes else "")
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="iperf2 server log reader")
+    sub = parser.add_subparsers(dest="command", required=True)
+    fo = sub.add_parser("follow", help="Print each client test run as it finishes")
+    fo.add_argument("pattern", nargs="?", default=DEFAULT_LOG_GLOB)
+    fo.add_argument("--interval", type=float, default=1.0)
+    pa = sub.add_parser("parse", help="Print the test runs of a whole log (no wall-clock times)")
+    pa.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "parse":
+        p = ServerLogParser(keep=sys.maxsize)
+        with open(args.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                p.feed(line.rstrip("\n"), None)
+        p.close_all()
+        for seg in p.segments:
+            print(_describe(seg))
+        return 0
+
+    logs = IperfServerLogs(args.pattern)
+    if not logs:
+        print(f"No server logs match {args.pattern}")
+        return 1
+    print(f"Following {', '.join(logs.tailers)}", flush=True)
+    printed = 0
+    try:
+        while True:
+            time.sleep(args.interval)
+            logs.poll()
+            done = sorted((s for s in logs.segments() if s.closed), key=lambda s: s.start or 0)
+            for seg in done[printed:]:
+                print(_describe(seg), flush=True)
+            printed = len(done)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logs.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
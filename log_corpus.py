@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Synthetic log corpus for the WiFi Stress Log Analyzer.
+
+Generates log filenames in the same shapes that `save_log` in wifi_test_newgui.py
+produces (plus the legacy V1 layout), including the entries the analyzer must skip:
+dummy SN/MAC placeholders and TERMINATED runs. `tree` writes whole log folders
+(wifi_stress_log_YYYYMMDD/...) with bodies shaped like wifi_test.sh / bt_ping.sh output.
+
+Usage:
+  python3 log_corpus.py names --count 1000 > names.txt
+  python3 log_corpus.py tree --root /tmp/corpus --count 100000 [--body short]
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator, List, NamedTuple, Optional
+
+CORPUS_START = datetime(2026, 1, 1, 8, 0, 0)
+
+# Relative weights of each filename kind in a generated corpus.
+NAME_KIND_WEIGHTS = {
+    "v2": 70,  # DATE_TIME_SN_MAC1_MAC2_RESULT.txt
+    "v2_mac2_dummy": 10,  # single-MAC unit -> MAC2=dummy (excluded by the analyzer)
+    "v1": 10,  # DATE_TIME_SN_MAC_RESULT.txt
+    "dummy": 3,  # no SN scanned -> dummy_dummy_dummy
+    "terminated": 4,  # operator terminated the run
+    "invalid": 3,  # not a log name / broken date
+}
+
+# Chance that a FAIL unit goes straight back on the fixture (retest of the same SN).
+RETEST_AFTER_FAIL = 0.7
+
+# Body sizes: (iperf duration in seconds, interval). "full" matches the production
+# default of wifi_test.sh (-d l2); "short" keeps big trees small; "none" = empty files.
+BODY_SIZES = {"full": (120, 1), "short": (10, 1), "none": (0, 0)}
+
+# FAIL bodies pick one cause; the markers are what wifi_test.sh / bt_ping.sh print.
+FAIL_CAUSE_WEIGHTS = {
+    "low_throughput": 50,
+    "no_throughput": 10,
+    "connect": 15,
+    "no_ip": 10,
+    "interface": 5,
+    "bt_loss": 7,
+    "bt_device": 3,
+}
+
+_BANDS = (("5G", 50, 5001), ("2.4G", 10, 5002))
+_SSID_GROUPS = ("solo", "grpa", "grpb")
+
+
+class CorpusEntry(NamedTuple):
+    dt: datetime
+    name: str
+    kind: str
+    sn: str
+    mac1: str
+    mac2: str
+    result: str  # PASS / FAIL / TERMINATED / "" (invalid names)
+
+
+def _mac12(unit: int, index: int) -> str:
+    # Stable per unit, like the labels printed on a real board.
+    return f"001F7B{(unit * 2 + index) & 0xFFFFFF:06X}"
+
+
+def _serial(unit: int) -> str:
+    return f"2175{unit:08d}"
+
+
+def generate_entries(
+    count: int,
+    seed: int = 0,
+    units: Optional[int] = None,
+    start: datetime = CORPUS_START,
+) -> Iterator[CorpusEntry]:
+    """Yield `count` entries with increasing timestamps.
+
+    `units` controls how many distinct SNs exist; fewer units than names means extra
+    retests on top of the FAIL -> retest pattern.
+    """
+    rng = random.Random(seed)
+    kinds = list(NAME_KIND_WEIGHTS)
+    weights = [NAME_KIND_WEIGHTS[k] for k in kinds]
+    units = units or max(1, count * 9 // 10)
+    dt = start
+    retest_unit: Optional[int] = None
+
+    for _ in range(count):
+        dt += timedelta(seconds=rng.randint(1, 90))
+        stamp = dt.strftime("%Y%m%d_%H%M%S")
+        if retest_unit is not None:
+            unit, retest_unit = retest_unit, None
+        else:
+            unit = rng.randrange(units)
+        sn = _serial(unit)
+        mac1, mac2 = _mac12(unit, 0), _mac12(unit, 1)
+        result = "PASS" if rng.random() < 0.9 else "FAIL"
+        kind = rng.choices(kinds, weights)[0]
+
+        if kind == "v2":
+            name = f"{stamp}_{sn}_{mac1}_{mac2}_{result}.txt"
+        elif kind == "v2_mac2_dummy":
+            mac2 = "dummy"
+            name = f"{stamp}_{sn}_{mac1}_dummy_{result}.txt"
+        elif kind == "v1":
+            mac2 = ""
+            name = f"{stamp}_{sn}_{mac1}_{result}.txt"
+        elif kind == "dummy":
+            sn = mac1 = mac2 = "dummy"
+            name = f"{stamp}_dummy_dummy_dummy_{result}.txt"
+        elif kind == "terminated":
+            result = "TERMINATED"
+            word = rng.choice(["TERMINATED", "TERMINATED", "TERNINATED", "Terminated"])
+            name = f"{stamp}_{sn}_{mac1}_{mac2}_{word}.txt"
+        else:
+            result = ""
+            name = rng.choice(
+                [
+                    f"{stamp}_{sn}_{mac1}_{result or 'PASS'}.log",
+                    f"{stamp}_{sn}.txt",
+                    f"{dt:%Y}1399_{dt:%H%M%S}_{sn}_{mac1}_{mac2}_PASS.txt",
+                    f"{stamp}_{sn}_{mac1}_{mac2}_PASS.TXT",
+                    f"notes_{stamp}.txt",
+                ]
+            )
+
+        if result == "FAIL" and rng.random() < RETEST_AFTER_FAIL:
+            retest_unit = unit
+        yield CorpusEntry(dt, name, kind, sn, mac1, mac2, result)
+
+
+def generate_filenames(
+    count: int,
+    seed: int = 0,
+    units: Optional[int] = None,
+    start: datetime = CORPUS_START,
+) -> Iterator[str]:
+    """Yield `count` filenames with increasing timestamps (see `generate_entries`)."""
+    for entry in generate_entries(count, seed=seed, units=units, start=start):
+        yield entry.name
+
+
+def _iperf_lines(rng: random.Random, port: int, mbits: float, duration: int, interval: int) -> List[str]:
+    lines = [
+        "------------------------------------------------------------",
+        f"Client connecting to 192.168.200.2, TCP port {port}",
+        "TCP window size:  256 KByte (WARNING: requested  128 KByte)",
+        "------------------------------------------------------------",
+    ]
+    for stream in (3, 4, 5):
+        lines.append(f"[  {stream}] local 192.168.200.{100 + stream} port {40000 + stream} connected with 192.168.200.2 port {port}")
+    for t in range(0, duration, interval):
+        total = 0.0
+        for stream in (3, 4, 5):
+            v = max(0.0, rng.gauss(mbits / 3, mbits / 30))
+            total += v
+            lines.append(f"[  {stream}] {t:4.1f}-{t + interval:4.1f} sec  {v * interval / 8:5.2f} MBytes  {v:5.1f} Mbits/sec")
+        lines.append(f"[SUM] {t:4.1f}-{t + interval:4.1f} sec  {total * interval / 8:5.2f} MBytes  {total:5.1f} Mbits/sec")
+    lines.append(f"[SUM]  0.0-{duration:4.1f} sec  {mbits * duration / 8:5.1f} MBytes  {mbits:5.1f} Mbits/sec")
+    return lines
+
+
+def render_log(entry: CorpusEntry, rng: random.Random, body: str = "short") -> str:
+    """Full saved-log text for `entry` in the `save_log` layout."""
+    duration, interval = BODY_SIZES[body]
+    if not duration:
+        return ""
+
+    result = entry.result if entry.result in ("PASS", "FAIL") else rng.choice(["PASS", "FAIL"])
+    cause = ""
+    if result == "FAIL":
+        causes = list(FAIL_CAUSE_WEIGHTS)
+        cause = rng.choices(causes, [FAIL_CAUSE_WEIGHTS[c] for c in causes])[0]
+    group = rng.choice(_SSID_GROUPS)
+    bt_mac = "" if rng.random() < 0.5 else "00:1F:7B:%02X:%02X:%02X" % tuple(rng.randrange(256) for _ in range(3))
+    bt_tested = bool(bt_mac) or cause.startswith("bt_")
+    wifi_result = "FAIL" if result == "FAIL" and not cause.startswith("bt_") else "PASS"
+    bt_result = ("FAIL" if cause.startswith("bt_") else "PASS") if bt_tested else "SKIP"
+    start = entry.dt - timedelta(seconds=duration * 2 + 60)
+    mac = entry.mac1 + (entry.mac2 if entry.mac2 not in ("", "dummy") else "")
+
+    out = [
+        "=" * 60,
+        "WiFi & Bluetooth Stress Test",
+        f"Date: {start:%Y-%m-%d %H:%M:%S}",
+        f"Port: /dev/ttyUSB{rng.randrange(4)}",
+        f"SN: {entry.sn}",
+        f"WiFi MAC: {mac}",
+    ]
+    if bt_mac:
+        out.append(f"BT MAC: {bt_mac}")
+    out += ["=" * 60, "", f">>> Sent command: bash wifi_test.sh -d l2 -s {group}", ""]
+    out += [
+        "Test Configuration:",
+        f"  Duration: {duration} seconds",
+        f"  Display Interval: {interval} seconds",
+        "  Band Priority: ax (5G first)",
+        f"  SSID Group: {group}",
+        "",
+    ]
+
+    if cause == "interface":
+        out += ["Waiting for wlan0 interface... (10/10 seconds)", "ERROR: wlan0 interface is not up"]
+    else:
+        for band, limit, port in _BANDS:
+            out += ["", "=" * 42, f"Starting {band} Band Test", "=" * 42, f"Connecting to {band} band WiFi..."]
+            if cause == "connect" and band == "5G":
+                out.append(f"\x1b[0;31mERROR: Failed to connect to {band} band WiFi\x1b[0m")
+                break
+            if cause == "no_ip" and band == "5G":
+                out.append(f"\x1b[0;31mERROR: Failed to get IP address for {band} band\x1b[0m")
+                break
+            out.append("Connected successfully. IP address: 192.168.200.101")
+            out.append("Performing throughput tests (up to 3 attempts, early exit on pass):")
+            low = cause == "low_throughput" and band == "5G"
+            attempts = 3 if low or (cause == "no_throughput" and band == "5G") else 1
+            for attempt in range(1, attempts + 1):
+                rssi = -rng.randint(35, 70)
+                mbits = rng.uniform(limit * 0.3, limit * 0.9) if low else rng.uniform(limit * 1.2, limit * 3)
+                out += [
+                    f"  Attempt {attempt}: Preparing iperf test ({duration} seconds)...",
+                    f"  Using iperf server port: {port}",
+                    f"    RSSI: {rssi} dBm",
+                    "",
+                    "  Starting iperf test now...",
+                ]
+                if cause == "no_throughput" and band == "5G":
+                    out.append("    Result: FAILED (No valid throughput data after multiple attempts) - RSSI after test: N/A dBm")
+                    continue
+                out += _iperf_lines(rng, port, mbits, duration, interval)
+                if low:
+                    out.append(
+                        f"    Result: FAILED ({int(mbits)} MBits/sec < {limit} MBits/sec) - RSSI after test: {rssi} dBm"
+                    )
+                else:
+                    out.append(
+                        f"    Result: PASSED ({int(mbits)} MBits/sec >= {limit} MBits/sec) - RSSI after test: {rssi} dBm"
+                    )
+            if attempts > 1:
+                break
+    out += ["", "Total elapsed time: %dm %ds" % divmod(duration * 2 + rng.randint(40, 90), 60)]
+    out.append(f"WiFi Test Result: {wifi_result}ED")
+
+    if bt_tested:
+        out += ["", f">>> Sent command: bash bt_ping.sh {bt_mac}"]
+        if cause == "bt_device":
+            out += ["ERROR: BT device (hci0/hciX) not found!", "Bluetooth Test Result: FAILED", "Reason: HCI device not detected"]
+        elif cause == "bt_loss":
+            for attempt in range(1, 7):
+                out += [f"Attempt {attempt}/6:", "L2ping result: 10 sent, 6 received, 40% loss", f"Attempt {attempt}: FAILED"]
+            out.append("Bluetooth Test Result: FAILED (All 6 attempts failed)")
+        else:
+            out += ["Attempt 1/6:", "L2ping result: 10 sent, 10 received, 0% loss", "Attempt 1: PASSED"]
+            out.append("Bluetooth Test Result: PASSED (At least one attempt succeeded)")
+
+    out += ["", "=" * 60, "Test Results Summary", "=" * 60, f"WiFi Test Result: {wifi_result}"]
+    if bt_result != "SKIP":
+        out.append(f"BT Test Result: {bt_result}")
+    out += [f"Final Result: {result}", "=" * 60, ""]
+    return "\n".join(out)
+
+
+def generate_log_tree(
+    root: str,
+    count: int,
+    seed: int = 0,
+    units: Optional[int] = None,
+    body: str = "short",
+    layout: str = "dated",
+    progress: bool = False,
+) -> int:
+    """Write `count` log files under `root`; returns the number of files written.
+
+    layout "dated" mirrors save_log (root/wifi_stress_log_YYYYMMDD/...); "flat" puts
+    every file directly in `root`. Entries are streamed, so any size fits in memory.
+    """
+    body_rng = random.Random(seed + 1)  # separate stream: names do not depend on `body`
+    made_dirs = set()
+    written = 0
+    for entry in generate_entries(count, seed=seed, units=units):
+        folder = root if layout == "flat" else os.path.join(root, f"wifi_stress_log_{entry.dt:%Y%m%d}")
+        if folder not in made_dirs:
+            os.makedirs(folder, exist_ok=True)
+            made_dirs.add(folder)
+        with open(os.path.join(folder, entry.name), "w", encoding="utf-8") as f:
+            f.write(render_log(entry, body_rng, body))
+        written += 1
+        if progress and written % 100000 == 0:
+            print(f"  {written:,} / {count:,} files", file=sys.stderr, flush=True)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic WiFi stress log corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    names = sub.add_parser("names", help="Print synthetic log filenames, one per line")
+    names.add_argument("--count", type=int, default=1000)
+    names.add_argument("--seed", type=int, default=0)
+
+    tree = sub.add_parser("tree", help="Write a log folder tree with bodies (save_log layout)")
+    tree.add_argument("--root", required=True)
+    tree.add_argument("--count", type=int, default=1000)
+    tree.add_argument("--seed", type=int, default=0)
+    tree.add_argument("--units", type=int, default=None, help="Distinct SNs (default: 90%% of --count)")
+    tree.add_argument("--body", choices=sorted(BODY_SIZES), default="short")
+    tree.add_argument("--layout", choices=["dated", "flat"], default="dated")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "names":
+        for name in generate_filenames(args.count, seed=args.seed):
+            print(name)
+    elif args.command == "tree":
+        written = generate_log_tree(
+            args.root, args.count, seed=args.seed, units=args.units, body=args.body, layout=args.layout, progress=True
+        )
+        print(f"Wrote {written} files under {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
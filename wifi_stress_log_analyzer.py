@@ -1,12 +1,32 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import bisect
 import csv
+import hashlib
+import heapq
+import mmap
+import multiprocessing
+import operator
 import os
+import queue
 import re
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Tuple
+import struct
+import sys
+import time
+from array import array
+from collections import ChainMap, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+# NumPy is optional (statistics engine only). Keep parse/report working without it.
+try:
+    import numpy as np  # type: ignore
+except ModuleNotFoundError:
+    np = None  # type: ignore
 
 APP_VERSION = "2026.01.02"
 APP_WINDOW_TITLE = "WiFi Stress Log Analyzer - Designed by TechNexion"
@@ -42,6 +62,12 @@ class LogRecord:
     serial: str
     result: str  # PASS/FAIL
     filename: str
+    log_dir: str = ""
+    station: str = ""  # source station (multi-station merge only)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.log_dir, self.filename)
 
 
 def parse_log_directory_raw(log_dir: str) -> List[LogRecord]:
@@ -51,13 +77,7 @@ def parse_log_directory_raw(log_dir: str) -> List[LogRecord]:
         return records
 
     for name in os.listdir(log_dir):
-        if not name.lower().endswith(".txt"):
-            continue
-
-        if _is_excluded_by_name(name):
-            continue
-
-        rec = _try_parse_record_from_filename(name)
+        rec = _parse_log_filename(name, log_dir)
         if rec is None:
             continue
 
@@ -96,7 +116,7 @@ def _is_excluded_by_name(filename: str) -> bool:
     return False
 
 
-def _try_parse_record_from_filename(filename: str) -> Optional[LogRecord]:
+def _try_parse_record_from_filename(filename: str, log_dir: str = "", station: str = "") -> Optional[LogRecord]:
     m2 = _FILENAME_V2_RE.match(filename)
     m1 = _FILENAME_V1_RE.match(filename) if m2 is None else None
     m = m2 or m1
@@ -140,6 +160,72 @@ def _try_parse_record_from_filename(filename: str) -> Optional[LogRecord]:
         serial=mac_field,
         result=result,
         filename=filename,
+        log_dir=log_dir,
+        station=station,
+    )
+
+
+def _parse_log_filename(filename: str, log_dir: str = "", station: str = "") -> Optional[LogRecord]:
+    """Fast path for the directory scan.
+
+    Same result as the ".txt" suffix check + `_is_excluded_by_name` +
+    `_try_parse_record_from_filename`, but splits on "_" once and builds the datetime
+    arithmetically instead of going through two regexes and `strptime`. Non-ASCII names
+    (where `\\d`, `str.upper` and friends have Unicode semantics) take the slow path.
+    """
+    if not filename.isascii():
+        if not filename.lower().endswith(".txt") or _is_excluded_by_name(filename):
+            return None
+        return _try_parse_record_from_filename(filename, log_dir, station)
+
+    # Only a lower-case ".txt" can satisfy the filename regexes.
+    if not filename.endswith(".txt"):
+        return None
+    stem = filename[:-4]
+
+    parts = stem.split("_")
+    if len(parts) == 6:
+        date_raw, time_raw, sn, mac1, mac2, result_raw = parts
+        if not mac1 or not mac2:
+            return None
+        mac_field = f"{mac1}_{mac2}"
+    elif len(parts) == 5:
+        date_raw, time_raw, sn, mac_field, result_raw = parts
+        if not mac_field:
+            return None
+    else:
+        return None
+
+    if not sn or len(date_raw) != 8 or len(time_raw) != 6:
+        return None
+    if not date_raw.isdigit() or not time_raw.isdigit() or not result_raw.isalpha():
+        return None
+
+    result = result_raw.upper()
+    if result != "PASS" and result != "FAIL":
+        return None
+
+    name_upper = filename.upper()
+    if "DUMMY" in name_upper or "TERMINATED" in name_upper or "TERNINATED" in name_upper:
+        return None
+
+    d = int(date_raw)
+    t = int(time_raw)
+    try:
+        dt = datetime(d // 10000, d // 100 % 100, d % 100, t // 10000, t // 100 % 100, t % 100)
+    except ValueError:
+        return None
+
+    return LogRecord(
+        dt=dt,
+        test_date=f"{date_raw[0:4]}-{date_raw[4:6]}-{date_raw[6:8]}",
+        test_time=f"{time_raw[0:2]}:{time_raw[2:4]}:{time_raw[4:6]}",
+        mac=sn,
+        serial=mac_field,
+        result=result,
+        filename=filename,
+        log_dir=log_dir,
+        station=station,
     )
 
 
@@ -154,30 +240,1923 @@ def parse_log_directory(log_dir: str) -> Tuple[List[LogRecord], int, int, int]:
     return deduped, total, pass_count, fail_count
 
 
+# --------------------------------------------------------------------------------------
+# Log content metrics (optional second pass over the .txt bodies)
+# --------------------------------------------------------------------------------------
+
+# wifi_test.sh "-s" group -> station name used by the test GUI.
+_SSID_GROUP_TO_STATION = {"solo": "SOLO", "grpa": "STA-A", "grpb": "STA-B"}
+
+_CONTENT_BAND_RE = re.compile(r"Starting (5G|2\.4G) Band Test")
+_CONTENT_RSSI_RE = re.compile(r"^\s*RSSI: (-?\d+) dBm")
+_CONTENT_RESULT_RE = re.compile(
+    # "    Result: PASSED (85 MBits/sec >= 50 MBits/sec) - RSSI after test: -47 dBm"
+    r"Result: (?:PASSED|FAILED) \((\d+) MBits/sec .*?RSSI after test: (-?\d+)"
+)
+_CONTENT_STATION_RE = re.compile(r"SSID Group: (\w+)")
+_CONTENT_ELAPSED_RE = re.compile(r"Total elapsed time: (\d+)m (\d+)s")
+_CONTENT_DURATION_RE = re.compile(r"^\s*Duration: (\d+) seconds")
+_CONTENT_ADAPTIVE_RE = re.compile(r"^\s*Adaptive Duration: on")
+
+
+@dataclass(frozen=True)
+class LogContentMetrics:
+    filename: str
+    port: str = ""
+    station: str = ""
+    throughput_5g: Optional[float] = None  # MBits/sec of the final attempt
+    throughput_24g: Optional[float] = None
+    rssi_5g: Optional[int] = None  # dBm, after the final attempt
+    rssi_24g: Optional[int] = None
+    elapsed_s: Optional[int] = None
+    duration_s: Optional[int] = None  # configured iperf duration per attempt (-d)
+    adaptive: bool = False  # wifi_test.sh -A: attempts may stop before duration_s
+
+
+def parse_log_content_metrics(path: str) -> Optional[LogContentMetrics]:
+    """Extract throughput/RSSI/station/port from a saved log body."""
+    port = ""
+    station = ""
+    band = ""
+    throughput: Dict[str, float] = {}
+    rssi: Dict[str, int] = {}
+    elapsed_s: Optional[int] = None
+    duration_s: Optional[int] = None
+    adaptive = False
+
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if not port and line.startswith("Port: "):
+                    port = line[6:].strip()
+                    continue
+
+                m = _CONTENT_BAND_RE.search(line)
+                if m:
+                    band = m.group(1)
+                    continue
+
+                if not band:
+                    if not station:
+                        m = _CONTENT_STATION_RE.search(line)
+                        if m:
+                            station = _SSID_GROUP_TO_STATION.get(m.group(1).lower(), m.group(1).upper())
+                            continue
+                    if duration_s is None:
+                        m = _CONTENT_DURATION_RE.match(line)
+                        if m:
+                            duration_s = int(m.group(1))
+                            continue
+                    if not adaptive and _CONTENT_ADAPTIVE_RE.match(line):
+                        adaptive = True
+                    continue
+
+                m = _CONTENT_RESULT_RE.search(line)
+                if m:
+                    # Keep the last attempt of each band (the one that decided the band result).
+                    throughput[band] = float(m.group(1))
+                    rssi[band] = int(m.group(2))
+                    continue
+
+                m = _CONTENT_RSSI_RE.match(line)
+                if m and band not in rssi:
+                    rssi[band] = int(m.group(1))
+                    continue
+
+                m = _CONTENT_ELAPSED_RE.search(line)
+                if m:
+                    elapsed_s = int(m.group(1)) * 60 + int(m.group(2))
+    except OSError:
+        return None
+
+    return LogContentMetrics(
+        filename=os.path.basename(path),
+        port=port,
+        station=station,
+        throughput_5g=throughput.get("5G"),
+        throughput_24g=throughput.get("2.4G"),
+        rssi_5g=rssi.get("5G"),
+        rssi_24g=rssi.get("2.4G"),
+        elapsed_s=elapsed_s,
+        duration_s=duration_s,
+        adaptive=adaptive,
+    )
+
+
+def parse_log_contents(records: List[LogRecord]) -> Dict[str, LogContentMetrics]:
+    metrics: Dict[str, LogContentMetrics] = {}
+    for r in records:
+        m = parse_log_content_metrics(r.path)
+        if m is not None:
+            metrics[r.filename] = m
+    return metrics
+
+
+# --------------------------------------------------------------------------------------
+# Log metadata (header + summary footer only; the iperf body is never read)
+# --------------------------------------------------------------------------------------
+
+# save_log writes a ~250 byte header (Date/Port/SN/WiFi MAC/BT MAC) and a ~200 byte
+# "Test Results Summary" footer. The head window also covers the first body lines,
+# where the wifi_test.sh command shows the "-s" SSID group (station).
+LOG_HEAD_BYTES = 1024
+LOG_TAIL_BYTES = 512
+
+_HEADER_FIELDS = {"Date": "date", "Port": "port", "SN": "sn", "WiFi MAC": "wifi_mac", "BT MAC": "bt_mac"}
+_FOOTER_FIELDS = {"WiFi Test Result": "wifi_result", "BT Test Result": "bt_result", "Final Result": "final_result"}
+_HEAD_COMMAND_STATION_RE = re.compile(r"wifi_test\.sh\b.*?\s-s\s+(\w+)")
+
+
+@dataclass(frozen=True)
+class LogMetadata:
+    filename: str
+    date: str = ""
+    port: str = ""
+    sn: str = ""
+    wifi_mac: str = ""
+    bt_mac: str = ""
+    station: str = ""
+    wifi_result: str = ""
+    bt_result: str = ""  # "" when BT was skipped
+    final_result: str = ""
+
+
+def _read_head_tail(path: str) -> Optional[Tuple[str, str]]:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(LOG_HEAD_BYTES)
+            size = os.fstat(f.fileno()).st_size
+            if size <= LOG_HEAD_BYTES + LOG_TAIL_BYTES:
+                # Small log: the footer may straddle the head window, so read the rest.
+                tail = head + f.read()
+            else:
+                f.seek(size - LOG_TAIL_BYTES)
+                tail = f.read(LOG_TAIL_BYTES)
+    except OSError:
+        return None
+    return head.decode("utf-8", errors="ignore"), tail.decode("utf-8", errors="ignore")
+
+
+def _scan_fields(lines: Iterable[str], keys: Dict[str, str], out: Dict[str, str]) -> None:
+    for line in lines:
+        key, sep, value = line.partition(": ")
+        attr = keys.get(key.strip())
+        if sep and attr and attr not in out:
+            out[attr] = value.strip()
+
+
+def read_log_metadata(path: str) -> Optional[LogMetadata]:
+    """Header/footer fields of a saved log with two small reads (head + seek to tail)."""
+    parts = _read_head_tail(path)
+    if parts is None:
+        return None
+    head, tail = parts
+
+    fields: Dict[str, str] = {}
+    head_lines = head.splitlines()
+    _scan_fields(head_lines, _HEADER_FIELDS, fields)
+
+    # Only trust the footer after the last summary banner (the body may echo result lines).
+    summary = tail.rfind("Test Results Summary")
+    if summary >= 0:
+        _scan_fields(tail[summary:].splitlines(), _FOOTER_FIELDS, fields)
+
+    station = ""
+    for line in head_lines:
+        m = _CONTENT_STATION_RE.search(line) or _HEAD_COMMAND_STATION_RE.search(line)
+        if m:
+            station = _SSID_GROUP_TO_STATION.get(m.group(1).lower(), m.group(1).upper())
+            break
+
+    return LogMetadata(filename=os.path.basename(path), station=station, **fields)
+
+
+def parse_log_metadata(records: List[LogRecord]) -> Dict[str, LogMetadata]:
+    metadata: Dict[str, LogMetadata] = {}
+    for r in records:
+        m = read_log_metadata(r.path)
+        if m is not None:
+            metadata[r.filename] = m
+    return metadata
+
+
+def _alnum(text: str) -> str:
+    return "".join(c for c in text if c.isalnum()).upper()
+
+
+def metadata_mismatches(record: LogRecord, meta: LogMetadata) -> List[str]:
+    """Filename fields that disagree with the log content (renamed/copied logs)."""
+    problems: List[str] = []
+    # save_log builds the filename from the same values with non-alphanumerics stripped.
+    if meta.sn and _alnum(meta.sn) != _alnum(record.mac):
+        problems.append(f"SN {meta.sn}")
+    # Header "WiFi MAC" is MAC1+MAC2 concatenated (older builds wrote MAC1 only).
+    if meta.wifi_mac and _alnum(meta.wifi_mac) not in (_alnum(record.serial), _alnum(record.serial.split("_")[0])):
+        problems.append(f"WiFi MAC {meta.wifi_mac}")
+    if not meta.final_result:
+        problems.append("no result summary")
+    elif meta.final_result != record.result:
+        problems.append(f"Final Result {meta.final_result}")
+    return problems
+
+
+# --------------------------------------------------------------------------------------
+# Failure classifier (one scan per FAIL log)
+# --------------------------------------------------------------------------------------
+
+# (category, domain, literal markers printed by wifi_test.sh / bt_ping.sh), in priority
+# order: when a log shows several causes, the earliest category in this list wins
+# (e.g. a lost connection also produces "No valid throughput data" later on).
+FAILURE_CATEGORIES: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("WiFi interface down", "WiFi", ("interface is not up", "interface was not detected after")),
+    (
+        "WiFi connect failed",
+        "WiFi",
+        ("Failed to connect", "Failed to reconnect", "Failed to reset WiFi connection"),
+    ),
+    (
+        "No IP address",
+        "WiFi",
+        ("Failed to get IP address", "Failed to obtain IP address", "IP is not in 192.168.200.x range"),
+    ),
+    ("No throughput data", "WiFi", ("No valid throughput data",)),
+    ("Low throughput", "WiFi", ("MBits/sec < ",)),
+    (
+        "BT device not found",
+        "BT",
+        ("BT device (hci0/hciX) not found", "HCI device not detected", "BT device failed to come up"),
+    ),
+    ("BT l2ping loss", "BT", ("Bluetooth Test Result: FAILED (All",)),
+]
+FAILURE_UNCLASSIFIED = "Unclassified"
+
+# A domain that reports PASS cannot be the failure cause, whatever its retries printed.
+_DOMAIN_PASS_MARKERS = {"WiFi Test Result: PASS": "WiFi", "BT Test Result: PASS": "BT", "Bluetooth Test Result: PASS": "BT"}
+
+_MARKER_TO_CATEGORY: Dict[str, int] = {
+    marker: i for i, (_, _, markers) in enumerate(FAILURE_CATEGORIES) for marker in markers
+}
+# All markers compiled into one alternation: the text is scanned once, in C, for every
+# marker at the same time. (A pure-Python Aho-Corasick automaton gives the same single
+# pass but measured ~10x slower per byte in CPython.)
+_FAILURE_MARKER_RE = re.compile(
+    "|".join(re.escape(m) for m in sorted([*_MARKER_TO_CATEGORY, *_DOMAIN_PASS_MARKERS], key=len, reverse=True))
+)
+
+# Below this many logs the process pool start-up costs more than it saves.
+CLASSIFY_POOL_MIN_LOGS = 64
+
+
+@dataclass(frozen=True)
+class FailureCause:
+    filename: str
+    category: str
+    line: str = ""  # first log line showing the cause
+
+
+def classify_log_text(text: str, filename: str = "") -> FailureCause:
+    first_hit: Dict[int, int] = {}  # category index -> offset of its first marker
+    passed_domains = set()
+    for m in _FAILURE_MARKER_RE.finditer(text):
+        marker = m.group(0)
+        domain = _DOMAIN_PASS_MARKERS.get(marker)
+        if domain:
+            passed_domains.add(domain)
+        else:
+            first_hit.setdefault(_MARKER_TO_CATEGORY[marker], m.start())
+
+    for i in sorted(first_hit):
+        category, domain, _ = FAILURE_CATEGORIES[i]
+        if domain in passed_domains:
+            continue
+        pos = first_hit[i]
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        line = text[start : end if end >= 0 else len(text)]
+        # Scripts colour some errors; drop the ANSI escapes from the stored line.
+        return FailureCause(filename, category, re.sub(r"\x1b\[[0-9;]*m", "", line).strip())
+    return FailureCause(filename, FAILURE_UNCLASSIFIED)
+
+
+def classify_log_failure(path: str) -> Optional[FailureCause]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+    except OSError:
+        return None
+    return classify_log_text(text, os.path.basename(path))
+
+
+def classify_failures(records: Iterable[LogRecord], max_workers: Optional[int] = None) -> Dict[str, FailureCause]:
+    """Classify the FAIL logs among `records` (filename -> cause), on a process pool."""
+    paths = [r.path for r in records if r.result == "FAIL"]
+    if len(paths) < CLASSIFY_POOL_MIN_LOGS or max_workers == 1:
+        causes = map(classify_log_failure, paths)
+        return {c.filename: c for c in causes if c is not None}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        chunksize = max(1, len(paths) // ((max_workers or os.cpu_count() or 1) * 4))
+        causes = pool.map(classify_log_failure, paths, chunksize=chunksize)
+        return {c.filename: c for c in causes if c is not None}
+
+
+def failure_pareto(causes: Iterable[FailureCause]) -> List[Tuple[str, int]]:
+    counts: Dict[str, int] = {}
+    for c in causes:
+        counts[c.category] = counts.get(c.category, 0) + 1
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+# --------------------------------------------------------------------------------------
+# Vectorized statistics engine (NumPy)
+# --------------------------------------------------------------------------------------
+
+# Production shifts: day shift is [08:00, 20:00); night shift runs until 08:00 next day
+# and is attributed to the date it started on.
+SHIFT_DAY_START_HOUR = 8
+SHIFT_NIGHT_START_HOUR = 20
+
+_PERCENTILES = (5, 50, 95)
+
+# (key, total, pass)
+YieldGroup = Tuple[str, int, int]
+
+# (configured iperf duration s, adaptive, tests, median elapsed s)
+CycleTimeGroup = Tuple[int, bool, int, float]
+
+
+@dataclass
+class YieldStats:
+    total: int = 0
+    pass_count: int = 0
+    fail_count: int = 0
+    attempts: int = 0  # raw (non-deduped) test count
+    first_pass_count: int = 0  # SNs whose first attempt passed
+    retested_sn: int = 0
+    total_retests: int = 0
+    by_day: List[YieldGroup] = field(default_factory=list)
+    by_hour: List[YieldGroup] = field(default_factory=list)
+    by_shift: List[YieldGroup] = field(default_factory=list)
+    by_station: List[YieldGroup] = field(default_factory=list)
+    by_port: List[YieldGroup] = field(default_factory=list)
+    by_bt: List[YieldGroup] = field(default_factory=list)
+    # (filename, problems) of deduped records whose name disagrees with the log content
+    mismatches: List[Tuple[str, str]] = field(default_factory=list)
+    # name -> (p5, p50, p95, samples)
+    percentiles: Dict[str, Tuple[float, float, float, int]] = field(default_factory=dict)
+    # median test cycle time per configured duration, fixed vs adaptive (wifi_test.sh -A)
+    cycle_times: List[CycleTimeGroup] = field(default_factory=list)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError(
+            "NumPy is not installed in this Python environment.\n"
+            "Install it first: python3 -m pip install numpy (or sudo apt install python3-numpy)"
+        )
+
+
+def _codes(values: List[str]) -> Tuple["np.ndarray", List[str]]:
+    # Dictionary-encode strings once so every grouping below stays in integer space.
+    table: Dict[str, int] = {}
+    codes = np.fromiter((table.setdefault(v, len(table)) for v in values), dtype=np.int64, count=len(values))
+    return codes, list(table)
+
+
+def _group_yield(keys: "np.ndarray", passed: "np.ndarray", labels=None) -> List[YieldGroup]:
+    if keys.size == 0:
+        return []
+    uniq, inv = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inv, minlength=uniq.size)
+    passes = np.bincount(inv, weights=passed, minlength=uniq.size)
+    out: List[YieldGroup] = []
+    for k, t, p in zip(uniq.tolist(), totals.tolist(), passes.tolist()):
+        out.append((labels(k) if labels else str(k), int(t), int(p)))
+    return out
+
+
+def _percentiles(values: "np.ndarray") -> Optional[Tuple[float, float, float, int]]:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    p = np.percentile(values, _PERCENTILES)
+    return float(p[0]), float(p[1]), float(p[2]), int(values.size)
+
+
+def compute_yield_stats(
+    raw_records: List[LogRecord],
+    metrics: Optional[Dict[str, LogContentMetrics]] = None,
+    metadata: Optional[Dict[str, LogMetadata]] = None,
+) -> YieldStats:
+    """Compute yield/retest/percentile statistics in vectorized passes.
+
+    `raw_records` must be the non-deduped records; the SN dedupe (keep latest) is done
+    here with the same tie rule as `_dedupe_keep_latest_by_sn`. `metadata` (header/footer
+    reads) is enough for the station/port/BT breakdowns; `metrics` adds percentiles.
+    """
+    _require_numpy()
+
+    stats = YieldStats()
+    n = len(raw_records)
+    stats.attempts = n
+    if n == 0:
+        return stats
+
+    ts = np.array([r.dt for r in raw_records], dtype="datetime64[s]")
+    passed = np.fromiter((r.result == "PASS" for r in raw_records), dtype=bool, count=n)
+    sn, _ = _codes([r.mac for r in raw_records])
+
+    # Order by (SN, time); among equal times the earliest-listed record must win,
+    # so the index is the (descending) tie-breaker.
+    idx = np.arange(n)
+    order = np.lexsort((-idx, ts, sn))
+    sn_sorted = sn[order]
+    group_end = np.ones(n, dtype=bool)
+    group_end[:-1] = sn_sorted[1:] != sn_sorted[:-1]
+    group_start = np.ones(n, dtype=bool)
+    group_start[1:] = sn_sorted[1:] != sn_sorted[:-1]
+
+    latest = order[group_end]
+    latest.sort()  # back to time order
+    first = order[group_start]
+
+    attempts_per_sn = np.bincount(sn)
+    attempts_per_sn = attempts_per_sn[attempts_per_sn > 0]
+    stats.retested_sn = int(np.count_nonzero(attempts_per_sn > 1))
+    stats.total_retests = int((attempts_per_sn - 1).sum())
+    stats.first_pass_count = int(np.count_nonzero(passed[first]))
+
+    d_ts = ts[latest]
+    d_pass = passed[latest]
+    stats.total = int(latest.size)
+    stats.pass_count = int(np.count_nonzero(d_pass))
+    stats.fail_count = stats.total - stats.pass_count
+
+    day = d_ts.astype("datetime64[D]")
+    hour = ((d_ts - day).astype(np.int64) // 3600).astype(np.int64)
+    stats.by_day = _group_yield(day, d_pass)
+    stats.by_hour = _group_yield(hour, d_pass, labels=lambda h: f"{h:02d}:00")
+
+    # Shift key = (shift start date) * 2 + is_night; hours before the day shift
+    # belong to the previous date's night shift.
+    shifted = (d_ts - np.timedelta64(SHIFT_DAY_START_HOUR, "h")).astype("datetime64[D]")
+    is_night = (hour < SHIFT_DAY_START_HOUR) | (hour >= SHIFT_NIGHT_START_HOUR)
+    shift_key = shifted.astype(np.int64) * 2 + is_night
+
+    def _shift_label(k: int) -> str:
+        d = np.datetime64(k // 2, "D")
+        return f"{d} {'Night' if k % 2 else 'Day'}"
+
+    stats.by_shift = _group_yield(shift_key, d_pass, labels=_shift_label)
+
+    deduped = [raw_records[i] for i in latest.tolist()]
+    found = [metrics.get(r.filename) for r in deduped] if metrics else [None] * len(deduped)
+    meta = [metadata.get(r.filename) for r in deduped] if metadata else [None] * len(deduped)
+
+    def _pick(attr: str, r_value: str, h: Optional[LogMetadata], m: Optional[LogContentMetrics]) -> str:
+        return r_value or (h and getattr(h, attr)) or (m and getattr(m, attr)) or "UNKNOWN"
+
+    if metrics or metadata or any(r.station for r in deduped):
+        # The source station of a multi-station merge wins over the SSID group in the log.
+        station, station_labels = _codes(
+            [_pick("station", r.station, h, m) for r, h, m in zip(deduped, meta, found)]
+        )
+        stats.by_station = _group_yield(station, d_pass, labels=lambda k: station_labels[k])
+
+    if metrics or metadata:
+        port, port_labels = _codes([_pick("port", "", h, m) for h, m in zip(meta, found)])
+        stats.by_port = _group_yield(port, d_pass, labels=lambda k: port_labels[k])
+
+    if metadata:
+        bt, bt_labels = _codes([f"BT {h.bt_result or 'SKIP'}" if h else "UNKNOWN" for h in meta])
+        stats.by_bt = _group_yield(bt, d_pass, labels=lambda k: bt_labels[k])
+        for r, h in zip(deduped, meta):
+            problems = metadata_mismatches(r, h) if h else []
+            if problems:
+                stats.mismatches.append((r.filename, ", ".join(problems)))
+
+    if metrics:
+        def _column(attr: str) -> "np.ndarray":
+            return np.array(
+                [getattr(m, attr) if m and getattr(m, attr) is not None else np.nan for m in found],
+                dtype=np.float64,
+            )
+
+        for name, attr in (
+            ("5G Throughput (MBits/sec)", "throughput_5g"),
+            ("2.4G Throughput (MBits/sec)", "throughput_24g"),
+            ("5G RSSI (dBm)", "rssi_5g"),
+            ("2.4G RSSI (dBm)", "rssi_24g"),
+            ("Cycle Time (s)", "elapsed_s"),
+        ):
+            p = _percentiles(_column(attr))
+            if p is not None:
+                stats.percentiles[name] = p
+
+        elapsed = _column("elapsed_s")
+        duration = _column("duration_s")
+        adaptive = np.fromiter((bool(m and m.adaptive) for m in found), dtype=bool, count=len(found))
+        ok = ~np.isnan(elapsed) & ~np.isnan(duration)
+        if np.any(ok):
+            key = duration[ok].astype(np.int64) * 2 + adaptive[ok]
+            uniq, inv = np.unique(key, return_inverse=True)
+            counts = np.bincount(inv, minlength=uniq.size)
+            values = elapsed[ok]
+            for i, (k, count) in enumerate(zip(uniq.tolist(), counts.tolist())):
+                stats.cycle_times.append((k // 2, bool(k % 2), int(count), float(np.median(values[inv == i]))))
+
+    return stats
+
+
+MISMATCH_LIST_LIMIT = 50
+
+
+def format_yield_stats(stats: YieldStats) -> str:
+    lines: List[str] = []
+    lines.append(f"Total: {stats.total}  (attempts: {stats.attempts})")
+    lines.append(f"PASS: {stats.pass_count} ({_ratio_text(stats.pass_count, stats.total)})")
+    lines.append(f"FAIL: {stats.fail_count} ({_ratio_text(stats.fail_count, stats.total)})")
+    lines.append(f"First Pass Yield: {stats.first_pass_count} ({_ratio_text(stats.first_pass_count, stats.total)})")
+    lines.append(
+        f"Retested SN: {stats.retested_sn} ({_ratio_text(stats.retested_sn, stats.total)}), "
+        f"Total Retests: {stats.total_retests}"
+    )
+
+    def _section(title: str, groups: List[YieldGroup]) -> None:
+        if not groups:
+            return
+        lines.append("")
+        lines.append(title)
+        width = max(len(k) for k, _, _ in groups)
+        for key, total, passes in groups:
+            lines.append(
+                f"  {key:<{width}}  Total: {total:>6}  PASS: {passes:>6}  Yield: {_ratio_text(passes, total):>6}"
+            )
+
+    _section("Yield by Day", stats.by_day)
+    _section("Yield by Shift", stats.by_shift)
+    _section("Yield by Hour", stats.by_hour)
+    _section("Yield by Station", stats.by_station)
+    _section("Yield by Port", stats.by_port)
+    _section("Yield by BT Result", stats.by_bt)
+
+    if stats.percentiles:
+        lines.append("")
+        lines.append("Percentiles (P5 / P50 / P95)")
+        width = max(len(k) for k in stats.percentiles)
+        for name, (p5, p50, p95, count) in stats.percentiles.items():
+            lines.append(f"  {name:<{width}}  {p5:8.1f} / {p50:8.1f} / {p95:8.1f}  (n={count})")
+
+    if any(adaptive for _, adaptive, _, _ in stats.cycle_times):
+        # Only worth a section once some tests ran with adaptive duration.
+        lines.append("")
+        lines.append("Cycle Time by iperf Duration (median)")
+        fixed = {d: median for d, adaptive, _, median in stats.cycle_times if not adaptive}
+        for duration, adaptive, count, median in stats.cycle_times:
+            text = f"  {duration:>5} s {'adaptive' if adaptive else 'fixed':<8}  {median:8.1f} s  (n={count})"
+            base = fixed.get(duration)
+            if adaptive and base:
+                text += f"  {(median - base) / base * 100:+.1f}% vs fixed"
+            lines.append(text)
+
+    if stats.mismatches:
+        lines.append("")
+        lines.append(f"Filename / Content Mismatches: {len(stats.mismatches)}")
+        for filename, problems in stats.mismatches[:MISMATCH_LIST_LIMIT]:
+            lines.append(f"  {filename}: {problems}")
+        if len(stats.mismatches) > MISMATCH_LIST_LIMIT:
+            lines.append(f"  ... {len(stats.mismatches) - MISMATCH_LIST_LIMIT} more")
+
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------------------
+# Throughput / RSSI trend detector (log contents, per station and band)
+# --------------------------------------------------------------------------------------
+
+# (LogContentMetrics field, band, label, minimum drop, drop is relative)
+# Throughput depends on product and AP, so its drop is relative; RSSI drops in dB.
+TREND_METRICS = [
+    ("throughput_5g", "5G", "throughput", 0.10, True),
+    ("throughput_24g", "2.4G", "throughput", 0.10, True),
+    ("rssi_5g", "5G", "RSSI", 5.0, False),
+    ("rssi_24g", "2.4G", "RSSI", 5.0, False),
+]
+TREND_EWMA_ALPHA = 0.1  # weight of the newest test in the short-term EWMA
+TREND_RECENT_TESTS = 30  # rolling median window
+TREND_BASELINE_TESTS = 300  # reference tests (older than the rolling window)
+TREND_BASELINE_MIN = 30  # reference tests needed before a series is judged
+TREND_SIGMA_LIMIT = 4.0  # EWMA control limit, in standard errors of the EWMA
+TREND_CHUNK_TESTS = 10  # tests folded in between two checks
+TREND_PRIME_LOGS = 2000  # latest existing logs read to seed the baselines when a watch starts
+
+
+@dataclass(frozen=True)
+class TrendAlert:
+    station: str
+    band: str
+    metric: str  # "throughput" / "RSSI"
+    state: str  # "DROP" or "RECOVERED"
+    dt: datetime
+    filename: str  # last log of the chunk that raised the alert
+    baseline: float  # reference median
+    recent: float  # rolling median
+    ewma: float
+
+
+class _TrendSeries:
+    """EWMA + rolling median of one (station, band, metric) series.
+
+    The reference is the window of tests just before the rolling window. A drop is
+    flagged when the EWMA falls below the reference mean by more than
+    TREND_SIGMA_LIMIT standard errors (EWMA control chart) and the rolling median is
+    at least the metric's minimum drop below the reference median. The reference
+    stops moving while a drop is flagged, so degraded tests never become the normal.
+    """
+
+    def __init__(self, min_drop: float, relative: bool):
+        self.min_drop = min_drop
+        self.relative = relative
+        self.count = 0
+        self.ewma: Optional[float] = None
+        self.recent = np.empty(0)
+        self.baseline = np.empty(0)
+        self.dropped = False
+
+    def _drop(self, baseline_median: float, recent_median: float) -> float:
+        drop = baseline_median - recent_median
+        if self.relative:
+            return drop / baseline_median if baseline_median > 0 else 0.0
+        return drop
+
+    def update(self, values: "np.ndarray") -> Optional[Tuple[str, float, float]]:
+        """Fold one chunk in; returns (state, reference median, rolling median) on a change."""
+        self.count += len(values)
+        a = TREND_EWMA_ALPHA
+        tail = values
+        if self.ewma is None:
+            self.ewma, tail = float(values[0]), values[1:]
+        if len(tail):
+            # EWMA after n more values: (1-a)^n * e0 + sum(a * (1-a)^(n-k) * x_k), k = 1..n
+            weights = a * (1.0 - a) ** np.arange(len(tail) - 1, -1, -1)
+            self.ewma = (1.0 - a) ** len(tail) * self.ewma + float(weights @ tail)
+
+        recent = np.concatenate((self.recent, values))
+        overflow, self.recent = recent[:-TREND_RECENT_TESTS], recent[-TREND_RECENT_TESTS:]
+        if len(overflow) and not self.dropped:
+            self.baseline = np.concatenate((self.baseline, overflow))[-TREND_BASELINE_TESTS:]
+
+        if len(self.baseline) < TREND_BASELINE_MIN:
+            return None
+        mean = float(self.baseline.mean())
+        limit = mean - TREND_SIGMA_LIMIT * float(self.baseline.std(ddof=1)) * (a / (2.0 - a)) ** 0.5
+        baseline_median = float(np.median(self.baseline))
+        recent_median = float(np.median(self.recent))
+
+        if not self.dropped and self.ewma < limit and self._drop(baseline_median, recent_median) >= self.min_drop:
+            self.dropped = True
+            return "DROP", baseline_median, recent_median
+        if self.dropped and self.ewma >= limit:
+            self.dropped = False
+            return "RECOVERED", baseline_median, recent_median
+        return None
+
+
+class TrendDetector:
+    """Streaming throughput/RSSI trend per (station, band) from parsed log contents.
+
+    Feed logs in time order with `add()` (a whole history or the few logs of a watch
+    tick); each series is updated with vectorized chunks and the alerts raised by the
+    batch are returned. Needs NumPy.
+    """
+
+    def __init__(self):
+        _require_numpy()
+        self.series: Dict[Tuple[str, str, str], _TrendSeries] = {}
+        self.alerts: List[TrendAlert] = []
+
+    def add(self, records: Iterable[LogRecord], metrics: Dict[str, LogContentMetrics]) -> List[TrendAlert]:
+        batches: Dict[Tuple[str, str, str], Tuple[List[float], List[LogRecord]]] = {}
+        for r in records:
+            m = metrics.get(r.filename)
+            if m is None:
+                continue
+            station = r.station or m.station or "-"
+            for attr, band, label, _, _ in TREND_METRICS:
+                value = getattr(m, attr)
+                if value is not None:
+                    values, recs = batches.setdefault((station, band, label), ([], []))
+                    values.append(value)
+                    recs.append(r)
+
+        new_alerts: List[TrendAlert] = []
+        limits = {(band, label): (min_drop, relative) for _, band, label, min_drop, relative in TREND_METRICS}
+        for key, (values, recs) in batches.items():
+            series = self.series.get(key)
+            if series is None:
+                self.series[key] = series = _TrendSeries(*limits[key[1:]])
+            arr = np.asarray(values, dtype=np.float64)
+            for lo in range(0, len(arr), TREND_CHUNK_TESTS):
+                change = series.update(arr[lo : lo + TREND_CHUNK_TESTS])
+                if change is not None:
+                    state, baseline, recent = change
+                    last = recs[min(lo + TREND_CHUNK_TESTS, len(recs)) - 1]
+                    new_alerts.append(TrendAlert(*key, state, last.dt, last.filename, baseline, recent, series.ewma))
+
+        new_alerts.sort(key=lambda a: a.dt)
+        self.alerts.extend(new_alerts)
+        return new_alerts
+
+
+def format_trend_alert(alert: TrendAlert) -> str:
+    unit = "MBits/sec" if alert.metric == "throughput" else "dBm"
+    return (
+        f"[{alert.dt:%Y-%m-%d %H:%M:%S}] {alert.state}: {alert.station} {alert.band} {alert.metric} "
+        f"median {alert.recent:.1f} vs baseline {alert.baseline:.1f} {unit} (EWMA {alert.ewma:.1f}) at {alert.filename}"
+    )
+
+
+def format_trend_report(detector: TrendDetector) -> str:
+    lines: List[str] = ["Trend by Station / Band (rolling median vs baseline median)"]
+    if not detector.series:
+        lines.append("  No throughput/RSSI data in the log contents.")
+    for (station, band, label), s in sorted(detector.series.items()):
+        recent = f"{float(np.median(s.recent)):8.1f}" if len(s.recent) else "       -"
+        baseline = f"{float(np.median(s.baseline)):8.1f}" if len(s.baseline) >= TREND_BASELINE_MIN else "       -"
+        state = "DROP" if s.dropped else ("ok" if len(s.baseline) >= TREND_BASELINE_MIN else "learning")
+        lines.append(
+            f"  {station:<8} {band:<5} {label:<10}  recent: {recent}  baseline: {baseline}  "
+            f"EWMA: {s.ewma:8.1f}  n={s.count:<6} {state}"
+        )
+    lines.append("")
+    lines.append(f"Alerts: {len(detector.alerts)}")
+    lines.extend(f"  {format_trend_alert(a)}" for a in detector.alerts)
+    return "\n".join(lines)
+
+
+# --------------------------------------------------------------------------------------
+# Live watch mode (incremental yield as new logs land)
+# --------------------------------------------------------------------------------------
+
+
+# Label refresh period of the live yield board (GUI) / default CLI poll interval.
+WATCH_REFRESH_MS = 1000
+
+
+def _record_from_path(path: str, station: str = "") -> Optional[LogRecord]:
+    return _parse_log_filename(os.path.basename(path), os.path.dirname(path), station)
+
+
+class IncrementalYield:
+    """Dedupe-by-SN state with PASS/FAIL counters, updated in O(1) per record.
+
+    Follows `_dedupe_keep_latest_by_sn`: a later record replaces the SN's previous one,
+    an equal or older timestamp is ignored. When records are fed in time order the
+    dict stays ordered by time, so `records()` needs no sort.
+    """
+
+    def __init__(self):
+        self.latest_by_sn: Dict[str, LogRecord] = {}
+        self.pass_count = 0
+        self.fail_count = 0
+        self._in_order = True
+        self._last_dt: Optional[datetime] = None
+
+    @property
+    def total(self) -> int:
+        return self.pass_count + self.fail_count
+
+    def _count(self, r: LogRecord, delta: int) -> None:
+        if r.result == "PASS":
+            self.pass_count += delta
+        elif r.result == "FAIL":
+            self.fail_count += delta
+
+    def add(self, r: LogRecord) -> bool:
+        prev = self.latest_by_sn.get(r.mac)
+        if prev is not None:
+            if not r.dt > prev.dt:
+                return False
+            self._count(prev, -1)
+            del self.latest_by_sn[r.mac]
+
+        if self._last_dt is not None and r.dt < self._last_dt:
+            self._in_order = False
+        else:
+            self._last_dt = r.dt
+
+        self.latest_by_sn[r.mac] = r
+        self._count(r, 1)
+        return True
+
+    def records(self) -> List[LogRecord]:
+        out = list(self.latest_by_sn.values())
+        if not self._in_order:
+            out.sort(key=lambda r: r.dt)
+        return out
+
+
+# inotify(7) constants.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT_HEADER = 16  # int wd; uint32 mask, cookie, len
+
+# Filesystems where inotify does not see writes made by other machines.
+_NETWORK_FS_TYPES = {"cifs", "smb3", "smbfs", "nfs", "nfs4", "fuse.sshfs", "9p", "afs", "vboxsf", "fuse.vmhgfs-fuse"}
+
+
+def _is_network_fs(path: str) -> bool:
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return False
+
+    real = os.path.realpath(path)
+    best, best_type = "", ""
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (real == mount_point or real.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, best_type = mount_point, fs_type
+    return best_type in _NETWORK_FS_TYPES
+
+
+class LogDirectoryWatcher:
+    """Report new *.txt logs under a log root (root folder and its dated sub folders).
+
+    Same folders as Parse (`iter_log_root_sorted`): the root and its direct sub
+    folders, so Watch and Parse totals of a folder agree.
+
+    Uses inotify on Linux and falls back to polling (directory mtime + listing diff)
+    when inotify is unavailable or the root lives on a network share. `poll()` never
+    blocks; call it from a timer.
+    """
+
+    def __init__(self, root: str, force_poll: bool = False):
+        self.root = root
+        self.mode = "poll"
+        self._fd: Optional[int] = None
+        self._libc = None
+        self._wd_to_dir: Dict[int, str] = {}
+        self._seen: set = set()
+        self._dir_mtime: Dict[str, int] = {}
+
+        if not force_poll and sys.platform.startswith("linux") and not _is_network_fs(root):
+            self._init_inotify()
+
+    def _init_inotify(self) -> None:
+        try:
+            import ctypes
+            import ctypes.util
+
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        self._libc = libc
+        self._fd = fd
+        self.mode = "inotify"
+
+    def _add_watch(self, path: str) -> None:
+        if self._fd is None:
+            return
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        )
+        if wd >= 0:
+            self._wd_to_dir[wd] = path
+
+    def _scan_dir(self, path: str, new: List[str], watch: bool) -> None:
+        # Register the folder (the root also its sub folders) and report files not seen before.
+        if watch:
+            self._add_watch(path)
+        try:
+            st = os.stat(path)
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        self._dir_mtime[path] = st.st_mtime_ns
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if path == self.root and entry.path not in self._dir_mtime:
+                    self._scan_dir(entry.path, new, watch)
+            elif entry.name.lower().endswith(".txt") and entry.path not in self._seen:
+                self._seen.add(entry.path)
+                new.append(entry.path)
+
+    def start(self) -> List[str]:
+        """Start watching; returns the logs that already exist (the baseline)."""
+        existing: List[str] = []
+        self._scan_dir(self.root, existing, watch=True)
+        existing.sort(key=os.path.basename)
+        return existing
+
+    def poll(self) -> List[str]:
+        new: List[str] = []
+        if self._fd is not None:
+            self._poll_inotify(new)
+        else:
+            for path, mtime in list(self._dir_mtime.items()):
+                try:
+                    if os.stat(path).st_mtime_ns != mtime:
+                        self._scan_dir(path, new, watch=False)
+                except OSError:
+                    self._dir_mtime.pop(path, None)
+        new.sort(key=os.path.basename)
+        return new
+
+    def _poll_inotify(self, new: List[str]) -> None:
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            except OSError:
+                return
+            if not buf:
+                return
+
+            pos = 0
+            while pos + _INOTIFY_EVENT_HEADER <= len(buf):
+                wd, mask, _cookie, name_len = struct.unpack_from("iIII", buf, pos)
+                raw_name = buf[pos + _INOTIFY_EVENT_HEADER : pos + _INOTIFY_EVENT_HEADER + name_len]
+                pos += _INOTIFY_EVENT_HEADER + name_len
+
+                if mask & _IN_Q_OVERFLOW:
+                    # Kernel queue overflowed: fall back to a one-off rescan.
+                    for path in list(self._dir_mtime):
+                        self._scan_dir(path, new, watch=False)
+                    continue
+                if mask & _IN_IGNORED:
+                    self._wd_to_dir.pop(wd, None)
+                    continue
+
+                parent = self._wd_to_dir.get(wd)
+                if parent is None:
+                    continue
+                path = os.path.join(parent, os.fsdecode(raw_name.rstrip(b"\0")))
+
+                if mask & _IN_ISDIR:
+                    if parent == self.root and mask & (_IN_CREATE | _IN_MOVED_TO) and path not in self._dir_mtime:
+                        # New dated folder: watch it, then pick up files written before the watch existed.
+                        self._scan_dir(path, new, watch=True)
+                    continue
+
+                if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                    if path not in self._seen and path.lower().endswith(".txt"):
+                        self._seen.add(path)
+                        new.append(path)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+# --------------------------------------------------------------------------------------
+# Report generation (streaming, single pass over time-ordered records)
+# --------------------------------------------------------------------------------------
+
+REPORT_CSV_HEADER = ["Product", "Date", "Time", "SN", "MAC", "Result"]
+
+
+def iter_log_records_sorted(log_dir: str, station: str = "") -> Iterator[LogRecord]:
+    """Yield the records of `log_dir` in time order without building a record list.
+
+    Log names start with the fixed-width "YYYYMMDD_HHMMSS" stamp, so sorting the names
+    sorts the records; only the name list is held in memory.
+    """
+    if not log_dir or not os.path.isdir(log_dir):
+        return
+    for name in sorted(os.listdir(log_dir)):
+        rec = _parse_log_filename(name, log_dir, station)
+        if rec is not None:
+            yield rec
+
+
+def _ratio_text_2(count: int, total_count: int) -> str:
+    if total_count <= 0:
+        return "0.00%"
+    return f"{(count / total_count) * 100.0:.2f}%"
+
+
+def _safe_report_name(production_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", production_name)
+
+
+class ReportAccumulator:
+    """Single-pass report state over raw records streamed in time order.
+
+    Each record is consumed once. The state is bounded by the number of distinct SNs
+    (the latest record per SN, kept in time order by `IncrementalYield`) plus the
+    attempts of SNs that were actually retested; the raw record stream is never kept.
+    """
+
+    def __init__(self):
+        self.live = IncrementalYield()
+        self.attempts = 0
+        # SN -> every attempt (time order); only for SNs seen more than once.
+        self.retest_chains: Dict[str, List[LogRecord]] = {}
+        self.stations: set = set()
+        self.window_text = ""  # set when the report covers a time window only
+
+    def add(self, r: LogRecord) -> None:
+        self.attempts += 1
+        if r.station:
+            self.stations.add(r.station)
+        prev = self.live.latest_by_sn.get(r.mac)
+        if prev is not None:
+            chain = self.retest_chains.get(r.mac)
+            if chain is None:
+                self.retest_chains[r.mac] = chain = [prev]
+            chain.append(r)
+        self.live.add(r)
+
+    def extend(self, records: Iterable[LogRecord]) -> "ReportAccumulator":
+        for r in records:
+            self.add(r)
+        return self
+
+    @property
+    def total(self) -> int:
+        return self.live.total
+
+    @property
+    def pass_count(self) -> int:
+        return self.live.pass_count
+
+    @property
+    def fail_count(self) -> int:
+        return self.live.fail_count
+
+    def test_date_text(self) -> str:
+        # Single day -> that day; otherwise the first ~ last day of the final results.
+        final = self.live.records()
+        if not final:
+            return datetime.now().strftime("%Y-%m-%d")
+        first, last = final[0].test_date, final[-1].test_date
+        return first if first == last else f"{first} ~ {last}"
+
+    def retest_items(self) -> List[Tuple[str, List[LogRecord]]]:
+        items = []
+        for sn in sorted(self.retest_chains):
+            chain = self.retest_chains[sn]
+            chain.sort(key=lambda x: x.dt)  # no-op for time-ordered input
+            items.append((sn, chain))
+        return items
+
+    def write_csv(self, csv_path: str, production_name: str) -> None:
+        # Multi-station reports get a trailing Station column; single-folder reports keep the old layout.
+        with_station = bool(self.stations)
+        with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            w = csv.writer(f)
+            w.writerow(REPORT_CSV_HEADER + (["Station"] if with_station else []))
+            for r in self.live.records():
+                # Per request: SN column shows the (long) MAC; MAC column shows the sequence/short code.
+                row = [production_name, r.test_date, r.test_time, r.mac, r.serial, r.result]
+                if with_station:
+                    row.append(r.station)
+                w.writerow(row)
+
+    def final_failures(self) -> List[LogRecord]:
+        return [r for r in self.live.latest_by_sn.values() if r.result == "FAIL"]
+
+    def write_yield_txt(
+        self,
+        txt_path: str,
+        production_name: str,
+        failures: Optional[Dict[str, FailureCause]] = None,
+    ) -> None:
+        total = self.total
+        report_time_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write("WiFi Yield Report\n")
+            f.write(f"Product: {production_name}\n")
+            f.write(f"Test Date: {self.test_date_text()}\n")
+            if self.window_text:
+                f.write(f"Time Window: {self.window_text}\n")
+            f.write(f"Report Time: {report_time_text}\n")
+            f.write(f"Total Tests: {total}\n")
+            f.write(f"PASS Count: {self.pass_count}, PASS Rate: {_ratio_text_2(self.pass_count, total)}\n")
+            f.write(f"FAIL Count: {self.fail_count}, FAIL Rate: {_ratio_text_2(self.fail_count, total)}\n")
+
+            if self.stations:
+                # Station of the final test of each SN.
+                by_station: Dict[str, List[int]] = {}
+                for r in self.live.latest_by_sn.values():
+                    counts = by_station.setdefault(r.station, [0, 0])
+                    counts[0] += 1
+                    counts[1] += r.result == "PASS"
+                f.write("\n")
+                f.write("Yield by Station (final test)\n")
+                for station in sorted(by_station):
+                    st_total, st_pass = by_station[station]
+                    f.write(
+                        f"Station: {station}, Total: {st_total}, PASS: {st_pass}, "
+                        f"PASS Rate: {_ratio_text_2(st_pass, st_total)}\n"
+                    )
+
+            if failures is not None:
+                # Cause of the final FAIL of each SN, most frequent first.
+                final_fails = self.final_failures()
+                causes = [failures.get(r.filename) or FailureCause(r.filename, FAILURE_UNCLASSIFIED) for r in final_fails]
+                f.write("\n")
+                f.write("Failure Pareto (final FAIL per SN)\n")
+                if not causes:
+                    f.write("No FAIL records found.\n")
+                cumulative = 0
+                for category, count in failure_pareto(causes):
+                    cumulative += count
+                    f.write(
+                        f"Cause: {category}, Count: {count}, Rate: {_ratio_text_2(count, len(causes))}, "
+                        f"Cumulative: {_ratio_text_2(cumulative, len(causes))}\n"
+                    )
+                for c in causes:
+                    if c.line:
+                        f.write(f"  {c.filename}: {c.line}\n")
+
+            # Retest details: if a SN appears multiple times in raw logs, it indicates retest.
+            # "Retest count" excludes the last (final) test: retests = attempts - 1.
+            retest_items = self.retest_items()
+            total_retests = sum(len(items) - 1 for _, items in retest_items)
+
+            f.write("\n")
+            f.write("Retest Details (grouped by SN)\n")
+            f.write(f"Total Retests (exclude final): {total_retests}\n")
+            if not retest_items:
+                f.write("No retest records found.\n")
+            else:
+                for sn, items in retest_items:
+                    results_seq = " -> ".join(f"{i.result}@{i.test_date} {i.test_time}" for i in items)
+                    f.write(f"SN: {sn}, Attempts: {len(items)}, Retests: {len(items) - 1}, Results: {results_seq}\n")
+
+
+# Report scopes (log folders + time window) whose aggregates stay cached in the GUI.
+REPORT_CACHE_ENTRIES = 8
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _digest_lines(records: List[LogRecord]) -> bytes:
+    # One line per log; a FAIL log also carries its mtime.
+    return "".join(
+        [f"{r.filename}\0{_mtime_ns(r.path)}\n" if r.result == "FAIL" else r.filename + "\n" for r in records]
+    ).encode()
+
+
+def _records_digests(records: List[LogRecord], prefix: int = 0) -> Tuple[str, str]:
+    # Digest of the whole list and of its first `prefix` logs. The hash is streamed,
+    # so the full digest does not depend on where the list was split.
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_digest_lines(records[:prefix]))
+    head = h.hexdigest()
+    h.update(_digest_lines(records[prefix:]))
+    return h.hexdigest(), head
+
+
+def records_fingerprint(records: List[LogRecord]) -> Tuple[int, str]:
+    """Snapshot key of a time-ordered record list: count + digest of every log name.
+
+    A log renamed or replaced anywhere in the list changes the key, not only a change
+    at either end. The counters come from the file names alone; only FAIL logs are
+    read (failure causes), so their mtime is part of the digest too and a rewritten
+    FAIL log is classified again. Costs one stat per FAIL log.
+    """
+    return len(records), _records_digests(records)[0]
+
+
+@dataclass
+class _ReportCacheEntry:
+    fingerprint: Tuple[int, str]
+    acc: ReportAccumulator
+    failures: Dict[str, FailureCause]  # filename -> cause, for every final FAIL classified so far
+
+
+class ReportCache:
+    """LRU of report aggregates (counters, retest chains, failure causes) per scope.
+
+    An entry is valid for the record list it was built from, identified by
+    `records_fingerprint`. Re-running a report on an unchanged list reuses it as is.
+    When logs were only appended (the old list is a prefix of the new one) just the
+    new records are added and only new final FAILs are classified; anything else
+    (deleted logs, older logs copied in later) rebuilds the entry.
+    """
+
+    def __init__(self, max_entries: int = REPORT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _ReportCacheEntry]" = OrderedDict()
+        # scope -> (records, fingerprint) computed by take(), so put() need not hash again.
+        self._taken: Dict[tuple, Tuple[List[LogRecord], Tuple[int, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def take(
+        self, scope: tuple, records: List[LogRecord]
+    ) -> Tuple[ReportAccumulator, Dict[str, FailureCause], List[LogRecord]]:
+        """Remove the scope's entry; returns (accumulator, causes, records still to add).
+
+        The entry is taken out while it is being updated so that an interrupted update
+        never leaves a half-extended accumulator behind; `put()` stores it again.
+        """
+        entry = self._entries.pop(scope, None)
+        if entry is not None:
+            count, digest = entry.fingerprint
+            full, head = _records_digests(records, count)
+            self._taken[scope] = (records, (len(records), full))
+            if (len(records), full) == entry.fingerprint:
+                return entry.acc, entry.failures, []
+            if 0 < count < len(records) and head == digest:
+                return entry.acc, entry.failures, records[count:]
+        return ReportAccumulator(), {}, records
+
+    def put(
+        self,
+        scope: tuple,
+        records: List[LogRecord],
+        acc: ReportAccumulator,
+        failures: Dict[str, FailureCause],
+    ) -> None:
+        self._entries.pop(scope, None)
+        taken = self._taken.pop(scope, None)
+        fingerprint = taken[1] if taken is not None and taken[0] is records else records_fingerprint(records)
+        self._entries[scope] = _ReportCacheEntry(fingerprint, acc, failures)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._taken.clear()
+
+
+def classify_new_failures(acc: ReportAccumulator, failures: Dict[str, FailureCause]) -> Dict[str, FailureCause]:
+    """Classify the final FAILs of `acc` that are not in `failures` yet; updates and returns it."""
+    todo = [r for r in acc.final_failures() if r.filename not in failures]
+    if todo:
+        failures.update(classify_failures(todo))
+    return failures
+
+
+# --------------------------------------------------------------------------------------
+# Multi-station merge
+# --------------------------------------------------------------------------------------
+
+
+def _normalize_station_label(text: str) -> str:
+    v = text.strip().upper().replace("_", "-")
+    if "STA-A" in v or "STATION-A" in v or v.endswith("STAA"):
+        return "STA-A"
+    if "STA-B" in v or "STATION-B" in v or v.endswith("STAB"):
+        return "STA-B"
+    if "SOLO" in v:
+        return "SOLO"
+    return text.strip() or "UNKNOWN"
+
+
+def _is_labelled_spec(spec: str) -> bool:
+    return "=" in spec and not os.path.isdir(spec)
+
+
+def parse_log_root_spec(spec: str) -> Tuple[str, str]:
+    """"STA-A=/mnt/sta_a/Documents" -> ("STA-A", path); a bare path names the station after its folder."""
+    if _is_labelled_spec(spec):
+        station, path = spec.split("=", 1)
+        return _normalize_station_label(station), path.strip()
+    path = spec.strip()
+    return _normalize_station_label(os.path.basename(os.path.normpath(path))), path
+
+
+def _distinct_root_labels(paths: List[str]) -> List[str]:
+    # Name bare roots after the first path component that differs between them:
+    # /mnt/sta_a/Documents + /mnt/sta_b/Documents -> STA-A, STA-B (not "Documents" twice).
+    parts = [os.path.normpath(os.path.abspath(p)).split(os.sep) for p in paths]
+    if len(parts) > 1:
+        for i in range(max(map(len, parts))):
+            column = [p[i] if i < len(p) else "" for p in parts]
+            if len(set(column)) > 1:
+                return [_normalize_station_label(c or p[-1]) for c, p in zip(column, parts)]
+    return [_normalize_station_label(p[-1]) for p in parts]
+
+
+def parse_log_root_specs(specs: List[str]) -> List[Tuple[str, str]]:
+    """(station, path) per root spec; raises ValueError when two roots get the same station."""
+    roots = [parse_log_root_spec(s) for s in specs]
+    bare = [i for i, s in enumerate(specs) if not _is_labelled_spec(s)]
+    for i, label in zip(bare, _distinct_root_labels([roots[i][1] for i in bare])):
+        roots[i] = (label, roots[i][1])
+
+    seen: Dict[str, str] = {}
+    for station, path in roots:
+        if station in seen:
+            raise ValueError(
+                f"Log folders {seen[station]} and {path} are both station {station}. "
+                "Name them as STATION=DIR (e.g. STA-A=/mnt/sta_a/Documents)."
+            )
+        seen[station] = path
+    return roots
+
+
+def resolve_log_roots(log_dirs: List[str]) -> List[Tuple[str, str]]:
+    """(station, root) per log folder; a single bare folder stays station-less."""
+    if len(log_dirs) == 1 and not _is_labelled_spec(log_dirs[0]):
+        return [("", log_dirs[0].strip())]
+    return parse_log_root_specs(log_dirs)
+
+
+def split_log_dirs(text: str) -> List[str]:
+    return [p.strip() for p in text.split(";") if p.strip()]
+
+
+def iter_log_root_sorted(root: str, station: str = "") -> Iterator[LogRecord]:
+    """Records of a station root (its own logs + dated sub folders) in time order."""
+    folders = [root]
+    try:
+        folders += sorted(e.path for e in os.scandir(root) if e.is_dir())
+    except OSError:
+        return iter(())
+    # Each folder is already time-ordered; k-way merge them.
+    return heapq.merge(*(iter_log_records_sorted(d, station) for d in folders), key=lambda r: r.dt)
+
+
+def parse_log_roots_merged(roots: List[str], max_workers: int = 8) -> Iterator[LogRecord]:
+    """Parse many station roots concurrently; merge their records on timestamp.
+
+    Every record carries its source station. The result is time-ordered, so it can be
+    fed to `_dedupe_keep_latest_by_sn` / `ReportAccumulator` for a line-wide SN dedupe.
+    """
+    specs = parse_log_root_specs(roots)
+    if not specs:
+        return iter(())
+
+    def _load(spec: Tuple[str, str]) -> List[LogRecord]:
+        station, path = spec
+        return list(iter_log_root_sorted(path, station))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs)))) as pool:
+        per_root = list(pool.map(_load, specs))
+    return heapq.merge(*per_root, key=lambda r: r.dt)
+
+
+# --------------------------------------------------------------------------------------
+# Progressive parsing (GUI background worker)
+# --------------------------------------------------------------------------------------
+
+# Files scanned between two progress updates of a background parse.
+PARSE_PROGRESS_FILES = 5000
+
+
+@dataclass
+class ParseProgress:
+    files_scanned: int = 0
+    records: int = 0
+    # Final-result counts so far (latest test per SN among the records seen yet).
+    pass_count: int = 0
+    fail_count: int = 0
+    elapsed_s: float = 0.0
+    folder: str = ""
+
+    @property
+    def rate(self) -> float:
+        return self.files_scanned / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def _parse_folders(log_dirs: List[str]) -> List[Tuple[str, str]]:
+    # Every root plus its dated sub folders, as iter_log_root_sorted / parse_log_roots_merged.
+    folders: List[Tuple[str, str]] = []
+    for station, root in resolve_log_roots(log_dirs):
+        folders.append((station, root))
+        try:
+            folders += [(station, path) for path in sorted(e.path for e in os.scandir(root) if e.is_dir())]
+        except OSError:
+            pass
+    return folders
+
+
+def parse_log_dirs_progressive(
+    log_dirs: List[str],
+    chunk_files: int = PARSE_PROGRESS_FILES,
+) -> Generator[ParseProgress, None, List[LogRecord]]:
+    """Parse like the synchronous path, yielding a ParseProgress every `chunk_files` files.
+
+    The time-ordered records are the generator's return value; stop iterating to cancel.
+    """
+    t0 = time.perf_counter()
+    progress = ParseProgress()
+    records: List[LogRecord] = []
+    latest: Dict[str, LogRecord] = {}
+
+    for station, folder in _parse_folders(log_dirs):
+        progress.folder = folder
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                progress.files_scanned += 1
+                rec = _parse_log_filename(entry.name, folder, station)
+                if rec is not None:
+                    records.append(rec)
+                    prev = latest.get(rec.mac)
+                    if prev is None or rec.dt > prev.dt:
+                        if prev is not None:
+                            progress.pass_count -= prev.result == "PASS"
+                            progress.fail_count -= prev.result == "FAIL"
+                        latest[rec.mac] = rec
+                        progress.pass_count += rec.result == "PASS"
+                        progress.fail_count += rec.result == "FAIL"
+                if progress.files_scanned % chunk_files == 0:
+                    progress.records = len(records)
+                    progress.elapsed_s = time.perf_counter() - t0
+                    # A copy: the consumer may read it on another thread.
+                    yield replace(progress)
+
+    records.sort(key=lambda r: r.dt)
+    progress.records = len(records)
+    progress.elapsed_s = time.perf_counter() - t0
+    yield replace(progress)
+    return records
+
+
+# --------------------------------------------------------------------------------------
+# Time-window queries (sorted epoch index)
+# --------------------------------------------------------------------------------------
+
+_UNIX_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# Quick windows offered by the GUI; shifts follow SHIFT_DAY_START_HOUR / SHIFT_NIGHT_START_HOUR.
+WINDOW_PRESETS = [
+    "Last hour",
+    "Last 12 hours",
+    "Today",
+    "Yesterday",
+    "Current shift",
+    "Previous shift",
+]
+
+_RELATIVE_BOUND_RE = re.compile(r"^-(\d+)([mhd])$")
+_RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def _epoch_s(dt: datetime) -> int:
+    # Naive local timestamps; only the ordering matters, so no timezone lookup.
+    return (dt.toordinal() - _UNIX_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+class TimeIndex:
+    """Sorted epoch-second index over time-ordered records.
+
+    `records` is shared with the caller (not copied) and must stay time-ordered; add new
+    records through `insert()` so both lists stay aligned. A window query is two
+    bisects plus a slice: O(log n + k).
+    """
+
+    def __init__(self, records: List[LogRecord]):
+        self.records = records
+        self.epochs: List[int] = [_epoch_s(r.dt) for r in records]
+
+    def insert(self, r: LogRecord) -> None:
+        e = _epoch_s(r.dt)
+        i = bisect.bisect_right(self.epochs, e)  # after equal timestamps; usually an append
+        self.epochs.insert(i, e)
+        self.records.insert(i, r)
+
+    def span(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        """Index range of records with start <= dt < end (None = unbounded)."""
+        lo = 0 if start is None else bisect.bisect_left(self.epochs, _epoch_s(start))
+        hi = len(self.epochs) if end is None else bisect.bisect_left(self.epochs, _epoch_s(end), lo)
+        return lo, hi
+
+    def window(self, start: Optional[datetime], end: Optional[datetime]) -> List[LogRecord]:
+        lo, hi = self.span(start, end)
+        return self.records[lo:hi]
+
+
+def in_window(r: LogRecord, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    """start <= r.dt < end, as `TimeIndex.window` (None = unbounded)."""
+    return (start is None or r.dt >= start) and (end is None or r.dt < end)
+
+
+def parse_time_bound(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """"2026-01-05 08:00[:ss]", "2026-01-05", "08:00" (today) or "-90m"/"-1h"/"-2d" (ago).
+
+    Empty text means unbounded (None). Raises ValueError for anything else.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    now = now or datetime.now()
+
+    m = _RELATIVE_BOUND_RE.match(text)
+    if m:
+        return now - timedelta(**{_RELATIVE_UNITS[m.group(2)]: int(m.group(1))})
+
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            t = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return now.replace(hour=t.hour, minute=t.minute, second=t.second, microsecond=0)
+
+    raise ValueError(f"Invalid time: {text!r} (use YYYY-MM-DD [HH:MM[:SS]], HH:MM or -30m/-1h/-2d)")
+
+
+def window_preset(name: str, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    now = (now or datetime.now()).replace(microsecond=0)
+    today = now.replace(hour=0, minute=0, second=0)
+    if name == "Last hour":
+        return now - timedelta(hours=1), now + timedelta(seconds=1)
+    if name == "Last 12 hours":
+        return now - timedelta(hours=12), now + timedelta(seconds=1)
+    if name == "Today":
+        return today, today + timedelta(days=1)
+    if name == "Yesterday":
+        return today - timedelta(days=1), today
+
+    day_start = today + timedelta(hours=SHIFT_DAY_START_HOUR)
+    night_start = today + timedelta(hours=SHIFT_NIGHT_START_HOUR)
+    if now < day_start:
+        current = (night_start - timedelta(days=1), day_start)
+    elif now < night_start:
+        current = (day_start, night_start)
+    else:
+        current = (night_start, day_start + timedelta(days=1))
+    if name == "Current shift":
+        return current
+    if name == "Previous shift":
+        return window_preset("Current shift", current[0] - timedelta(seconds=1))
+    raise ValueError(f"Unknown window preset: {name}")
+
+
+def format_window(start: Optional[datetime], end: Optional[datetime]) -> str:
+    def _fmt(dt: Optional[datetime], empty: str) -> str:
+        return dt.strftime("%Y-%m-%d %H:%M:%S") if dt else empty
+
+    return f"{_fmt(start, 'begin')} ~ {_fmt(end, 'end')}"
+
+
+# --------------------------------------------------------------------------------------
+# Columnar export (Parquet dataset, one partition per test date)
+# --------------------------------------------------------------------------------------
+
+# Rows per Parquet row group; also the batch size records are converted in.
+PARQUET_ROW_GROUP_ROWS = 50000
+# Dataset folder the GUI creates under the report output folder.
+PARQUET_DATASET_DIRNAME = "wifi_stress_parquet"
+# Logs read between two progress updates / cancel checks of the export.
+PARQUET_PROGRESS_LOGS = 500
+
+
+def _import_pyarrow():
+    # pyarrow is optional (export only) and slow to import, so load it on first use.
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except ModuleNotFoundError:
+        raise RuntimeError(
+            "pyarrow is not installed in this Python environment.\n"
+            "Install it first: python3 -m pip install pyarrow"
+        ) from None
+    return pa, pq
+
+
+def parquet_schema():
+    pa, _ = _import_pyarrow()
+    category = pa.dictionary(pa.int16(), pa.string())
+    return pa.schema(
+        [
+            ("ts", pa.timestamp("ms")),  # Parquet has no second unit
+            ("sn", pa.string()),
+            ("mac", pa.string()),
+            ("result", category),
+            ("station", category),
+            ("port", category),
+            ("bt_result", category),
+            ("throughput_5g", pa.float32()),
+            ("throughput_24g", pa.float32()),
+            ("rssi_5g", pa.int16()),
+            ("rssi_24g", pa.int16()),
+            ("elapsed_s", pa.int32()),
+            ("filename", pa.string()),
+        ]
+    )
+
+
+def _parquet_batch(records: List[LogRecord], metadata: Dict[str, LogMetadata], metrics: Dict[str, LogContentMetrics]):
+    pa, _ = _import_pyarrow()
+    schema = parquet_schema()
+    meta = [metadata.get(r.filename) for r in records]
+    found = [metrics.get(r.filename) for r in records]
+
+    def _metric(attr: str) -> list:
+        return [getattr(m, attr) if m else None for m in found]
+
+    columns = {
+        "ts": [r.dt for r in records],
+        "sn": [r.mac for r in records],
+        # LogRecord.serial holds the MAC field of the filename (MAC1_MAC2).
+        "mac": [r.serial for r in records],
+        "result": [r.result for r in records],
+        "station": [r.station or (h.station if h and h.station else (m.station if m else None)) or None for r, h, m in zip(records, meta, found)],
+        "port": [(h.port if h else "") or (m.port if m else "") or None for h, m in zip(meta, found)],
+        "bt_result": [(h.bt_result or "SKIP") if h else None for h in meta],
+        "throughput_5g": _metric("throughput_5g"),
+        "throughput_24g": _metric("throughput_24g"),
+        "rssi_5g": _metric("rssi_5g"),
+        "rssi_24g": _metric("rssi_24g"),
+        "elapsed_s": _metric("elapsed_s"),
+        "filename": [r.filename for r in records],
+    }
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def export_parquet(
+    records: Iterable[LogRecord],
+    out_dir: str,
+    with_contents: bool = False,
+    metadata: Optional[Dict[str, LogMetadata]] = None,
+    metrics: Optional[Dict[str, LogContentMetrics]] = None,
+) -> Tuple[int, int]:
+    """Synchronous `export_parquet_progressive` (CLI); returns (rows written, files written)."""
+    gen = export_parquet_progressive(records, out_dir, with_contents, metadata, metrics)
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+def export_parquet_progressive(
+    records: Iterable[LogRecord],
+    out_dir: str,
+    with_contents: bool = False,
+    metadata: Optional[Dict[str, LogMetadata]] = None,
+    metrics: Optional[Dict[str, LogContentMetrics]] = None,
+    chunk_logs: int = PARQUET_PROGRESS_LOGS,
+) -> Generator[str, None, Tuple[int, int]]:
+    """Append time-ordered raw records to a Parquet dataset under `out_dir`.
+
+    Layout: out_dir/test_date=YYYY-MM-DD/part-<export time>.parquet (hive partitioning,
+    readable with pyarrow.dataset / pandas / Spark / DuckDB). A day that was exported
+    before only gets a new part with the logs it does not contain yet, so re-running the
+    export after a shift appends instead of duplicating. `metadata`/`metrics` are caches
+    and get filled for the new records. A status line is yielded every `chunk_logs` logs
+    read and every row group written; the return value is (rows written, files written).
+    Stop iterating to cancel: days already written stay, the day in progress is dropped.
+
+    Raises RuntimeError when pyarrow is missing or a part cannot be read/written
+    (e.g. a corrupt or foreign file in the dataset folder), OSError on file errors.
+    """
+    pa, pq = _import_pyarrow()
+    schema = parquet_schema()
+    metadata = {} if metadata is None else metadata
+    metrics = {} if metrics is None else metrics
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    by_day: Dict[str, List[LogRecord]] = {}
+    for r in records:
+        by_day.setdefault(r.test_date, []).append(r)
+
+    rows_written = files_written = 0
+    for day, day_records in sorted(by_day.items()):
+        day_dir = os.path.join(out_dir, f"test_date={day}")
+        exported = set()
+        if os.path.isdir(day_dir):
+            for name in sorted(os.listdir(day_dir)):
+                if name.endswith(".parquet"):
+                    # Only the filename column is read from the earlier parts.
+                    path = os.path.join(day_dir, name)
+                    try:
+                        part = pq.read_table(path, columns=["filename"])
+                    except pa.ArrowException as e:
+                        raise RuntimeError(f"Cannot read dataset part {path}:\n{e}") from None
+                    exported.update(part.column("filename").to_pylist())
+        new = [r for r in day_records if r.filename not in exported]
+        if not new:
+            continue
+
+        missing = [r for r in new if r.filename not in metadata]
+        for i in range(0, len(missing), chunk_logs):
+            yield f"{day}: reading log headers {i:,} / {len(missing):,}"
+            metadata.update(parse_log_metadata(missing[i : i + chunk_logs]))
+        if with_contents:
+            missing = [r for r in new if r.filename not in metrics]
+            for i in range(0, len(missing), chunk_logs):
+                yield f"{day}: reading log contents {i:,} / {len(missing):,}"
+                metrics.update(parse_log_contents(missing[i : i + chunk_logs]))
+
+        os.makedirs(day_dir, exist_ok=True)
+        part_path = os.path.join(day_dir, f"part-{stamp}.parquet")
+        tmp_path = part_path + ".tmp"
+        written = False
+        try:
+            with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+                for i in range(0, len(new), PARQUET_ROW_GROUP_ROWS):
+                    yield f"{day}: writing {i:,} / {len(new):,} tests"
+                    batch = new[i : i + PARQUET_ROW_GROUP_ROWS]
+                    writer.write_table(_parquet_batch(batch, metadata, metrics if with_contents else {}))
+            # Readers never see a half-written part.
+            os.replace(tmp_path, part_path)
+            written = True
+        except pa.ArrowException as e:
+            raise RuntimeError(f"Cannot write dataset part {part_path}:\n{e}") from None
+        finally:
+            if not written and os.path.exists(tmp_path):
+                os.remove(tmp_path)  # failed or cancelled
+        rows_written += len(new)
+        files_written += 1
+    return rows_written, files_written
+
+
+# --------------------------------------------------------------------------------------
+# Large log viewer (memory-mapped)
+# --------------------------------------------------------------------------------------
+
+# Jump targets of the log viewer (wifi_test.sh / save_log lines), in file order.
+LOG_VIEWER_MARKERS = [
+    "Starting 5G Band Test",
+    "Starting 2.4G Band Test",
+    "OVERALL RESULT",
+    "Total elapsed time",
+    "Test Results Summary",
+    "FAIL",
+]
+_LOG_VIEWER_MARKER_RE = re.compile(b"|".join(re.escape(m.encode()) for m in LOG_VIEWER_MARKERS))
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
+
+# Bytes indexed between two progress updates of the viewer.
+LOG_VIEWER_INDEX_CHUNK = 4 * 1024 * 1024
+
+
+class MappedLog:
+    """Read-only memory map of one log with a line-offset index and a marker index.
+
+    Nothing is read up front: `build_index()` scans the map chunk by chunk (meant for a
+    worker thread) and `line()` decodes a single line on demand, so a viewer only ever
+    touches the pages of the lines it shows. Lines become available as they are indexed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file.
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.line_starts = array("q", [0] if self.size else [])
+        self.markers: Dict[str, List[int]] = {m: [] for m in LOG_VIEWER_MARKERS}
+        self.indexed_bytes = 0
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "MappedLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def line_count(self) -> int:
+        """Number of complete lines indexed so far."""
+        if self.indexed_bytes >= self.size:
+            return len(self.line_starts)
+        return len(self.line_starts) - 1  # the last start belongs to the next chunk
+
+    def build_index(self, chunk_bytes: int = LOG_VIEWER_INDEX_CHUNK) -> Generator[int, None, int]:
+        """Index line starts and marker lines; yields the line count after every chunk."""
+        mm, size, starts = self._mm, self.size, self.line_starts
+        pos = self.indexed_bytes
+        while pos < size:
+            end = min(size, pos + chunk_bytes)
+            if end < size:
+                # Cut chunks at a line end so that no line or marker spans two chunks.
+                nl = mm.find(b"\n", end - 1)
+                end = size if nl < 0 else nl + 1
+
+            chunk = mm[pos:end]
+            if np is not None:
+                nl_offsets = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 0x0A)
+                nl_offsets += pos + 1
+                starts.extend(nl_offsets[nl_offsets < size].tolist())
+            else:
+                i = chunk.find(b"\n")
+                while i >= 0:
+                    if pos + i + 1 < size:
+                        starts.append(pos + i + 1)
+                    i = chunk.find(b"\n", i + 1)
+
+            for m in _LOG_VIEWER_MARKER_RE.finditer(chunk):
+                line_no = bisect.bisect_right(starts, pos + m.start()) - 1
+                lines = self.markers[m.group().decode()]
+                if not lines or lines[-1] != line_no:
+                    lines.append(line_no)
+
+            self.indexed_bytes = pos = end
+            yield self.line_count
+        return self.line_count
+
+    def line(self, i: int) -> str:
+        start = self.line_starts[i]
+        end = self.line_starts[i + 1] if i + 1 < len(self.line_starts) else self.size
+        text = self._mm[start:end].decode("utf-8", "replace").rstrip("\r\n")
+        return _ANSI_ESCAPE_RE.sub("", text)
+
+    def next_marker(self, marker: str, after_line: int) -> Optional[int]:
+        lines = self.markers[marker]
+        i = bisect.bisect_right(lines, after_line)
+        return lines[i] if i < len(lines) else None
+
+    def prev_marker(self, marker: str, before_line: int) -> Optional[int]:
+        lines = self.markers[marker]
+        i = bisect.bisect_left(lines, before_line)
+        return lines[i - 1] if i > 0 else None
+
+
+def report_paths(out_dir: str, production_name: str) -> Tuple[str, str]:
+    safe_name = _safe_report_name(production_name)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = os.path.join(out_dir, f"wifi_stress_report_{safe_name}_{ts}.csv")
+    txt_path = os.path.join(out_dir, f"wifi_stress_yield_{safe_name}_{ts}.txt")
+    return csv_path, txt_path
+
+
 def _ratio_text(count: int, total: int) -> str:
     if total <= 0:
         return "0.0%"
     return f"{(count / total) * 100.0:.1f}%"
 
 
+# Record table: columns, LogRecord attribute each column sorts on, rows per lazy fetch.
+RECORD_TABLE_COLUMNS = ["Date", "Time", "SN", "MAC", "Result", "Station"]
+RECORD_TABLE_SORT_KEYS = ["dt", "dt", "mac", "serial", "result", "station"]
+RECORD_TABLE_FETCH_ROWS = 500
+
+
+# Tests folded into the report between two progress updates / cancel checks.
+REPORT_PROGRESS_RECORDS = 50000
+# Log bodies read between two progress updates of the trend job.
+TREND_PROGRESS_LOGS = 500
+
+
 def _default_browse_dir() -> str:
     return DEFAULT_DIR
 
 def run_gui() -> int:
     try:
-        from PyQt5.QtCore import Qt
-        from PyQt5.QtGui import QFont
+        from PyQt5.QtCore import (
+            QAbstractListModel,
+            QAbstractTableModel,
+            QModelIndex,
+            Qt,
+            QThread,
+            QTimer,
+            QUrl,
+            pyqtSignal,
+        )
+        from PyQt5.QtGui import QColor, QDesktopServices, QFont
         from PyQt5.QtWidgets import (
+            QAbstractItemView,
             QApplication,
+            QCheckBox,
+            QComboBox,
+            QDialog,
             QGridLayout,
             QGroupBox,
             QHBoxLayout,
+            QHeaderView,
             QLabel,
             QLineEdit,
             QMainWindow,
             QMessageBox,
+            QPlainTextEdit,
             QPushButton,
             QFileDialog,
+            QTableView,
             QVBoxLayout,
             QWidget,
         )
@@ -197,13 +2176,434 @@ def run_gui() -> int:
     except ModuleNotFoundError:
         QSvgWidget = None  # type: ignore
 
+    class BackgroundJob(QThread):
+        """Runs a job generator off the UI thread.
+
+        Every value the generator yields is emitted as `progress`; its return value is
+        emitted as `done`. Cancel with requestInterruption(): the job stops at its next
+        yield and `cancelled` is emitted instead.
+        """
+
+        progress = pyqtSignal(object)
+        done = pyqtSignal(object)
+        cancelled = pyqtSignal()
+        failed = pyqtSignal(str)
+
+        def __init__(self, job_fn, parent=None):
+            super().__init__(parent)
+            self._job_fn = job_fn
+
+        def run(self):
+            gen = self._job_fn()
+            try:
+                while True:
+                    update = next(gen)
+                    if self.isInterruptionRequested():
+                        gen.close()
+                        self.cancelled.emit()
+                        return
+                    self.progress.emit(update)
+            except StopIteration as stop:
+                self.done.emit(stop.value)
+            except Exception as e:  # surfaced in a message box, not lost in the thread
+                self.failed.emit(str(e))
+
+    class LogContentWorker(QThread):
+        """Reads the bodies of the logs Watch picks up, off the UI thread and in order.
+
+        `submit()` queues a batch of records; each batch is emitted as `parsed` with
+        (records, {filename: LogContentMetrics}). `stop()` ends the thread.
+        """
+
+        parsed = pyqtSignal(object)
+
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self._queue: "queue.Queue[Optional[List[LogRecord]]]" = queue.Queue()
+
+        def submit(self, records: List[LogRecord]) -> None:
+            self._queue.put(records)
+
+        def stop(self) -> None:
+            self._queue.put(None)
+            self.wait()
+
+        def run(self):
+            while True:
+                records = self._queue.get()
+                if records is None:
+                    return
+                self.parsed.emit((records, parse_log_contents(records)))
+
+    class RecordTableModel(QAbstractTableModel):
+        """Read-only view over a record list owned by the window.
+
+        Filtering and sorting only rebuild `_rows` (indices into the record list); rows
+        are handed to the view in batches through canFetchMore/fetchMore. Logs that Watch
+        picks up are added by `add_records()` without re-filtering or re-sorting.
+        """
+
+        def __init__(self, station_of, parent=None):
+            super().__init__(parent)
+            self._records: List[LogRecord] = []
+            self._rows: List[int] = []
+            self._loaded = 0
+            self._station_of = station_of
+            self._filter: Tuple[str, str, str, str, str] = ("", "", "", "", "")
+            self._sort: Optional[Tuple[int, int]] = None
+            self._latest: Optional[Dict[str, int]] = None  # SN -> record index, deduped lists only
+            self._replaced = 0
+
+        def set_records(self, records: List[LogRecord]) -> None:
+            # A copy: add_records() appends to it, and the caller keeps changing its own list.
+            self._records = list(records)
+            self._latest = None
+            self._replaced = 0
+            self.refresh()
+
+        def add_records(self, records: List[LogRecord], dedupe: bool) -> None:
+            """Add new logs: a binary search per row kept by the filter, no full refresh.
+
+            With `dedupe` the list holds the final test of each SN, so a later test of a
+            listed SN replaces its row (same rule as `_dedupe_keep_latest_by_sn`).
+            """
+            if dedupe and self._latest is None:
+                self._latest = {r.mac: i for i, r in enumerate(self._records)}
+            for r in records:
+                if dedupe:
+                    prev = self._latest.get(r.mac)
+                    if prev is not None:
+                        if not r.dt > self._records[prev].dt:
+                            continue
+                        self._remove_row_of(prev)
+                        self._replaced += 1
+                    self._latest[r.mac] = len(self._records)
+                self._records.append(r)
+                if self._matches(r):
+                    self._insert_row_of(len(self._records) - 1)
+
+        def _remove_row_of(self, i: int) -> None:
+            pos = self._find_row(i)
+            if pos is None:
+                return  # filtered out
+            if pos < self._loaded:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self._rows[pos]
+                self._loaded -= 1
+                self.endRemoveRows()
+            else:
+                del self._rows[pos]
+
+        def _insert_row_of(self, i: int) -> None:
+            pos = self._row_position(i)
+            if pos < self._loaded or self._loaded == len(self._rows):
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self._rows.insert(pos, i)
+                self._loaded += 1
+                self.endInsertRows()
+            else:
+                self._rows.insert(pos, i)  # not fetched by the view yet
+
+        def _row_position(self, i: int) -> int:
+            if self._sort is None:
+                return len(self._rows)
+            column, order = self._sort
+            get = self._sort_getter(column)
+            key = get(self._records[i])
+            records, rows = self._records, self._rows
+            descending = order == Qt.DescendingOrder
+            # Binary search; after equal keys, where a stable sort puts the newest record.
+            lo, hi = 0, len(rows)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                other = get(records[rows[mid]])
+                if (key > other) if descending else (key < other):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return lo
+
+        def _find_row(self, i: int) -> Optional[int]:
+            """Position of record `i` in `_rows`, or None if the filter dropped it.
+
+            `_rows` is ordered by (sort key, record index): the filter keeps indices in
+            order, the sort is stable and `_row_position` puts a new record after equal
+            keys, so a binary search on that pair finds it.
+            """
+            rows = self._rows
+            if self._sort is None:
+                pos = bisect.bisect_left(rows, i)
+            else:
+                column, order = self._sort
+                get = self._sort_getter(column)
+                key = get(self._records[i])
+                records = self._records
+                descending = order == Qt.DescendingOrder
+                lo, hi = 0, len(rows)
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    j = rows[mid]
+                    other = get(records[j])
+                    if other == key:
+                        before = j < i
+                    else:
+                        before = (other > key) if descending else (other < key)
+                    if before:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                pos = lo
+            return pos if pos < len(rows) and rows[pos] == i else None
+
+        def _matches(self, r: LogRecord) -> bool:
+            date_from, date_to, sn, result, station = self._filter
+            return (
+                (not date_from or r.test_date >= date_from)
+                and (not date_to or r.test_date <= date_to)
+                and (not sn or sn in r.mac.upper())
+                and (not result or r.result == result)
+                and (not station or self._station_of(r) == station)
+            )
+
+        def set_filter(self, date_from: str, date_to: str, sn: str, result: str, station: str) -> None:
+            self._filter = (date_from, date_to, sn.strip().upper(), result, station)
+            self.refresh()
+
+        def refresh(self) -> None:
+            """Re-apply filter + sort to the current record list (e.g. after new logs land)."""
+            self.beginResetModel()
+            self._rows = self._filter_rows()
+            if self._sort is not None:
+                self._sort_rows(*self._sort)
+            self._loaded = min(len(self._rows), RECORD_TABLE_FETCH_ROWS)
+            self.endResetModel()
+
+        def _filter_rows(self) -> List[int]:
+            date_from, date_to, sn, result, station = self._filter
+            records = self._records
+            rows = range(len(records))
+            # test_date is "YYYY-MM-DD", so the range check is a plain string compare.
+            if date_from:
+                rows = [i for i in rows if records[i].test_date >= date_from]
+            if date_to:
+                rows = [i for i in rows if records[i].test_date <= date_to]
+            if sn:
+                rows = [i for i in rows if sn in records[i].mac.upper()]
+            if result:
+                rows = [i for i in rows if records[i].result == result]
+            if station:
+                rows = [i for i in rows if self._station_of(records[i]) == station]
+            return list(rows)
+
+        def _sort_getter(self, column: int):
+            key = RECORD_TABLE_SORT_KEYS[column]
+            return self._station_of if key == "station" else operator.attrgetter(key)
+
+        def _sort_rows(self, column: int, order: int) -> None:
+            get = self._sort_getter(column)
+            # One key per record via map(), then a C-level key lookup while sorting.
+            keys = list(map(get, self._records))
+            self._rows.sort(key=keys.__getitem__, reverse=order == Qt.DescendingOrder)
+
+        def record_at(self, row: int) -> LogRecord:
+            return self._records[self._rows[row]]
+
+        def matched_count(self) -> int:
+            return len(self._rows)
+
+        def record_count(self) -> int:
+            return len(self._records) - self._replaced
+
+        def rowCount(self, parent=QModelIndex()):
+            return 0 if parent.isValid() else self._loaded
+
+        def columnCount(self, parent=QModelIndex()):
+            return 0 if parent.isValid() else len(RECORD_TABLE_COLUMNS)
+
+        def canFetchMore(self, parent):
+            return not parent.isValid() and self._loaded < len(self._rows)
+
+        def fetchMore(self, parent):
+            if parent.isValid():
+                return
+            count = min(RECORD_TABLE_FETCH_ROWS, len(self._rows) - self._loaded)
+            if count <= 0:
+                return
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+
+        def data(self, index, role=Qt.DisplayRole):
+            if not index.isValid():
+                return None
+            r = self._records[self._rows[index.row()]]
+            column = index.column()
+            if role == Qt.DisplayRole:
+                if column == 0:
+                    return r.test_date
+                if column == 1:
+                    return r.test_time
+                if column == 2:
+                    return r.mac
+                if column == 3:
+                    return r.serial
+                if column == 4:
+                    return r.result
+                return self._station_of(r)
+            if role == Qt.ForegroundRole and column == 4:
+                return QColor("#27ae60") if r.result == "PASS" else QColor("#e74c3c")
+            if role == Qt.ToolTipRole:
+                return r.path
+            return None
+
+        def headerData(self, section, orientation, role=Qt.DisplayRole):
+            if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+                return RECORD_TABLE_COLUMNS[section]
+            return None
+
+        def sort(self, column, order=Qt.AscendingOrder):
+            self.layoutAboutToBeChanged.emit()
+            self._sort = (column, order)
+            self._sort_rows(column, order)
+            self.layoutChanged.emit()
+
+    class LogLineModel(QAbstractListModel):
+        """Lines of a MappedLog; the view only asks for the rows it shows."""
+
+        def __init__(self, log: MappedLog, parent=None):
+            super().__init__(parent)
+            self._log = log
+            self._rows = 0
+
+        def set_line_count(self, count: int) -> None:
+            if count > self._rows:
+                self.beginInsertRows(QModelIndex(), self._rows, count - 1)
+                self._rows = count
+                self.endInsertRows()
+
+        def rowCount(self, parent=QModelIndex()):
+            return 0 if parent.isValid() else self._rows
+
+        def data(self, index, role=Qt.DisplayRole):
+            if role == Qt.DisplayRole and index.isValid():
+                return f"{index.row() + 1:>7}  {self._log.line(index.row())}"
+            return None
+
+    class LogViewerDialog(QDialog):
+        """Built-in viewer for (large) logs: memory-mapped, indexed in the background."""
+
+        def __init__(self, path: str, parent=None):
+            super().__init__(parent)
+            self.setAttribute(Qt.WA_DeleteOnClose)
+            self.setWindowTitle(os.path.basename(path))
+            self.resize(900, 640)
+            self.log = MappedLog(path)
+            self.model = LogLineModel(self.log, self)
+
+            layout = QVBoxLayout(self)
+            self.info_label = QLabel("")
+            layout.addWidget(self.info_label)
+
+            nav = QHBoxLayout()
+            nav.addWidget(QLabel("Jump to:"))
+            self.marker_combo = QComboBox()
+            self.marker_combo.addItems(LOG_VIEWER_MARKERS)
+            nav.addWidget(self.marker_combo, 1)
+            prev_btn = QPushButton("Previous")
+            prev_btn.clicked.connect(lambda: self.on_jump(forward=False))
+            nav.addWidget(prev_btn)
+            next_btn = QPushButton("Next")
+            next_btn.clicked.connect(lambda: self.on_jump(forward=True))
+            nav.addWidget(next_btn)
+            open_btn = QPushButton("Open Externally")
+            open_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(path)))
+            nav.addWidget(open_btn)
+            layout.addLayout(nav)
+
+            # A table with fixed-height rows lays out in O(1); a QListView walks every row.
+            self.view = QTableView()
+            self.view.setFont(QFont("Courier New", 10))
+            self.view.setModel(self.model)
+            self.view.setShowGrid(False)
+            self.view.setWordWrap(False)
+            self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+            self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+            self.view.horizontalHeader().hide()
+            self.view.horizontalHeader().setStretchLastSection(True)
+            self.view.verticalHeader().hide()
+            self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self.view.verticalHeader().setDefaultSectionSize(self.view.fontMetrics().height() + 2)
+            layout.addWidget(self.view, 1)
+
+            self._job = BackgroundJob(self.log.build_index, self)
+            self._job.progress.connect(self._on_indexed)
+            self._job.done.connect(self._on_indexed)
+            self._job.finished.connect(self._update_marker_counts)
+            self._on_indexed(0)
+            self._job.start()
+
+        def _on_indexed(self, _line_count):
+            self.model.set_line_count(self.log.line_count)
+            state = "" if self.log.indexed_bytes >= self.log.size else " (indexing...)"
+            self.info_label.setText(
+                f"{self.log.path}  |  {self.log.size / 1048576:,.1f} MB, {self.log.line_count:,} lines{state}"
+            )
+
+        def _update_marker_counts(self):
+            for i, marker in enumerate(LOG_VIEWER_MARKERS):
+                self.marker_combo.setItemText(i, f"{marker} ({len(self.log.markers[marker])})")
+
+        def on_jump(self, forward: bool):
+            marker = LOG_VIEWER_MARKERS[self.marker_combo.currentIndex()]
+            current = self.view.currentIndex().row()
+            if forward:
+                line = self.log.next_marker(marker, current)
+            else:
+                line = self.log.prev_marker(marker, current if current >= 0 else self.log.line_count)
+            if line is None or line >= self.model.rowCount():
+                self.info_label.setText(f"No {'next' if forward else 'previous'} \"{marker}\".")
+                return
+            index = self.model.index(line)
+            self.view.setCurrentIndex(index)
+            self.view.scrollTo(index, QAbstractItemView.PositionAtTop)
+
+        def done(self, result):
+            # Stop indexing before the map goes away (close, Esc and reject all end here).
+            self._job.requestInterruption()
+            self._job.wait()
+            self.view.setModel(None)
+            self.log.close()
+            super().done(result)
+
     class WiFiStressLogAnalyzer(QMainWindow):
         def __init__(self):
             super().__init__()
             self.records: List[LogRecord] = []
             self.raw_records: List[LogRecord] = []
+            self._time_index = TimeIndex(self.raw_records)
+            # (start, end) of the active time window; (None, None) = everything.
+            self._window: Tuple[Optional[datetime], Optional[datetime]] = (None, None)
+            self.metrics: Dict[str, LogContentMetrics] = {}
+            self.metadata: Dict[str, LogMetadata] = {}
+            # (station, watcher) per watched log root; station is "" for a single folder.
+            self._watchers: List[Tuple[str, LogDirectoryWatcher]] = []
+            self._live: Optional[IncrementalYield] = None
+            self.table_model = RecordTableModel(self._station_of)
+            self._job: Optional[BackgroundJob] = None
+            self._report_cache = ReportCache()
+            # Throughput/RSSI trend; fed with every new log while watching.
+            self._trend: Optional[TrendDetector] = None
+            self._content_worker: Optional[LogContentWorker] = None
+            # New logs held back while a trend job builds the detector; replayed into it when done.
+            self._trend_backlog: Optional[List[LogRecord]] = None
+            self._job_title = ""
+            self._busy_restore: Dict[QPushButton, bool] = {}
             self.init_ui()
 
+            self.watch_timer = QTimer(self)
+            self.watch_timer.setInterval(WATCH_REFRESH_MS)
+            self.watch_timer.timeout.connect(self._on_watch_tick)
+
         def _apply_result_styles(self):
             # Larger typography + result highlighting.
             self.total_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
@@ -212,7 +2612,7 @@ def run_gui() -> int:
 
         def init_ui(self):
             self.setWindowTitle(f"{APP_WINDOW_TITLE} - (v{APP_VERSION})")
-            self.setGeometry(120, 120, 1000, 560)
+            self.setGeometry(120, 120, 1000, 820)
             self.setStyleSheet("QMainWindow { background-color: #f0f0f0; }")
 
             main_widget = QWidget()
@@ -308,7 +2708,14 @@ def run_gui() -> int:
                 }
                 """
             )
-            grid.addWidget(browse_log_btn, 1, 2)
+            add_log_btn = QPushButton("Add")
+            add_log_btn.setToolTip("Add another station folder; folders are merged on timestamp")
+            add_log_btn.clicked.connect(self.on_add_log_dir)
+            add_log_btn.setStyleSheet(browse_log_btn.styleSheet())
+            log_btn_row = QHBoxLayout()
+            log_btn_row.addWidget(browse_log_btn)
+            log_btn_row.addWidget(add_log_btn)
+            grid.addLayout(log_btn_row, 1, 2)
 
             self.parse_btn = QPushButton("Parse")
             self.parse_btn.clicked.connect(self.on_parse)
@@ -343,6 +2750,98 @@ def run_gui() -> int:
             grid.addWidget(self.pass_label, 2, 1)
             grid.addWidget(self.fail_label, 3, 1)
 
+            self.live_label = QLabel("")
+            self.live_label.setStyleSheet("color: #17a2b8;")
+            grid.addWidget(self.live_label, 3, 0)
+
+            self.watch_btn = QPushButton("Watch")
+            self.watch_btn.setCheckable(True)
+            self.watch_btn.toggled.connect(self.on_watch_toggled)
+            self.watch_btn.setMinimumHeight(38)
+            self.watch_btn.setStyleSheet(
+                """
+                QPushButton {
+                    background-color: #17a2b8;
+                    color: white;
+                    font-size: 12px;
+                    font-weight: bold;
+                    border: none;
+                    border-radius: 5px;
+                }
+                QPushButton:hover {
+                    background-color: #138496;
+                }
+                QPushButton:checked {
+                    background-color: #e67e22;
+                }
+                """
+            )
+            grid.addWidget(self.watch_btn, 3, 2)
+
+            self.contents_checkbox = QCheckBox("Include full log contents (throughput / RSSI percentiles)")
+            grid.addWidget(self.contents_checkbox, 4, 0, 1, 2)
+
+            self.stats_btn = QPushButton("Statistics")
+            self.stats_btn.clicked.connect(self.on_stats)
+            self.stats_btn.setMinimumHeight(38)
+            self.stats_btn.setStyleSheet(
+                """
+                QPushButton {
+                    background-color: #8e44ad;
+                    color: white;
+                    font-size: 12px;
+                    font-weight: bold;
+                    border: none;
+                    border-radius: 5px;
+                }
+                QPushButton:hover {
+                    background-color: #7d3c98;
+                }
+                QPushButton:pressed {
+                    background-color: #5b2c6f;
+                }
+                """
+            )
+            self.trend_btn = QPushButton("Trend")
+            self.trend_btn.setToolTip("Throughput / RSSI trend per station and band from the log contents")
+            self.trend_btn.clicked.connect(self.on_trend)
+            self.trend_btn.setMinimumHeight(38)
+            self.trend_btn.setStyleSheet(self.stats_btn.styleSheet())
+            stats_row = QHBoxLayout()
+            stats_row.addWidget(self.stats_btn, 1)
+            stats_row.addWidget(self.trend_btn, 1)
+            grid.addLayout(stats_row, 4, 2)
+
+            grid.addWidget(QLabel("Time Window:"), 5, 0)
+            window_row = QHBoxLayout()
+            self.window_preset_combo = QComboBox()
+            self.window_preset_combo.addItems(["Custom"] + WINDOW_PRESETS)
+            self.window_preset_combo.activated.connect(self.on_window_preset)
+            self.window_start_input = QLineEdit()
+            self.window_start_input.setPlaceholderText("Start: YYYY-MM-DD HH:MM, HH:MM or -1h")
+            self.window_end_input = QLineEdit()
+            self.window_end_input.setPlaceholderText("End (exclusive), empty = now")
+            window_row.addWidget(self.window_preset_combo)
+            window_row.addWidget(self.window_start_input, 1)
+            window_row.addWidget(QLabel("~"))
+            window_row.addWidget(self.window_end_input, 1)
+            grid.addLayout(window_row, 5, 1)
+
+            self.window_btn = QPushButton("Apply Window")
+            self.window_btn.setToolTip("Counts, table, Statistics and Report use only tests inside the window")
+            self.window_btn.clicked.connect(self.on_apply_window)
+            self.window_btn.setStyleSheet(browse_log_btn.styleSheet())
+            grid.addWidget(self.window_btn, 5, 2)
+
+            self.progress_label = QLabel("")
+            self.progress_label.setStyleSheet("color: #7f8c8d;")
+            grid.addWidget(self.progress_label, 6, 0, 1, 2)
+            self.cancel_btn = QPushButton("Cancel")
+            self.cancel_btn.clicked.connect(self.on_cancel_job)
+            self.cancel_btn.setStyleSheet(browse_log_btn.styleSheet())
+            self.cancel_btn.setVisible(False)
+            grid.addWidget(self.cancel_btn, 6, 2)
+
             main_layout.addWidget(input_group)
 
             report_group = QGroupBox("Report")
@@ -414,8 +2913,80 @@ def run_gui() -> int:
             )
             report_layout.addWidget(self.report_btn, 1, 2)
 
+            self.parquet_btn = QPushButton("Export Parquet")
+            self.parquet_btn.setToolTip(
+                f"Append the parsed tests to the {PARQUET_DATASET_DIRNAME} dataset in the report folder (one partition per day)"
+            )
+            self.parquet_btn.clicked.connect(self.on_export_parquet)
+            self.parquet_btn.setMinimumHeight(38)
+            self.parquet_btn.setStyleSheet(browse_report_btn.styleSheet())
+            parquet_row = QHBoxLayout()
+            parquet_row.addStretch(1)
+            parquet_row.addWidget(self.parquet_btn)
+            report_layout.addLayout(parquet_row, 1, 1)
+
             main_layout.addWidget(report_group)
-            main_layout.addStretch(1)
+
+            records_group = QGroupBox("Records")
+            records_group.setStyleSheet(report_group.styleSheet())
+            records_layout = QVBoxLayout()
+            records_group.setLayout(records_layout)
+
+            filter_row = QHBoxLayout()
+            self.date_from_input = QLineEdit()
+            self.date_from_input.setPlaceholderText("From YYYY-MM-DD")
+            self.date_to_input = QLineEdit()
+            self.date_to_input.setPlaceholderText("To YYYY-MM-DD")
+            self.sn_filter_input = QLineEdit()
+            self.sn_filter_input.setPlaceholderText("SN contains")
+            self.result_filter_combo = QComboBox()
+            self.result_filter_combo.addItems(["All", "PASS", "FAIL"])
+            self.station_filter_combo = QComboBox()
+            self.station_filter_combo.addItem("All")
+            self.all_attempts_checkbox = QCheckBox("All attempts")
+            self.all_attempts_checkbox.setToolTip("Show every test, not only the final test of each SN")
+            self.rows_label = QLabel("Rows: 0")
+            for w in (
+                self.date_from_input,
+                self.date_to_input,
+                self.sn_filter_input,
+                self.result_filter_combo,
+                self.station_filter_combo,
+                self.all_attempts_checkbox,
+            ):
+                filter_row.addWidget(w)
+            filter_row.addStretch(1)
+            filter_row.addWidget(self.rows_label)
+            records_layout.addLayout(filter_row)
+
+            # Typing in the filter boxes re-filters once the user pauses.
+            self.filter_timer = QTimer(self)
+            self.filter_timer.setSingleShot(True)
+            self.filter_timer.setInterval(250)
+            self.filter_timer.timeout.connect(self._apply_table_filter)
+            for w in (self.date_from_input, self.date_to_input, self.sn_filter_input):
+                w.textChanged.connect(self.filter_timer.start)
+            self.result_filter_combo.currentIndexChanged.connect(self._apply_table_filter)
+            self.station_filter_combo.currentIndexChanged.connect(self._apply_table_filter)
+            self.all_attempts_checkbox.toggled.connect(self._refresh_table)
+
+            self.table_view = QTableView()
+            self.table_view.setModel(self.table_model)
+            self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+            self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            self.table_view.setAlternatingRowColors(True)
+            self.table_view.setSortingEnabled(True)
+            self.table_view.sortByColumn(0, Qt.AscendingOrder)
+            # Fixed row height: the view never measures rows it does not paint.
+            self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self.table_view.verticalHeader().setDefaultSectionSize(22)
+            self.table_view.verticalHeader().setVisible(False)
+            self.table_view.horizontalHeader().setStretchLastSection(True)
+            self.table_view.setToolTip("Double-click a row to open its log")
+            self.table_view.doubleClicked.connect(self.on_record_double_clicked)
+            records_layout.addWidget(self.table_view)
+
+            main_layout.addWidget(records_group, 1)
 
         def on_browse_log_dir(self):
             initial_dir = self.log_dir_display.text().strip() or _default_browse_dir()
@@ -423,39 +2994,467 @@ def run_gui() -> int:
             if folder:
                 self.log_dir_display.setText(folder)
 
+        def on_add_log_dir(self):
+            current = split_log_dirs(self.log_dir_display.text())
+            initial_dir = current[-1] if current else _default_browse_dir()
+            folder = QFileDialog.getExistingDirectory(self, "Add Station Log Folder", initial_dir)
+            if folder and folder not in current:
+                self.log_dir_display.setText(";".join(current + [folder]))
+
         def on_browse_report_dir(self):
             initial_dir = self.report_dir_display.text().strip() or _default_browse_dir()
             folder = QFileDialog.getExistingDirectory(self, "Select Report Output Folder", initial_dir)
             if folder:
                 self.report_dir_display.setText(folder)
 
+        def _start_job(self, title: str, job_fn, on_progress, on_done) -> None:
+            buttons = (
+                self.parse_btn,
+                self.watch_btn,
+                self.stats_btn,
+                self.trend_btn,
+                self.report_btn,
+                self.parquet_btn,
+                self.window_btn,
+            )
+            self._busy_restore = {b: b.isEnabled() for b in buttons}
+            for b in buttons:
+                b.setEnabled(False)
+            self.cancel_btn.setEnabled(True)
+            self.cancel_btn.setVisible(True)
+            self._job_title = title
+            self.progress_label.setStyleSheet("color: #7f8c8d;")
+            self.progress_label.setText(f"{title}...")
+
+            job = BackgroundJob(job_fn, self)
+            job.progress.connect(on_progress)
+            job.done.connect(on_done)
+            job.cancelled.connect(self._on_job_cancelled)
+            job.failed.connect(self._on_job_failed)
+            job.finished.connect(self._on_job_finished)
+            self._job = job
+            job.start()
+
+        def _on_job_finished(self):
+            self._trend_backlog = None  # a trend job that did not finish leaves no detector to feed
+            for b, enabled in self._busy_restore.items():
+                b.setEnabled(enabled)
+            self._busy_restore = {}
+            self.cancel_btn.setVisible(False)
+            if self._job is not None:
+                self._job.deleteLater()
+                self._job = None
+
+        def _on_job_cancelled(self):
+            self.progress_label.setText(f"{self._job_title} cancelled.")
+            self._update_counts()  # drop the partial counts
+
+        def _on_job_failed(self, message: str):
+            self.progress_label.setText(f"{self._job_title} failed.")
+            self._update_counts()
+            QMessageBox.critical(self, self._job_title, message)
+
+        def on_cancel_job(self):
+            if self._job is not None:
+                self._job.requestInterruption()
+                self.cancel_btn.setEnabled(False)
+                self.progress_label.setText(f"Cancelling {self._job_title.lower()}...")
+
         def on_parse(self):
             log_dir = self.log_dir_display.text().strip()
-            raw = parse_log_directory_raw(log_dir)
+            if not log_dir:
+                self._on_parse_done([])
+                return
+            log_dirs = split_log_dirs(log_dir)
+            try:
+                resolve_log_roots(log_dirs)
+            except ValueError as e:
+                QMessageBox.warning(self, "Parse", str(e))
+                return
+            self._start_job(
+                "Parse",
+                lambda: parse_log_dirs_progressive(log_dirs),
+                self._on_parse_progress,
+                self._on_parse_done,
+            )
+
+        def _on_parse_progress(self, p: ParseProgress):
+            self._set_count_labels(p.pass_count + p.fail_count, p.pass_count, p.fail_count)
+            self.progress_label.setText(
+                f"Scanned {p.files_scanned:,} files, {p.records:,} logs ({p.rate:,.0f} files/s): {p.folder}"
+            )
+
+        def _on_parse_done(self, raw: List[LogRecord]):
+            log_dir = self.log_dir_display.text().strip()
             deduped = _dedupe_keep_latest_by_sn(raw)
             self.raw_records = raw
             self.records = deduped
+            self._time_index = TimeIndex(raw)
+            self.metrics = {}
+            self.metadata = {}
 
-            pass_count = sum(1 for r in deduped if r.result == "PASS")
-            fail_count = sum(1 for r in deduped if r.result == "FAIL")
-            total = pass_count + fail_count
-
-            self.total_label.setText(f"Total: {total}")
-            self.pass_label.setText(f"PASS: {pass_count} ({_ratio_text(pass_count, total)})")
-            self.fail_label.setText(f"FAIL: {fail_count} ({_ratio_text(fail_count, total)})")
+            total, pass_count, fail_count = self._update_counts()
+            self._refresh_table()
+            if log_dir:
+                self.progress_label.setText(f"Parsed {len(raw):,} logs.")
 
             if not log_dir:
                 QMessageBox.warning(self, "Parse", "Please select Log Folder first.")
                 return
 
+            window_note = f"\nWindow: {format_window(*self._window)}" if self._window != (None, None) else ""
             QMessageBox.information(
                 self,
                 "Parse",
-                f"Parse completed.\nTotal: {total}\nPASS: {pass_count}\nFAIL: {fail_count}",
+                f"Parse completed.\nTotal: {total}\nPASS: {pass_count}\nFAIL: {fail_count}{window_note}",
+            )
+
+        def _windowed(self) -> Tuple[List[LogRecord], List[LogRecord]]:
+            """(raw, deduped) records inside the active time window."""
+            if self._window == (None, None):
+                self._sync_live_records()
+                return self.raw_records, self.records
+            raw = self._time_index.window(*self._window)
+            return raw, _dedupe_keep_latest_by_sn(raw)
+
+        def _update_counts(self) -> Tuple[int, int, int]:
+            if self._live is not None and self._window == (None, None):
+                counts = (self._live.total, self._live.pass_count, self._live.fail_count)
+            else:
+                _, deduped = self._windowed()
+                pass_count = sum(1 for r in deduped if r.result == "PASS")
+                fail_count = sum(1 for r in deduped if r.result == "FAIL")
+                counts = (pass_count + fail_count, pass_count, fail_count)
+            self._set_count_labels(*counts)
+            return counts
+
+        def on_window_preset(self, index: int):
+            if index <= 0:
+                return
+            start, end = window_preset(self.window_preset_combo.currentText())
+            self.window_start_input.setText(start.strftime("%Y-%m-%d %H:%M:%S"))
+            self.window_end_input.setText(end.strftime("%Y-%m-%d %H:%M:%S"))
+            self.on_apply_window()
+
+        def on_apply_window(self):
+            try:
+                start = parse_time_bound(self.window_start_input.text())
+                end = parse_time_bound(self.window_end_input.text())
+            except ValueError as e:
+                QMessageBox.warning(self, "Time Window", str(e))
+                return
+            if start and end and end <= start:
+                QMessageBox.warning(self, "Time Window", "Window end must be after its start.")
+                return
+            self._window = (start, end)
+            if start is None and end is None:
+                self.window_preset_combo.setCurrentIndex(0)
+                self.window_btn.setText("Apply Window")
+            else:
+                self.window_btn.setText("Window On")
+            self._update_counts()
+            self._refresh_table()
+
+        def _station_of(self, r: LogRecord) -> str:
+            if r.station:
+                return r.station
+            meta = self.metadata.get(r.filename)
+            return meta.station if meta else ""
+
+        def _refresh_table(self):
+            raw, deduped = self._windowed()
+            self.table_model.set_records(raw if self.all_attempts_checkbox.isChecked() else deduped)
+
+            stations = sorted({self._station_of(r) for r in self.raw_records} - {""})
+            current = self.station_filter_combo.currentText()
+            if stations != [self.station_filter_combo.itemText(i) for i in range(1, self.station_filter_combo.count())]:
+                self.station_filter_combo.blockSignals(True)
+                self.station_filter_combo.clear()
+                self.station_filter_combo.addItems(["All"] + stations)
+                self.station_filter_combo.setCurrentText(current if current in stations else "All")
+                self.station_filter_combo.blockSignals(False)
+                if current not in stations and current != "All":
+                    self._apply_table_filter()
+            self._update_rows_label()
+
+        def _add_table_rows(self, added: List[LogRecord]):
+            # Watch: only the new logs go to the table; a full refresh only for a new station.
+            added = [r for r in added if in_window(r, *self._window)]
+            known = {self.station_filter_combo.itemText(i) for i in range(1, self.station_filter_combo.count())}
+            if not {self._station_of(r) for r in added} - {""} <= known:
+                self._refresh_table()
+                return
+            self.table_model.add_records(added, dedupe=not self.all_attempts_checkbox.isChecked())
+            self._update_rows_label()
+
+        def _apply_table_filter(self):
+            result = self.result_filter_combo.currentText()
+            station = self.station_filter_combo.currentText()
+            self.table_model.set_filter(
+                self.date_from_input.text().strip(),
+                self.date_to_input.text().strip(),
+                self.sn_filter_input.text(),
+                "" if result == "All" else result,
+                "" if station == "All" else station,
             )
+            self._update_rows_label()
+
+        def _update_rows_label(self):
+            shown = self.table_model.matched_count()
+            total = self.table_model.record_count()
+            self.rows_label.setText(f"Rows: {shown:,}" if shown == total else f"Rows: {shown:,} / {total:,}")
+
+        def on_record_double_clicked(self, index):
+            if not index.isValid():
+                return
+            path = self.table_model.record_at(index.row()).path
+            try:
+                viewer = LogViewerDialog(path, self)
+            except OSError as e:
+                QMessageBox.warning(self, "Open Log", f"Cannot open log file:\n{path}\n{e}")
+                return
+            viewer.show()
+
+        def _set_count_labels(self, total: int, pass_count: int, fail_count: int):
+            self.total_label.setText(f"Total: {total}")
+            self.pass_label.setText(f"PASS: {pass_count} ({_ratio_text(pass_count, total)})")
+            self.fail_label.setText(f"FAIL: {fail_count} ({_ratio_text(fail_count, total)})")
+
+        def _sync_live_records(self):
+            if self._live is not None:
+                self.records = self._live.records()
+
+        def on_watch_toggled(self, checked: bool):
+            if checked:
+                self._start_watch()
+            else:
+                self._stop_watch()
+
+        def _start_watch(self):
+            try:
+                roots = resolve_log_roots(split_log_dirs(self.log_dir_display.text()))
+            except ValueError as e:
+                QMessageBox.warning(self, "Watch", str(e))
+                self.watch_btn.setChecked(False)
+                return
+            if not roots or not all(os.path.isdir(path) for _, path in roots):
+                QMessageBox.warning(self, "Watch", "Please select Log Folder first.")
+                self.watch_btn.setChecked(False)
+                return
+
+            raw = []
+            for station, path in roots:
+                watcher = LogDirectoryWatcher(path)
+                self._watchers.append((station, watcher))
+                raw.extend(r for r in (_record_from_path(p, station) for p in watcher.start()) if r is not None)
+            raw.sort(key=lambda r: r.dt)
+
+            self._live = IncrementalYield()
+            for r in raw:
+                self._live.add(r)
+            self.raw_records = raw
+            self._time_index = TimeIndex(raw)
+            self.metrics = {}
+            self.metadata = {}
+            self._sync_live_records()
+
+            self._content_worker = LogContentWorker(self)
+            self._content_worker.parsed.connect(self._on_watch_contents)
+            self._content_worker.start()
+
+            self.parse_btn.setEnabled(False)
+            self.watch_btn.setText("Stop Watch")
+            self._update_counts()
+            self._refresh_table()
+            self.live_label.setText(f"Live ({self._watch_mode()}) since {datetime.now():%H:%M:%S}")
+            self.watch_timer.start()
+            if np is not None:
+                self._start_trend_job(raw[-TREND_PRIME_LOGS:], show=False)
+
+        def _stop_watch(self):
+            self.watch_timer.stop()
+            for _, watcher in self._watchers:
+                watcher.close()
+            self._watchers = []
+            if self._content_worker is not None:
+                self._content_worker.stop()
+                self._content_worker.deleteLater()
+                self._content_worker = None
+            self._sync_live_records()
+            self._live = None
+            self.parse_btn.setEnabled(True)
+            self.watch_btn.setText("Watch")
+            self.live_label.setText("")
+
+        def _watch_mode(self) -> str:
+            return "/".join(sorted({w.mode for _, w in self._watchers}))
+
+        def _on_watch_tick(self):
+            if not self._watchers or self._live is None:
+                return
+
+            changed = False
+            last_name = ""
+            added: List[LogRecord] = []
+            for station, watcher in self._watchers:
+                for path in watcher.poll():
+                    rec = _record_from_path(path, station)
+                    if rec is None:
+                        continue
+                    self._time_index.insert(rec)  # also inserts into self.raw_records
+                    self._live.add(rec)
+                    changed = True
+                    last_name = rec.filename
+                    added.append(rec)
+
+            # Labels are refreshed at most once per timer tick, however many logs landed.
+            added.sort(key=lambda r: r.dt)
+            if changed:
+                self._update_counts()
+                self._add_table_rows(added)
+                self.live_label.setText(f"Live ({self._watch_mode()}) {datetime.now():%H:%M:%S}: {last_name}")
+
+            if added and self._trend_backlog is not None:
+                self._trend_backlog.extend(added)
+            elif added and self._trend is not None:
+                self._content_worker.submit(added)
+
+        def _on_watch_contents(self, result: Tuple[List[LogRecord], Dict[str, LogContentMetrics]]):
+            records, new_metrics = result
+            self.metrics.update(new_metrics)
+            if self._trend is not None:
+                alerts = self._trend.add(records, new_metrics)
+                if alerts:
+                    self._show_trend_alert(alerts[-1])
+
+        def closeEvent(self, event):
+            if self._job is not None:
+                self._job.requestInterruption()
+                self._job.wait()
+            self._stop_watch()
+            super().closeEvent(event)
+
+        def on_trend(self):
+            if not self.raw_records:
+                QMessageBox.warning(self, "Trend", "No parsed records. Please click Parse first.")
+                return
+            if np is None:
+                QMessageBox.critical(self, "Trend", "NumPy is required for the trend detector: pip3 install numpy")
+                return
+            raw, _ = self._windowed()
+            self._start_trend_job(list(raw), show=True)
+
+        def _start_trend_job(self, records: List[LogRecord], show: bool):
+            # Log bodies are cached in self.metrics, so a re-run only reads new logs. The job
+            # only reads it; what it parses goes to `fresh`, merged on the UI thread when done.
+            metrics = self.metrics
+            fresh: Dict[str, LogContentMetrics] = {}
+            windowed = self._window != (None, None)
+            if not windowed and self._live is not None:
+                self._trend_backlog = []
+
+            def _trend_job():
+                missing = [r for r in records if r.filename not in metrics]
+                for i in range(0, len(missing), TREND_PROGRESS_LOGS):
+                    yield f"Reading log contents: {i:,} / {len(missing):,}"
+                    fresh.update(parse_log_contents(missing[i : i + TREND_PROGRESS_LOGS]))
+                yield f"Computing trends over {len(records):,} tests..."
+                detector = TrendDetector()
+                detector.add(records, ChainMap(fresh, metrics))
+                return detector
+
+            def _on_done(detector: TrendDetector):
+                self.metrics.update(fresh)
+                self.progress_label.setText(f"Trend: {len(detector.series)} series, {len(detector.alerts)} alert(s).")
+                if not windowed:
+                    self._trend = detector  # keeps learning from the logs Watch picks up
+                    backlog, self._trend_backlog = self._trend_backlog, None
+                    if backlog and self._content_worker is not None:
+                        self._content_worker.submit(backlog)
+                if show:
+                    self._show_trend_report(detector)
+
+            self._start_job("Trend", _trend_job, self.progress_label.setText, _on_done)
+
+        def _show_trend_alert(self, alert: TrendAlert):
+            color = "#e74c3c" if alert.state == "DROP" else "#27ae60"
+            self.progress_label.setStyleSheet(f"color: {color}; font-weight: bold;")
+            self.progress_label.setText(format_trend_alert(alert))
+
+        def _show_trend_report(self, detector: TrendDetector):
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Throughput / RSSI Trend")
+            dlg.resize(900, 560)
+            layout = QVBoxLayout(dlg)
+            text = QPlainTextEdit()
+            text.setReadOnly(True)
+            text.setFont(QFont("Courier New", 10))
+            window_note = f"Time Window: {format_window(*self._window)}\n\n" if self._window != (None, None) else ""
+            text.setPlainText(window_note + format_trend_report(detector))
+            layout.addWidget(text)
+            dlg.exec_()
+
+        def on_stats(self):
+            if not self.raw_records:
+                QMessageBox.warning(self, "Statistics", "No parsed records. Please click Parse first.")
+                return
+
+            if np is None:
+                QMessageBox.critical(self, "Statistics", "NumPy is required for statistics: pip3 install numpy")
+                return
+
+            records = list(self._windowed()[0])
+            with_contents = self.contents_checkbox.isChecked()
+            # Logs are read into `fresh_*` off the UI thread and merged when the job is done,
+            # as in the trend job; the caches keep a re-run from reading them again.
+            metadata, metrics = self.metadata, self.metrics
+            fresh_metadata: Dict[str, LogMetadata] = {}
+            fresh_metrics: Dict[str, LogContentMetrics] = {}
+
+            def _stats_job():
+                # Header/footer reads are cheap (two small reads per log); always do them.
+                missing = [r for r in records if r.filename not in metadata]
+                for i in range(0, len(missing), TREND_PROGRESS_LOGS):
+                    yield f"Reading log headers: {i:,} / {len(missing):,}"
+                    fresh_metadata.update(parse_log_metadata(missing[i : i + TREND_PROGRESS_LOGS]))
+                if with_contents:
+                    missing = [r for r in records if r.filename not in metrics]
+                    for i in range(0, len(missing), TREND_PROGRESS_LOGS):
+                        yield f"Reading log contents: {i:,} / {len(missing):,}"
+                        fresh_metrics.update(parse_log_contents(missing[i : i + TREND_PROGRESS_LOGS]))
+                yield f"Computing statistics over {len(records):,} tests..."
+                return compute_yield_stats(
+                    records,
+                    ChainMap(fresh_metrics, metrics) if with_contents else None,
+                    ChainMap(fresh_metadata, metadata),
+                )
+
+            def _on_done(stats: YieldStats):
+                self.metadata.update(fresh_metadata)
+                self.metrics.update(fresh_metrics)
+                if fresh_metadata:
+                    self._refresh_table()  # stations are known now
+                self.progress_label.setText("Statistics computed.")
+                self._show_yield_stats(stats)
+
+            self._start_job("Statistics", _stats_job, self.progress_label.setText, _on_done)
+
+        def _show_yield_stats(self, stats: YieldStats):
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Yield Statistics")
+            dlg.resize(760, 560)
+            layout = QVBoxLayout(dlg)
+            text = QPlainTextEdit()
+            text.setReadOnly(True)
+            text.setFont(QFont("Courier New", 10))
+            window_note = f"Time Window: {format_window(*self._window)}\n\n" if self._window != (None, None) else ""
+            text.setPlainText(window_note + format_yield_stats(stats))
+            layout.addWidget(text)
+            dlg.exec_()
 
         def on_report(self):
-            if not self.records:
+            raw, deduped = self._windowed()
+            if not deduped:
                 QMessageBox.warning(self, "Report", "No parsed records. Please click Parse first.")
                 return
 
@@ -469,83 +3468,59 @@ def run_gui() -> int:
                 or self.production_name_input.placeholderText().strip()
                 or "UNKNOWN"
             )
-            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", production_name)
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            csv_path = os.path.join(out_dir, f"wifi_stress_report_{safe_name}_{ts}.csv")
-            txt_path = os.path.join(out_dir, f"wifi_stress_yield_{safe_name}_{ts}.txt")
+            csv_path, txt_path = report_paths(out_dir, production_name)
+            # Snapshot: Watch keeps inserting into raw_records while the job runs.
+            records = list(raw if raw else deduped)
+            scope = (self.log_dir_display.text().strip(), self._window)
+            window_text = format_window(*self._window) if self._window != (None, None) else ""
+            cache = self._report_cache
+
+            def _report_job():
+                # Counters, retest chains and failure causes come from the cache when the
+                # same records were reported before; appended logs are added on top.
+                acc, failures, pending = cache.take(scope, records)
+                acc.window_text = window_text
+                for i in range(0, len(pending), REPORT_PROGRESS_RECORDS):
+                    yield f"Building report: {i:,} / {len(pending):,} new tests"
+                    acc.extend(pending[i : i + REPORT_PROGRESS_RECORDS])
+
+                new_failed = sum(1 for r in acc.final_failures() if r.filename not in failures)
+                yield f"Classifying {new_failed:,} failed logs..."
+                classify_new_failures(acc, failures)
+                cache.put(scope, records, acc, failures)
+
+                yield "Writing CSV..."
+                try:
+                    acc.write_csv(csv_path, production_name)
+                except OSError as e:
+                    return "csv", str(e)
+
+                yield "Writing TXT summary..."
+                try:
+                    acc.write_yield_txt(txt_path, production_name, failures)
+                except OSError as e:
+                    return "txt", str(e)
+                return "", ""
+
+            self._start_job(
+                "Report",
+                _report_job,
+                self.progress_label.setText,
+                lambda result: self._on_report_done(result, csv_path, txt_path),
+            )
 
-            try:
-                with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
-                    w = csv.writer(f)
-                    w.writerow(["Product", "Date", "Time", "SN", "MAC", "Result"])
-                    for r in sorted(self.records, key=lambda x: x.dt):
-                        # Per request: SN column shows the (long) MAC; MAC column shows the sequence/short code.
-                        w.writerow([production_name, r.test_date, r.test_time, r.mac, r.serial, r.result])
-            except OSError as e:
-                QMessageBox.critical(self, "Report", f"Failed to create report.\n{e}")
+        def _on_report_done(self, result: Tuple[str, str], csv_path: str, txt_path: str):
+            failed_step, error = result
+            self.progress_label.setText("Report generated." if not failed_step else "Report failed.")
+            if failed_step == "csv":
+                QMessageBox.critical(self, "Report", f"Failed to create report.\n{error}")
                 return
 
-            # Generate a simple TXT yield report after CSV.
-            total = len(self.records)
-            pass_count = sum(1 for r in self.records if r.result == "PASS")
-            fail_count = sum(1 for r in self.records if r.result == "FAIL")
-
-            # Test date: if logs are from a single day, show that day; otherwise show a range.
-            dates = sorted({r.test_date for r in self.records})
-            if not dates:
-                test_date_text = datetime.now().strftime("%Y-%m-%d")
-            elif len(dates) == 1:
-                test_date_text = dates[0]
-            else:
-                test_date_text = f"{dates[0]} ~ {dates[-1]}"
-
-            report_time_text = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            def _ratio_text_2(count: int, total_count: int) -> str:
-                if total_count <= 0:
-                    return "0.00%"
-                return f"{(count / total_count) * 100.0:.2f}%"
-
-            try:
-                with open(txt_path, "w", encoding="utf-8") as f:
-                    f.write("WiFi Yield Report\n")
-                    f.write(f"Product: {production_name}\n")
-                    f.write(f"Test Date: {test_date_text}\n")
-                    f.write(f"Report Time: {report_time_text}\n")
-                    f.write(f"Total Tests: {total}\n")
-                    f.write(f"PASS Count: {pass_count}, PASS Rate: {_ratio_text_2(pass_count, total)}\n")
-                    f.write(f"FAIL Count: {fail_count}, FAIL Rate: {_ratio_text_2(fail_count, total)}\n")
-
-                    # Retest details: if a SN appears multiple times in raw logs, it indicates retest.
-                    # "Retest count" excludes the last (final) test: retests = attempts - 1.
-                    raw_source = self.raw_records if self.raw_records else self.records
-                    by_sn: dict[str, List[LogRecord]] = {}
-                    for r in raw_source:
-                        by_sn.setdefault(r.mac, []).append(r)
-
-                    retest_items = [(sn, sorted(items, key=lambda x: x.dt)) for sn, items in by_sn.items() if len(items) > 1]
-                    retest_items.sort(key=lambda x: x[0])
-
-                    total_retests = sum(len(items) - 1 for _, items in retest_items)
-
-                    f.write("\n")
-                    f.write("Retest Details (grouped by SN)\n")
-                    f.write(f"Total Retests (exclude final): {total_retests}\n")
-                    if not retest_items:
-                        f.write("No retest records found.\n")
-                    else:
-                        for sn, items in retest_items:
-                            results_seq = " -> ".join(
-                                f"{i.result}@{i.test_date} {i.test_time}" for i in items
-                            )
-                            f.write(
-                                f"SN: {sn}, Attempts: {len(items)}, Retests: {len(items) - 1}, Results: {results_seq}\n"
-                            )
-            except OSError as e:
+            if failed_step == "txt":
                 QMessageBox.warning(
                     self,
                     "Report",
-                    "CSV generated, but failed to create TXT summary.\n" + str(e),
+                    "CSV generated, but failed to create TXT summary.\n" + error,
                 )
                 QMessageBox.information(
                     self,
@@ -562,7 +3537,50 @@ def run_gui() -> int:
                 f"TXT: {os.path.normpath(txt_path)}",
             )
 
-    import sys
+        def on_export_parquet(self):
+            raw, _ = self._windowed()
+            if not raw:
+                QMessageBox.warning(self, "Export Parquet", "No parsed records. Please click Parse first.")
+                return
+
+            out_dir = self.report_dir_display.text().strip()
+            if not out_dir or not os.path.isdir(out_dir):
+                QMessageBox.warning(self, "Export Parquet", "Please select Report Output Folder first.")
+                return
+
+            # A missing pyarrow or an unreadable dataset part fails the job with a message box.
+            dataset_dir = os.path.join(out_dir, PARQUET_DATASET_DIRNAME)
+            records = list(raw)
+            # As in the statistics job: logs read by the job are merged into the caches when it is done.
+            fresh_metadata: Dict[str, LogMetadata] = {}
+            fresh_metrics: Dict[str, LogContentMetrics] = {}
+
+            def _on_done(result: Tuple[int, int]):
+                self.metadata.update(fresh_metadata)
+                self.metrics.update(fresh_metrics)
+                self._on_export_parquet_done(result, dataset_dir)
+
+            self._start_job(
+                "Export Parquet",
+                lambda: export_parquet_progressive(
+                    records,
+                    dataset_dir,
+                    with_contents=self.contents_checkbox.isChecked(),
+                    metadata=ChainMap(fresh_metadata, self.metadata),
+                    metrics=ChainMap(fresh_metrics, self.metrics),
+                ),
+                self.progress_label.setText,
+                _on_done,
+            )
+
+        def _on_export_parquet_done(self, result: Tuple[int, int], dataset_dir: str):
+            rows, files = result
+            self.progress_label.setText(f"Exported {rows:,} new test(s).")
+            QMessageBox.information(
+                self,
+                "Export Parquet",
+                f"Exported {rows} new test(s) in {files} file(s).\nDataset: {os.path.normpath(dataset_dir)}",
+            )
 
     app = QApplication(sys.argv)
     win = WiFiStressLogAnalyzer()
@@ -570,9 +3588,269 @@ def run_gui() -> int:
     return app.exec_()
 
 
-def main() -> int:
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=f"{APP_HEADER_TITLE} (v{APP_VERSION}). Without --log-dir the GUI is started."
+    )
+    parser.add_argument(
+        "--log-dir",
+        nargs="+",
+        metavar="DIR",
+        help=(
+            "Parse this log folder on the command line (no GUI). Give several station roots "
+            "(optionally STATION=DIR) to merge them on timestamp with a line-wide SN dedupe"
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print yield/retest statistics, station/port/BT breakdowns and filename cross-check (reads log header/footer only)",
+    )
+    parser.add_argument(
+        "--contents",
+        action="store_true",
+        help="Also parse the full log contents for throughput/RSSI percentiles",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and print the live yield as new logs land under --log-dir (and its sub folders)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_REFRESH_MS / 1000.0,
+        help="Watch refresh interval in seconds (default: %(default)s)",
+    )
+    parser.add_argument("--poll", action="store_true", help="Watch by polling instead of inotify")
+    parser.add_argument(
+        "--start",
+        default="",
+        help='Only tests at/after this time: "YYYY-MM-DD [HH:MM[:SS]]", "HH:MM" (today) or "-1h"/"-30m"/"-2d"',
+    )
+    parser.add_argument("--end", default="", help="Only tests before this time (same formats as --start)")
+    parser.add_argument("--report", metavar="OUT_DIR", help="Write the CSV + TXT yield report into OUT_DIR")
+    parser.add_argument(
+        "--parquet",
+        metavar="DATASET_DIR",
+        help="Append the parsed tests to a Parquet dataset (one partition per day; needs pyarrow)",
+    )
+    parser.add_argument(
+        "--trend",
+        action="store_true",
+        help=(
+            "Track throughput/RSSI per station and band (EWMA + rolling median) from the log contents "
+            "and flag significant drops; with --watch the alerts are printed as logs land (needs NumPy)"
+        ),
+    )
+    parser.add_argument("--product", default="UNKNOWN", help="Product name used in the report (default: %(default)s)")
+    return parser
+
+
+def run_report_cli(args: argparse.Namespace) -> int:
+    if not os.path.isdir(args.report):
+        print(f"Report output folder not found: {args.report}")
+        return 1
+
+    if args.window != (None, None):
+        acc = ReportAccumulator().extend(TimeIndex(list(_iter_cli_records(args.log_dir))).window(*args.window))
+        acc.window_text = format_window(*args.window)
+    else:
+        # Stream straight from the folder listing(s): no raw record list is materialized.
+        acc = ReportAccumulator().extend(_iter_cli_records(args.log_dir))
+    if acc.total == 0:
+        print("No parsed records.")
+        return 1
+
+    csv_path, txt_path = report_paths(args.report, args.product)
+    try:
+        acc.write_csv(csv_path, args.product)
+        acc.write_yield_txt(txt_path, args.product, classify_failures(acc.final_failures()))
+    except OSError as e:
+        print(f"Failed to create report.\n{e}")
+        return 1
+
+    print(f"Total: {acc.total}")
+    print(f"PASS: {acc.pass_count} ({_ratio_text(acc.pass_count, acc.total)})")
+    print(f"FAIL: {acc.fail_count} ({_ratio_text(acc.fail_count, acc.total)})")
+    print(f"CSV: {os.path.normpath(csv_path)}")
+    print(f"TXT: {os.path.normpath(txt_path)}")
+    return 0
+
+
+def _iter_cli_records(log_dirs: List[str]) -> Iterator[LogRecord]:
+    # One root and N roots read the same folders: each root plus its dated sub folders.
+    roots = resolve_log_roots(log_dirs)
+    if len(roots) == 1:
+        return iter_log_root_sorted(roots[0][1], roots[0][0])
+    return parse_log_roots_merged(log_dirs)
+
+
+def run_parquet_cli(args: argparse.Namespace) -> int:
+    raw: List[LogRecord] = list(_iter_cli_records(args.log_dir))
+    if args.window != (None, None):
+        raw = TimeIndex(raw).window(*args.window)
+    try:
+        rows, files = export_parquet(raw, args.parquet, with_contents=args.contents)
+    except (RuntimeError, OSError) as e:
+        print(f"Failed to export.\n{e}")
+        return 1
+    print(f"Exported {rows} new test(s) in {files} file(s) to {os.path.normpath(args.parquet)}")
+    return 0
+
+
+def run_trend_cli(args: argparse.Namespace) -> int:
+    raw: List[LogRecord] = list(_iter_cli_records(args.log_dir))
+    if args.window != (None, None):
+        raw = TimeIndex(raw).window(*args.window)
+        print(f"Time Window: {format_window(*args.window)}")
+    try:
+        detector = TrendDetector()
+    except RuntimeError as e:
+        print(str(e))
+        return 1
+    detector.add(raw, parse_log_contents(raw))
+    print(format_trend_report(detector))
+    return 0
+
+
+def run_stats_cli(args: argparse.Namespace) -> int:
+    raw: List[LogRecord] = list(_iter_cli_records(args.log_dir))
+    if args.window != (None, None):
+        raw = TimeIndex(raw).window(*args.window)
+        print(f"Time Window: {format_window(*args.window)}")
+    metadata = parse_log_metadata(raw)
+    metrics = parse_log_contents(raw) if args.contents else None
+    try:
+        stats = compute_yield_stats(raw, metrics, metadata)
+    except RuntimeError as e:
+        print(str(e))
+        return 2
+    print(format_yield_stats(stats))
+    return 0
+
+
+def run_watch_cli(args: argparse.Namespace) -> int:
+    detector: Optional[TrendDetector] = None
+    if args.trend:
+        try:
+            detector = TrendDetector()
+        except RuntimeError as e:
+            print(str(e))
+            return 1
+
+    def _records(paths: List[str], station: str) -> Iterator[LogRecord]:
+        # Only tests inside --start/--end count, at start-up and as logs land.
+        for r in (_record_from_path(p, station) for p in paths):
+            if r is not None and in_window(r, *args.window):
+                yield r
+
+    watchers = [(station, LogDirectoryWatcher(path, force_poll=args.poll)) for station, path in resolve_log_roots(args.log_dir)]
+    raw = []
+    for station, watcher in watchers:
+        raw.extend(_records(watcher.start(), station))
+    raw.sort(key=lambda r: r.dt)
+
+    live = IncrementalYield()
+    for r in raw:
+        live.add(r)
+    if detector is not None:
+        primed = raw[-TREND_PRIME_LOGS:]
+        detector.add(primed, parse_log_contents(primed))
+
+    def _line(note: str) -> str:
+        return (
+            f"[{datetime.now():%H:%M:%S}] Total: {live.total}  "
+            f"PASS: {live.pass_count} ({_ratio_text(live.pass_count, live.total)})  "
+            f"FAIL: {live.fail_count} ({_ratio_text(live.fail_count, live.total)})  {note}"
+        )
+
+    watching = ", ".join(f"{w.root} ({w.mode})" for _, w in watchers)
+    if args.window != (None, None):
+        print(f"Time Window: {format_window(*args.window)}")
+    print(_line(f"watching {watching}"), flush=True)
+    try:
+        while True:
+            time.sleep(max(0.1, args.interval))
+            added = []
+            for station, watcher in watchers:
+                added.extend(_records(watcher.poll(), station))
+            added.sort(key=lambda r: r.dt)
+            for r in added:
+                live.add(r)
+            if added:
+                print(_line(f"+{len(added)} {added[-1].filename}"), flush=True)
+            if added and detector is not None:
+                for alert in detector.add(added, parse_log_contents(added)):
+                    print(format_trend_alert(alert), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for _, watcher in watchers:
+            watcher.close()
+    return 0
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    try:
+        args.window = (parse_time_bound(args.start), parse_time_bound(args.end))
+    except ValueError as e:
+        print(str(e))
+        return 2
+
+    try:
+        roots = resolve_log_roots(args.log_dir)
+    except ValueError as e:
+        print(str(e))
+        return 2
+    for _, path in roots:
+        if not os.path.isdir(path):
+            print(f"Log folder not found: {path}")
+            return 1
+
+    if args.watch:
+        return run_watch_cli(args)
+
+    outputs = [
+        run
+        for flag, run in (
+            (args.stats, run_stats_cli),
+            (args.report, run_report_cli),
+            (args.parquet, run_parquet_cli),
+            (args.trend, run_trend_cli),
+        )
+        if flag
+    ]
+    if outputs:
+        # Every requested output is produced; the exit code is the first failure.
+        codes = [run(args) for run in outputs]
+        return next((code for code in codes if code), 0)
+
+    raw = list(_iter_cli_records(args.log_dir))
+
+    if args.window != (None, None):
+        raw = TimeIndex(raw).window(*args.window)
+        print(f"Time Window: {format_window(*args.window)}")
+
+    deduped = _dedupe_keep_latest_by_sn(raw)
+    pass_count = sum(1 for r in deduped if r.result == "PASS")
+    fail_count = sum(1 for r in deduped if r.result == "FAIL")
+    total = pass_count + fail_count
+    print(f"Total: {total}")
+    print(f"PASS: {pass_count} ({_ratio_text(pass_count, total)})")
+    print(f"FAIL: {fail_count} ({_ratio_text(fail_count, total)})")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # parse_known_args: leave Qt's own options (e.g. -style) for QApplication.
+    args, _ = _build_arg_parser().parse_known_args(argv)
+    if args.log_dir:
+        return run_cli(args)
     return run_gui()
 
 
 if __name__ == "__main__":
+    # The failure classifier's process pool re-launches this executable when frozen.
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -36,6 +36,56 @@
 # - Configuration files are now dynamically set based on SSID_GROUP parameter
 # - Enhanced help system with SSID group examples and usage patterns
 #################################################################################
+# date: 2026-10-19
+# update: Machine-readable markers (-m/--markers or QC_MARKERS=1)
+# - Prints single-line "@@QC <event> key=value ... t=<DUT uptime>" markers next to
+#   the human output: begin/end of the run and of each band, every iperf attempt
+#   (throughput, RSSI, result) and the final verdict
+# - The verdict marker is also printed when the script exits early, so the GUI
+#   never has to wait for a result line that will not come
+#################################################################################
+# date: 2026-10-19
+# update: Early abort of hopeless iperf attempts (-a/--abort PERCENT[:INTERVALS])
+# - iperf output is watched while it runs; when the [SUM] interval throughput
+#   stays below PERCENT of the band threshold for INTERVALS consecutive
+#   intervals, iperf is stopped (SIGINT, so it still prints its totals) and the
+#   attempt fails as "early abort" -> test_band moves on to the next attempt
+# - Off by default (opt-in, e.g. -a 50:10 = 10 s at the default 1 s interval)
+# - Only aborts when the attempt can no longer pass: even if every remaining
+#   interval ran at its best interval rate so far, the average would stay
+#   below the threshold (a slow start after the connect is not aborted)
+#################################################################################
+# date: 2026-10-19
+# update: Adaptive test duration (-A/--adaptive MIN_SECONDS[:CONFIDENCE])
+# - Stops an iperf attempt once the lower CONFIDENCE% bound of the mean [SUM]
+#   interval throughput (mean - z*sd/sqrt(n)) is above the band threshold, but
+#   not before MIN_SECONDS; the full duration stays the upper limit
+# - Each attempt logs its actual duration and the confidence reached
+# - CONFIDENCE is 90, 95, 99 (default) or 99.9
+#################################################################################
+# date: 2026-10-19
+# update: Fast reconnect path (-r/--reconnect fast|legacy, default fast)
+# - Keeps one wpa_supplicant running and switches bands / re-associates between
+#   attempts through wpa_cli instead of killing and restarting it
+# - Polls wpa_state and runs udhcpc in the foreground only as long as needed
+# - Each connect logs its association and DHCP time; attempt markers carry
+#   connect_ms= and dhcp_ms=
+# - Falls back to the legacy path when wpa_cli / the control socket is missing
+#################################################################################
+# date: 2026-10-19
+# update: RF sampling during iperf (-R/--rf-sample SECONDS)
+# - A background sampler prints "@@QC rf ..." lines with signal level, link
+#   quality (/proc/net/wireless) and bit rate (iwconfig) every SECONDS while
+#   iperf runs, so the GUI can plot RSSI next to the throughput
+#################################################################################
+# date: 2026-10-19
+# update: Per-driver iperf profile and tuning mode (-T/--tune, -f/--profile)
+# - iperf -P/-w/-l come from wifi_grp/iperf_profile.conf for the detected
+#   driver (wlan/mlan/bcmdhd) and band; built-in -P 3 -w 128k -l 24000 otherwise
+# - -T SECONDS on a golden unit sweeps streams, then window, then buffer length
+#   per band, scores each setting by mean - sd of its [SUM] intervals and writes
+#   the best one into the profile
+#################################################################################
 
 # Function to check wlan0 interface availability
 check_wlan0_interface() {
@@ -132,6 +182,22 @@ show_help() {
     echo "                          solo = Use solo WiFi configuration (default)"
     echo "                          grpa = Use STA group A configuration"
     echo "                          grpb = Use STA group B configuration"
+    echo "  -p, --port PORT         iperf server port for both bands (leased from iperf_pool.py)"
+    echo "                          Default: 5001 (5G) / 5002 (2.4G)"
+    echo "  -m, --markers           Also print machine-readable \"@@QC ...\" marker lines (for the GUI)"
+    echo "  -a, --abort PCT[:N]     Stop an iperf attempt early when N consecutive intervals"
+    echo "                          stay below PCT% of the band threshold and the attempt can no"
+    echo "                          longer reach it (e.g. 50:10; default 0 = off)"
+    echo "  -A, --adaptive MIN[:CONF]  Adaptive duration: stop an attempt after at least MIN seconds"
+    echo "                          once the lower CONF% (90/95/99/99.9, default 99) confidence bound"
+    echo "                          of the throughput is above the band threshold (default off)"
+    echo "  -R, --rf-sample SEC     Print \"@@QC rf\" RSSI / link quality / bit rate samples every SEC"
+    echo "                          seconds while iperf runs (e.g. 1 or 0.5, min 0.1; default 0 = off)"
+    echo "  -T, --tune SECONDS      Tuning mode (golden unit): sweep iperf streams / window / buffer length"
+    echo "                          per band, SECONDS per run, and save the best to the iperf profile"
+    echo "  -f, --profile FILE      iperf profile (default: wifi_grp/iperf_profile.conf)"
+    echo "  -r, --reconnect MODE    fast (default): keep wpa_supplicant running and reconnect via wpa_cli"
+    echo "                          legacy: restart wpa_supplicant for every connect"
     echo ""
     echo "TEST LEVELS:"
     echo "  l0 (10s)  : Rapid check test"
@@ -158,6 +224,14 @@ show_help() {
     echo "  $0 -d 90 -c ax         # Use 90s duration, test 5G first, solo"
     echo "  $0 -s grpa             # Use STA group A configuration"
     echo "  $0 -s grpb -c bgn      # Use STA group B, test 2.4G first"
+    echo "  $0 -s grpa -p 5005     # Use STA group A and the iperf server on port 5005"
+    echo "  $0 -d l1 -m            # Use 30s duration and print @@QC markers"
+    echo "  $0 -a 30:20            # Abort an attempt after 20 intervals below 30% of the threshold"
+    echo "  $0 -a 0                # Always run iperf for the full duration"
+    echo "  $0 -d l2 -A 20         # Up to 120s, stop after >= 20s once 99% sure the band passes"
+    echo "  $0 -r legacy           # Restart wpa_supplicant for every connect"
+    echo "  $0 -m -R 1             # Markers plus an RSSI / bit rate sample every second during iperf"
+    echo "  $0 -T 10               # Tune this driver's iperf profile, 10s per setting (golden unit)"
     echo "  $0 -s                  # Empty -s uses solo (default)"
     echo ""
     exit 0
@@ -168,6 +242,17 @@ IPERF_DURATION=120  # Default to l2 (120 seconds)
 IPERF_INTERVAL=1    # Default interval (changed to 1 second for detailed logging)
 BAND_PRIORITY="ax"  # Default to 5G first
 SSID_GROUP="solo"   # Default to solo group
+IPERF_PORT=""       # Empty: fixed per-band server ports (5001/5002)
+QC_MARKERS=${QC_MARKERS:-0}  # 1: print @@QC marker lines
+EARLY_ABORT_PERCENT=0    # abort an attempt below this % of the threshold ... (0 = never)
+EARLY_ABORT_INTERVALS=10 # ... for this many consecutive iperf intervals
+ADAPTIVE_MIN_S=0         # adaptive duration: minimum seconds per attempt (0 = off, full duration)
+ADAPTIVE_CONFIDENCE=99   # ... one-sided confidence of the lower bound
+RECONNECT_MODE=fast      # fast = wpa_cli on a running wpa_supplicant, legacy = restart it
+RF_SAMPLE_S=0            # RF sample period during iperf in seconds (0 = off)
+RF_SAMPLE_MS=0           # the same period in milliseconds, for numeric tests
+IPERF_PROFILE=wifi_grp/iperf_profile.conf  # "<driver> <band> <streams> <window> <length>" lines
+TUNE_SECONDS=0           # tuning mode: seconds per iperf run (0 = normal test)
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -285,6 +370,83 @@ while [[ $# -gt 0 ]]; do
                 shift 2
             fi
             ;;
+        -p|--port)
+            if [[ ! "$2" =~ ^[0-9]+$ ]] || [ "$2" -lt 1 ] || [ "$2" -gt 65535 ]; then
+                echo "Error: Invalid iperf server port: $2"
+                echo "Use -h for help"
+                exit 1
+            fi
+            IPERF_PORT=$2
+            echo "Using iperf server port: $2"
+            shift 2
+            ;;
+        -m|--markers)
+            QC_MARKERS=1
+            shift
+            ;;
+        -a|--abort)
+            if [[ ! "$2" =~ ^([0-9]+)(:([0-9]+))?$ ]] || [ "${BASH_REMATCH[1]}" -gt 100 ] || [ "${BASH_REMATCH[3]:-1}" -lt 1 ]; then
+                echo "Error: Invalid early abort policy: $2 (use PERCENT[:INTERVALS], e.g. 50:10, or 0)"
+                echo "Use -h for help"
+                exit 1
+            fi
+            EARLY_ABORT_PERCENT=${BASH_REMATCH[1]}
+            EARLY_ABORT_INTERVALS=${BASH_REMATCH[3]:-$EARLY_ABORT_INTERVALS}
+            shift 2
+            ;;
+        -A|--adaptive)
+            if [[ ! "$2" =~ ^([0-9]+)(:(90|95|99|99\.9))?$ ]]; then
+                echo "Error: Invalid adaptive duration: $2 (use MIN_SECONDS[:90|95|99|99.9], e.g. 20:99, or 0)"
+                echo "Use -h for help"
+                exit 1
+            fi
+            ADAPTIVE_MIN_S=${BASH_REMATCH[1]}
+            ADAPTIVE_CONFIDENCE=${BASH_REMATCH[3]:-$ADAPTIVE_CONFIDENCE}
+            shift 2
+            ;;
+        -r|--reconnect)
+            if [ "$2" != "fast" ] && [ "$2" != "legacy" ]; then
+                echo "Error: Invalid reconnect mode: $2 (use fast or legacy)"
+                echo "Use -h for help"
+                exit 1
+            fi
+            RECONNECT_MODE=$2
+            shift 2
+            ;;
+        -T|--tune)
+            if [[ ! "$2" =~ ^[0-9]+$ ]] || [ "$2" -lt 2 ]; then
+                echo "Error: Invalid tuning run length: $2 (use seconds, at least 2)"
+                echo "Use -h for help"
+                exit 1
+            fi
+            TUNE_SECONDS=$2
+            shift 2
+            ;;
+        -f|--profile)
+            if [ -z "$2" ]; then
+                echo "Error: -f needs a profile file"
+                echo "Use -h for help"
+                exit 1
+            fi
+            IPERF_PROFILE=$2
+            shift 2
+            ;;
+        -R|--rf-sample)
+            if [[ ! "$2" =~ ^[0-9]+(\.[0-9]+)?$ ]]; then
+                echo "Error: Invalid RF sample period: $2 (use seconds, e.g. 1 or 0.5, or 0)"
+                echo "Use -h for help"
+                exit 1
+            fi
+            RF_SAMPLE_MS=$(awk -v s="$2" 'BEGIN { printf "%d", s * 1000 }')
+            # each sample forks iwconfig, so keep it from spinning next to iperf
+            if [ "$RF_SAMPLE_MS" -gt 0 ] && [ "$RF_SAMPLE_MS" -lt 100 ]; then
+                echo "Error: RF sample period $2 is below 0.1 s"
+                echo "Use -h for help"
+                exit 1
+            fi
+            RF_SAMPLE_S=$2
+            shift 2
+            ;;
         *)
             echo "Error: Unknown parameter: $1"
             echo "Use -h for help"
@@ -293,6 +455,27 @@ while [[ $# -gt 0 ]]; do
     esac
 done
 
+# Print one machine-readable marker line: @@QC <event> key=value ... t=<DUT uptime seconds>
+# Events: begin/end (phase=wifi|5G|2.4G), attempt (one iperf run), verdict (test=wifi)
+qc_marker() {
+    [ "$QC_MARKERS" = "1" ] || return 0
+    local up rest
+    read -r up rest </proc/uptime
+    echo "@@QC $* t=$up"
+}
+
+QC_VERDICT_SENT=0
+qc_verdict() {
+    QC_VERDICT_SENT=1
+    qc_marker verdict test=wifi result=$1
+}
+RF_PID=""
+# Early exits (no interface, missing config, ...) still end with a verdict marker; an
+# interrupted run (GUI Terminate = Ctrl+C) also stops the background RF sampler.
+trap '[ -n "$RF_PID" ] && kill $RF_PID 2>/dev/null; [ "$QC_VERDICT_SENT" = "1" ] || qc_verdict FAIL' EXIT
+trap 'exit 130' INT
+trap 'exit 143' TERM
+
 # Set WiFi configuration files based on SSID group
 case "$SSID_GROUP" in
     "solo")
@@ -317,6 +500,34 @@ echo "  Band Priority: $BAND_PRIORITY ($([ "$BAND_PRIORITY" = "ax" ] && echo "5G
 echo "  SSID Group: $SSID_GROUP"
 echo "  5G Config: $WIFI_5G_CONF"
 echo "  2.4G Config: $WIFI_24G_CONF"
+if [ "$EARLY_ABORT_PERCENT" -gt 0 ]; then
+    echo "  Early Abort: below ${EARLY_ABORT_PERCENT}% of the threshold for $EARLY_ABORT_INTERVALS intervals"
+else
+    echo "  Early Abort: off"
+fi
+# z^2 * 100 of the one-sided normal quantile for the adaptive lower bound
+case "$ADAPTIVE_CONFIDENCE" in
+    90) ADAPTIVE_Z2=164 ;;
+    95) ADAPTIVE_Z2=271 ;;
+    99.9) ADAPTIVE_Z2=955 ;;
+    *) ADAPTIVE_Z2=541 ;;
+esac
+if [ "$ADAPTIVE_MIN_S" -gt 0 ]; then
+    echo "  Adaptive Duration: on (min $ADAPTIVE_MIN_S s, ${ADAPTIVE_CONFIDENCE}% confidence)"
+else
+    echo "  Adaptive Duration: off"
+fi
+echo "  Reconnect: $RECONNECT_MODE"
+echo "  iperf Profile: $IPERF_PROFILE"
+if [ "$TUNE_SECONDS" -gt 0 ]; then
+    echo "  Mode: tuning ($TUNE_SECONDS s per iperf run)"
+fi
+if [ "$RF_SAMPLE_MS" -eq 0 ]; then
+    RF_SAMPLE_S=0
+    echo "  RF Sampling: off"
+else
+    echo "  RF Sampling: every $RF_SAMPLE_S s during iperf"
+fi
 echo ""
 
 CPUBURN=no
@@ -324,6 +535,11 @@ RETRY=no
 IPERF_SERVER=192.168.200.2
 IPERF_PORT_5G=5001    # Port for 5G band tests
 IPERF_PORT_24G=5002   # Port for 2.4G band tests
+if [ -n "$IPERF_PORT" ]; then
+    # A port leased from the iperf server pool serves both bands of this DUT.
+    IPERF_PORT_5G=$IPERF_PORT
+    IPERF_PORT_24G=$IPERF_PORT
+fi
 WIFI_DRV=wlan
 IFACE=wlan0
 #NETWORK_MANAGER=connmanctl
@@ -334,10 +550,28 @@ IFACE=wlan0
 THROUGHPUT_5G_LIMIT=50  # 50M for 5G band
 THROUGHPUT_24G_LIMIT=10 # 15M for 2.4G band
 MAX_ATTEMPTS=3
+# iperf client settings without a profile entry for the driver/band
+DEFAULT_IPERF_PARALLEL=3
+DEFAULT_IPERF_WINDOW=128k
+DEFAULT_IPERF_LENGTH=24000
+# tuning sweep (-T), one parameter at a time in this order; at least 2 streams, since
+# iperf2 prints no [SUM] lines for -P 1
+TUNE_PARALLEL="2 3 4 6 8"
+TUNE_WINDOW="64k 128k 256k 512k"
+TUNE_LENGTH="8000 16000 24000 64000"
+WPA_CTRL_DIR=/var/run/wpa_supplicant
+WPA_CONNECT_TIMEOUT_S=15  # fast path: wait for wpa_state=COMPLETED
+DHCP_TRIES=10            # fast path: udhcpc discover attempts, 1 s apart
 
 # Global variables
 CURRENT_BAND=""
 CURRENT_THROUGHPUT_LIMIT=0
+WPA_LOADED_CONF=""  # config whose networks the running wpa_supplicant has (fast path)
+CONNECT_MS=0        # last connect: association time
+IPERF_PARALLEL=$DEFAULT_IPERF_PARALLEL
+IPERF_WINDOW=$DEFAULT_IPERF_WINDOW
+IPERF_LENGTH=$DEFAULT_IPERF_LENGTH
+DHCP_MS=0           # last connect: time to an IP address
 
 PLATFORM=$(tr </sys/firmware/devicetree/base/model '[:upper:]' '[:lower:]')
 case "$PLATFORM" in
@@ -412,6 +646,127 @@ is_ipget() {
         return 1
 }
 
+# Milliseconds since boot (/proc/uptime has 1/100 s)
+uptime_ms() {
+        local up rest
+        read -r up rest </proc/uptime
+        echo $(( ${up%.*} * 1000 + 10#${up#*.} * 10 ))
+}
+
+ms_text() {
+        printf "%d.%02d" $(($1 / 1000)) $(($1 % 1000 / 10))
+}
+
+wpa_ctrl() {
+        wpa_cli -p $WPA_CTRL_DIR -i $IFACE "$@" 2>/dev/null
+}
+
+# "key value" lines of the network={} blocks in a wpa_supplicant config, "network" per block
+wpa_conf_networks() {
+        awk '/^[ \t]*network[ \t]*=[ \t]*\{/ { inb = 1; print "network"; next }
+             inb && /^[ \t]*\}/ { inb = 0; next }
+             inb { sub(/^[ \t]+/, ""); if ($0 == "" || $0 ~ /^#/) next
+                   k = $0; sub(/=.*/, "", k); v = $0; sub(/^[^=]*=/, "", v); print k " " v }' "$1"
+}
+
+# Fast path: one wpa_supplicant stays up; a band switch replaces its networks and a
+# reconnect re-associates, both through wpa_cli. Returns 1 when the AP is not
+# associated within WPA_CONNECT_TIMEOUT_S, 3 when the control interface is not usable.
+wpa_fast_connect() {
+        local config_file=$1 i id key value
+        command -v wpa_cli >/dev/null 2>&1 || return 3
+        
+        if [ "$(wpa_ctrl ping)" != "PONG" ]; then
+                # Started without a control socket (reset / legacy path): restart it once with one
+                pid=$(ps | grep "wpa_supplicant" | grep -v "grep" | awk '{print $1}')
+                if [ -n "$pid" ]; then
+                        kill $pid > /dev/null 2>&1
+                        for i in $(seq 1 20); do
+                                ps | grep "wpa_supplicant" | grep -qv "grep" || break
+                                usleep 100000
+                        done
+                fi
+                ifconfig $IFACE up > /dev/null 2>&1
+                wpa_supplicant ${WPADRI} -i $IFACE -c $config_file -C $WPA_CTRL_DIR -B -q >/dev/null 2>&1
+                for i in $(seq 1 20); do
+                        [ "$(wpa_ctrl ping)" = "PONG" ] && break
+                        usleep 100000
+                done
+                [ "$(wpa_ctrl ping)" = "PONG" ] || return 3
+                WPA_LOADED_CONF=$config_file
+        elif [ "$WPA_LOADED_CONF" != "$config_file" ]; then
+                # Band switch: load the networks of the new config
+                wpa_ctrl remove_network all >/dev/null
+                while read -r key value; do
+                        if [ "$key" = "network" ]; then
+                                id=$(wpa_ctrl add_network)
+                        elif [ "$(wpa_ctrl set_network $id $key "$value")" != "OK" ]; then
+                                echo "  Warning: wpa_cli could not set $key from $config_file"
+                        fi
+                done < <(wpa_conf_networks "$config_file")
+                wpa_ctrl enable_network all >/dev/null
+                wpa_ctrl reassociate >/dev/null
+                WPA_LOADED_CONF=$config_file
+        else
+                # Same band: drop the association and connect again
+                wpa_ctrl disconnect >/dev/null
+                wpa_ctrl reconnect >/dev/null
+        fi
+        
+        for i in $(seq 1 $((WPA_CONNECT_TIMEOUT_S * 10))); do
+                wpa_ctrl status | grep -q "^wpa_state=COMPLETED" && return 0
+                usleep 100000
+        done
+        return 1
+}
+
+# Fast path DHCP: keep a present address, otherwise run udhcpc until it has a lease
+fast_ipget() {
+        [ -n "$(getipaddr)" ] && return 0
+        killall udhcpc >/dev/null 2>&1
+        udhcpc -i $IFACE -n -q -t $DHCP_TRIES -T 1 >/dev/null 2>&1
+        [ -n "$(getipaddr)" ]
+}
+
+# Connect to the AP of a config and make sure there is an IP address; logs and sets
+# CONNECT_MS / DHCP_MS. Returns 1 when the AP link fails, 2 without an IP address.
+connect_wifi() {
+        local config_file=$1 t0 t1 rc=1
+        t0=$(uptime_ms)
+        if [ "$RECONNECT_MODE" = "fast" ]; then
+                wpa_fast_connect "$config_file"
+                rc=$?
+                if [ $rc -eq 3 ]; then
+                        echo "  wpa_supplicant control interface not available - using the legacy reconnect"
+                        RECONNECT_MODE=legacy
+                        WPA_LOADED_CONF=""
+                        disconnect
+                fi
+        fi
+        if [ "$RECONNECT_MODE" = "legacy" ]; then
+                ( is_ap_connected "$config_file" )
+                rc=$?
+        fi
+        t1=$(uptime_ms)
+        CONNECT_MS=$((t1 - t0))
+        DHCP_MS=0
+        if [ $rc -ne 0 ]; then
+                echo "  Connect time: $(ms_text $CONNECT_MS) s (no link, $RECONNECT_MODE)"
+                return 1
+        fi
+        
+        if [ "$RECONNECT_MODE" = "fast" ]; then
+                fast_ipget
+        else
+                ( is_ipget )
+        fi
+        rc=$?
+        DHCP_MS=$(( $(uptime_ms) - t1 ))
+        echo "  Connect time: $(ms_text $CONNECT_MS) s, DHCP: $(ms_text $DHCP_MS) s ($RECONNECT_MODE)"
+        [ $rc -eq 0 ] || return 2
+        return 0
+}
+
 led_on() {
         if [ -f /sys/class/leds/status/brightness ]; then
                 echo 1 >/sys/class/leds/status/brightness
@@ -473,6 +828,271 @@ get_rssi() {
         fi
 }
 
+# Background sampler for -R: "@@QC rf" lines with the signal level and link quality from
+# /proc/net/wireless (read without forking) and the bit rate from iwconfig; ms = since iperf start.
+# It ignores SIGINT as a background job, so it also stops by itself once the script is gone.
+rf_sampler() {
+        local t0=$1 parent=$2 n=0 iface status link level rest rate rssi quality up
+        while kill -0 $parent 2>/dev/null; do
+                n=$((n + 1))
+                rssi=""
+                quality=""
+                while read -r iface status link level rest; do
+                        [ "${iface%:}" = "$IFACE" ] || continue
+                        quality=${link%.}
+                        rssi=${level%.}
+                done 2>/dev/null </proc/net/wireless
+                rate=$(iwconfig $IFACE 2>/dev/null | sed -n 's/.*Bit Rate[=:]\([0-9.]*\).*/\1/p')
+                read -r up rest </proc/uptime
+                echo "@@QC rf phase=$CURRENT_BAND n=$n ms=$(( $(uptime_ms) - t0 )) rssi=${rssi:-NA} quality=${quality:-NA} rate=${rate:-NA} t=$up"
+                sleep $RF_SAMPLE_S
+        done
+}
+
+# Run the iperf client, echo and save its output (/tmp/iperflog) and stop it early
+# when the [SUM] interval throughput stays hopeless (see -a) or, in adaptive mode,
+# as soon as it is clearly above the threshold (see -A).
+# Returns 2 when aborted, 3 on an adaptive stop. Sets IPERF_ACTUAL_S and
+# IPERF_CONFIDENCE (% confidence that the sustained rate exceeds the threshold, adaptive mode).
+run_iperf_monitored() {
+        local iperf_port=$1
+        local fifo=/tmp/iperffifo
+        local floor=$((CURRENT_THROUGHPUT_LIMIT * EARLY_ABORT_PERCENT / 100))
+        local low=0 stop=0 seen=0 line rate t_end=0 max_rate=0
+        local total_intervals=$((IPERF_DURATION / IPERF_INTERVAL))
+        local n=0 sum=0 sumsq=0 d
+        IPERF_ACTUAL_S=0
+        IPERF_CONFIDENCE=""
+        
+        rm -f $fifo
+        mkfifo $fifo
+        iperf -c "$IPERF_SERVER" -p "$iperf_port" -f m -t $IPERF_DURATION -i $IPERF_INTERVAL -P $IPERF_PARALLEL -w $IPERF_WINDOW -l $IPERF_LENGTH >$fifo 2>&1 &
+        local iperf_pid=$!
+        local rf_pid=""
+        if [ "$RF_SAMPLE_MS" -gt 0 ]; then
+                rf_sampler $(uptime_ms) $$ &
+                rf_pid=$!
+                RF_PID=$rf_pid
+        fi
+        
+        exec 3>/tmp/iperflog
+        while IFS= read -r line; do
+                echo "$line"
+                echo "$line" >&3
+                # "[SUM]  3.0- 4.0 sec  10.5 MBytes  88.1 Mbits/sec"; the 0.0-<duration> total has start 0
+                if [ $stop -eq 0 ] && [[ "$line" =~ ^\[SUM\]\ +([0-9.]+)\ *-\ *([0-9.]+)\ sec.*\ ([0-9.]+)\ Mbits/sec ]]; then
+                        rate=${BASH_REMATCH[3]%.*}
+                        rate=${rate:-0}
+                        if [ "${BASH_REMATCH[1]%%.*}" = "0" ] && [ $seen -eq 1 ]; then
+                                continue  # the attempt's total, not an interval
+                        fi
+                        seen=1
+                        t_end=${BASH_REMATCH[2]%.*}
+                        n=$((n + 1))
+                        sum=$((sum + rate))
+                        sumsq=$((sumsq + rate * rate))
+                        [ "$rate" -gt "$max_rate" ] && max_rate=$rate
+                        
+                        if [ "$EARLY_ABORT_PERCENT" -gt 0 ]; then
+                                if [ "$rate" -lt "$floor" ]; then
+                                        low=$((low + 1))
+                                else
+                                        low=0
+                                fi
+                                # Abort only when the attempt cannot pass any more: the rest of it
+                                # at the best interval rate so far still averages below the threshold
+                                if [ $low -ge $EARLY_ABORT_INTERVALS ] && \
+                                   [ $((sum + (total_intervals - n) * max_rate)) -lt $((total_intervals * CURRENT_THROUGHPUT_LIMIT)) ]; then
+                                        echo "    Early abort: [SUM] below $floor MBits/sec (${EARLY_ABORT_PERCENT}% of $CURRENT_THROUGHPUT_LIMIT) for $low consecutive intervals at ${BASH_REMATCH[2]} sec, best case average $(( (sum + (total_intervals - n) * max_rate) / total_intervals )) MBits/sec - stopping iperf"
+                                        stop=2
+                                fi
+                        fi
+                        
+                        # Adaptive stop: lower confidence bound of the interval mean above the threshold,
+                        # i.e. mean - z*sd/sqrt(n) > T  <=>  d > 0 && d^2*(n-1) > z^2*(n*sumsq - sum^2), d = sum - n*T
+                        if [ $stop -eq 0 ] && [ "$ADAPTIVE_MIN_S" -gt 0 ] && [ "$t_end" -ge "$ADAPTIVE_MIN_S" ] && [ $n -ge 3 ]; then
+                                d=$((sum - n * CURRENT_THROUGHPUT_LIMIT))
+                                if [ $d -gt 0 ] && [ $((d * d * (n - 1) * 100)) -gt $((ADAPTIVE_Z2 * (n * sumsq - sum * sum))) ]; then
+                                        stop=3
+                                fi
+                        fi
+                        
+                        if [ $stop -ne 0 ]; then
+                                kill -INT $iperf_pid 2>/dev/null
+                                # SIGINT is ignored by background jobs unless the program handles it: TERM after 2 s
+                                ( sleep 2; kill $iperf_pid 2>/dev/null ) &
+                        fi
+                fi
+        done <$fifo
+        exec 3>&-
+        wait $iperf_pid 2>/dev/null
+        [ -n "$rf_pid" ] && kill $rf_pid 2>/dev/null
+        RF_PID=""
+        rm -f $fifo
+        IPERF_ACTUAL_S=$t_end
+        
+        if [ "$ADAPTIVE_MIN_S" -gt 0 ] && [ $n -ge 2 ]; then
+                # mean, sd, lower bound and the confidence reached (normal CDF, Abramowitz-Stegun 7.1.26)
+                local mean sd lcb
+                read -r mean sd lcb IPERF_CONFIDENCE <<< "$(awk -v n=$n -v s=$sum -v q=$sumsq -v t=$CURRENT_THROUGHPUT_LIMIT -v z2=$ADAPTIVE_Z2 'BEGIN {
+                        m = s / n; v = (q - s * s / n) / (n - 1); if (v < 0) v = 0; se = sqrt(v / n)
+                        z = (se > 0) ? (m - t) / se : ((m > t) ? 9 : -9)
+                        x = (z < 0 ? -z : z) / sqrt(2); k = 1 / (1 + 0.3275911 * x)
+                        erf = 1 - k * (0.254829592 + k * (-0.284496736 + k * (1.421413741 + k * (-1.453152027 + k * 1.061405429)))) * exp(-x * x)
+                        c = 50 * (1 + (z < 0 ? -erf : erf)); if (c > 99.99) c = 99.99
+                        printf("%.1f %.1f %.1f %.2f\n", m, sqrt(v), m - sqrt(z2 / 100) * se, c) }')"
+                if [ $stop -eq 3 ]; then
+                        echo "    Adaptive stop after ${t_end} of $IPERF_DURATION sec: lower ${ADAPTIVE_CONFIDENCE}% bound $lcb MBits/sec > $CURRENT_THROUGHPUT_LIMIT MBits/sec (mean $mean, sd $sd, n=$n, confidence ${IPERF_CONFIDENCE}%)"
+                else
+                        echo "    Adaptive: ran ${t_end} of $IPERF_DURATION sec, lower ${ADAPTIVE_CONFIDENCE}% bound $lcb MBits/sec vs $CURRENT_THROUGHPUT_LIMIT MBits/sec (mean $mean, sd $sd, n=$n, confidence ${IPERF_CONFIDENCE}%)"
+                fi
+        fi
+        
+        [ $stop -eq 0 ] || return $stop
+        return 0
+}
+
+# Set IPERF_PARALLEL / IPERF_WINDOW / IPERF_LENGTH for this driver and band from the
+# profile (last matching line wins); the built-in defaults otherwise
+load_iperf_profile() {
+        local band=$1 drv b p w l rest
+        local source="built-in defaults"
+        IPERF_PARALLEL=$DEFAULT_IPERF_PARALLEL
+        IPERF_WINDOW=$DEFAULT_IPERF_WINDOW
+        IPERF_LENGTH=$DEFAULT_IPERF_LENGTH
+        if [ -f "$IPERF_PROFILE" ]; then
+                while read -r drv b p w l rest; do
+                        [ "$drv" = "$WIFI_DRV" ] && [ "$b" = "$band" ] || continue
+                        if [[ "$p" =~ ^[0-9]+$ ]] && [ "$p" -ge 2 ] && [[ "$w" =~ ^[0-9]+[kKmM]?$ ]] && [[ "$l" =~ ^[0-9]+[kKmM]?$ ]]; then
+                                IPERF_PARALLEL=$p
+                                IPERF_WINDOW=$w
+                                IPERF_LENGTH=$l
+                                source="$IPERF_PROFILE, $WIFI_DRV $band"
+                        else
+                                echo "  Warning: ignoring bad profile line: $drv $b $p $w $l"
+                        fi
+                done < "$IPERF_PROFILE"
+        fi
+        echo "iperf Settings: -P $IPERF_PARALLEL -w $IPERF_WINDOW -l $IPERF_LENGTH ($source)"
+}
+
+# "mean sd n" of the [SUM] interval throughput in /tmp/iperflog (the 0.0-<end> total is skipped)
+iperf_interval_stats() {
+        awk '/^\[SUM\]/ { s = $0; sub(/^\[SUM\] */, "", s); start = s + 0
+                          if (start == 0 && n > 0) next
+                          r = $(NF - 1) + 0; n++; sum += r; sq += r * r }
+             END { if (n == 0) { print "0 0 0"; exit }
+                   v = (n > 1) ? (sq - sum * sum / n) / (n - 1) : 0; if (v < 0) v = 0
+                   printf("%.1f %.1f %d\n", sum / n, sqrt(v), n) }' /tmp/iperflog
+}
+
+# Tuning mode (-T): sweep streams, then window, then buffer length on one band, keeping the
+# best of each before moving on. A setting scores mean - sd of its [SUM] intervals, so a
+# fast but unsteady setting loses to a steady one. Sets TUNED_LINE (profile line) on success.
+tune_band() {
+        local config_file=$1 band=$2 iperf_port=$3
+        local param values value key mean sd n score
+        local best_score=-1 best_p best_w best_l best_stats=""
+        declare -A tried
+        
+        CURRENT_BAND=$band
+        TUNED_LINE=""
+        echo ""
+        echo "=========================================="
+        echo "Tuning $band Band iperf Settings ($WIFI_DRV)"
+        echo "=========================================="
+        echo "Connecting to $band band WiFi..."
+        if ! connect_wifi "$config_file"; then
+                echo -e "\033[0;31mERROR: Failed to connect to $band band WiFi\033[0m"
+                return 1
+        fi
+        echo "Connected successfully. IP address: $(getipaddr), RSSI: $(get_rssi) dBm"
+        
+        load_iperf_profile "$band" >/dev/null
+        best_p=$IPERF_PARALLEL
+        best_w=$IPERF_WINDOW
+        best_l=$IPERF_LENGTH
+        for param in P w l; do
+                case $param in
+                P) values=$TUNE_PARALLEL ;;
+                w) values=$TUNE_WINDOW ;;
+                l) values=$TUNE_LENGTH ;;
+                esac
+                for value in $values; do
+                        IPERF_PARALLEL=$best_p
+                        IPERF_WINDOW=$best_w
+                        IPERF_LENGTH=$best_l
+                        case $param in
+                        P) IPERF_PARALLEL=$value ;;
+                        w) IPERF_WINDOW=$value ;;
+                        l) IPERF_LENGTH=$value ;;
+                        esac
+                        key="$IPERF_PARALLEL $IPERF_WINDOW $IPERF_LENGTH"
+                        [ -n "${tried[$key]}" ] && continue
+                        
+                        run_iperf_monitored "$iperf_port" >/dev/null
+                        read -r mean sd n <<< "$(iperf_interval_stats)"
+                        score=$(awk -v m=$mean -v s=$sd 'BEGIN { printf("%.1f", m - s) }')
+                        tried[$key]=$score
+                        echo "  -P $IPERF_PARALLEL -w $IPERF_WINDOW -l $IPERF_LENGTH: mean $mean sd $sd MBits/sec (n=$n) -> score $score"
+                        if [ "$n" -gt 1 ] && awk -v a=$score -v b=$best_score 'BEGIN { exit !(a > b) }'; then
+                                best_score=$score
+                                best_p=$IPERF_PARALLEL
+                                best_w=$IPERF_WINDOW
+                                best_l=$IPERF_LENGTH
+                                best_stats="mean $mean sd $sd"
+                        fi
+                done
+        done
+        
+        if [ -z "$best_stats" ]; then
+                echo -e "\033[0;31mERROR: No iperf data while tuning $band band\033[0m"
+                return 1
+        fi
+        echo "Best $band setting: -P $best_p -w $best_w -l $best_l ($best_stats, score $best_score MBits/sec)"
+        TUNED_LINE="$WIFI_DRV $band $best_p $best_w $best_l  # tuned $(date +%Y-%m-%d) $best_stats"
+        return 0
+}
+
+# Tuning mode main part: tune both bands and replace this driver's lines in the profile
+tune_iperf_profile() {
+        local band config port lines="" result=0
+        # Every setting gets its full run: no early abort / adaptive stop / RF sampling
+        IPERF_DURATION=$TUNE_SECONDS
+        EARLY_ABORT_PERCENT=0
+        ADAPTIVE_MIN_S=0
+        RF_SAMPLE_S=0
+        RF_SAMPLE_MS=0
+        for band in 5G 2.4G; do
+                if [ "$band" = "5G" ]; then
+                        config=$WIFI_5G_CONF
+                        port=$IPERF_PORT_5G
+                else
+                        config=$WIFI_24G_CONF
+                        port=$IPERF_PORT_24G
+                fi
+                if tune_band "$config" "$band" "$port"; then
+                        lines="$lines$TUNED_LINE"$'\n'
+                else
+                        result=1
+                fi
+        done
+        
+        echo ""
+        if [ -n "$lines" ]; then
+                # Keep the other drivers' lines and this driver's untuned bands
+                {
+                        [ -f "$IPERF_PROFILE" ] && echo "$lines" | awk 'NR == FNR { if (NF) tuned[$1 " " $2] = 1; next }
+                                                                     !(($1 " " $2) in tuned)' - "$IPERF_PROFILE"
+                        printf "%s" "$lines"
+                } > "$IPERF_PROFILE.tmp" && mv "$IPERF_PROFILE.tmp" "$IPERF_PROFILE"
+                echo "iperf profile updated: $IPERF_PROFILE"
+                printf "%s" "$lines" | sed 's/^/  /'
+        fi
+        [ $result -eq 0 ] || echo -e "\033[0;31mTuning incomplete: see the errors above\033[0m"
+        return $result
+}
+
 # Perform a single throughput test
 perform_single_test() {
         local attempt=$1
@@ -493,7 +1113,9 @@ perform_single_test() {
         echo "  Starting iperf test now..."
         
         # Run iperf test with configurable duration and port
-        iperf -c "$IPERF_SERVER" -p "$iperf_port" -f m -t $IPERF_DURATION -i $IPERF_INTERVAL -P 3 -w 128k -l 24000 | tee /tmp/iperflog 2>&1
+        local early_abort=0
+        run_iperf_monitored "$iperf_port"
+        [ $? -eq 2 ] && early_abort=1
         sleep 0.5
         sync
         sleep 0.5
@@ -524,20 +1146,30 @@ perform_single_test() {
                 fi
         fi
         
+        # Hopeless attempt stopped early: fail it without waiting for the full duration
+        if [ $early_abort -eq 1 ]; then
+                echo "    Result: FAILED (${throughput:-0} MBits/sec < $CURRENT_THROUGHPUT_LIMIT MBits/sec, early abort) - RSSI after test: ${rssi_after} dBm"
+                qc_marker attempt phase=$CURRENT_BAND n=$attempt port=$iperf_port mbits=${throughput:-0} rssi=$rssi rssi_after=$rssi_after duration=$IPERF_ACTUAL_S${IPERF_CONFIDENCE:+ confidence=$IPERF_CONFIDENCE} connect_ms=$CONNECT_MS dhcp_ms=$DHCP_MS result=FAIL reason=early_abort
+                return 1
+        fi
+        
         # Handle case where throughput extraction completely fails
         if [ -z "$throughput" ] || [ "$throughput" -eq 0 ]; then
                 echo "    Result: FAILED (No valid throughput data after multiple attempts) - RSSI after test: ${rssi_after} dBm"
                 echo "    Debug: Last 20 lines of iperf log:"
                 tail -n20 </tmp/iperflog | sed 's/^/      /'
+                qc_marker attempt phase=$CURRENT_BAND n=$attempt port=$iperf_port mbits=0 rssi=$rssi rssi_after=$rssi_after duration=$IPERF_ACTUAL_S${IPERF_CONFIDENCE:+ confidence=$IPERF_CONFIDENCE} connect_ms=$CONNECT_MS dhcp_ms=$DHCP_MS result=FAIL reason=nodata
                 return 1
         fi
         
         # Check if throughput meets threshold
         if [ "$throughput" -ge "$CURRENT_THROUGHPUT_LIMIT" ]; then
                 echo "    Result: PASSED ($throughput MBits/sec >= $CURRENT_THROUGHPUT_LIMIT MBits/sec) - RSSI after test: ${rssi_after} dBm"
+                qc_marker attempt phase=$CURRENT_BAND n=$attempt port=$iperf_port mbits=$throughput rssi=$rssi rssi_after=$rssi_after duration=$IPERF_ACTUAL_S${IPERF_CONFIDENCE:+ confidence=$IPERF_CONFIDENCE} connect_ms=$CONNECT_MS dhcp_ms=$DHCP_MS result=PASS
                 return 0
         else
                 echo "    Result: FAILED ($throughput MBits/sec < $CURRENT_THROUGHPUT_LIMIT MBits/sec) - RSSI after test: ${rssi_after} dBm"
+                qc_marker attempt phase=$CURRENT_BAND n=$attempt port=$iperf_port mbits=$throughput rssi=$rssi rssi_after=$rssi_after duration=$IPERF_ACTUAL_S${IPERF_CONFIDENCE:+ confidence=$IPERF_CONFIDENCE} connect_ms=$CONNECT_MS dhcp_ms=$DHCP_MS result=FAIL
                 return 1
         fi
 }
@@ -556,94 +1188,107 @@ test_band() {
         echo "=========================================="
         echo "Starting $band Band Test"
         echo "=========================================="
+        qc_marker begin phase=$band limit=$threshold port=$iperf_port
         
         # Display connection info before testing
         display_wifi_info "$config_file" "$band" "$threshold"
+        load_iperf_profile "$band"
         
-        # Disconnect any existing connection
-        disconnect
+        # Disconnect any existing connection (the fast path switches networks in place)
+        [ "$RECONNECT_MODE" = "fast" ] || disconnect
         
         
         # Connect to the AP
         echo "Connecting to $band band WiFi..."
-        if ( is_ap_connected "$config_file" ); then
-                if ( is_ipget ); then
-                        echo "Connected successfully. IP address: $(getipaddr)"
-                        
+        connect_wifi "$config_file"
+        local connect_rc=$?
+        if [ $connect_rc -eq 0 ]; then
+                echo "Connected successfully. IP address: $(getipaddr)"
+                
+                if [ "$RECONNECT_MODE" != "fast" ]; then
                         # Wait for driver to properly update connection information
                         echo "Waiting for connection to stabilize..."
                         sleep 0.5
-                        
-                        # Display updated connection info
-                        #echo ""
-                        #echo "Connection established:"
-                        #iwconfig $IFACE 2>/dev/null | grep -E "ESSID|Frequency|Bit Rate|Link Quality|Signal level"
-                        #echo ""
-                        
-                        # Perform up to 3 throughput tests (early exit on first pass)
-                        local passed_tests=0
-                        local failed_tests=0
-                        local test_passed=0
-                        
-                        echo "Performing throughput tests (up to $MAX_ATTEMPTS attempts, early exit on pass):"
-                        for attempt in $(seq 1 $MAX_ATTEMPTS); do
-                                if perform_single_test $attempt $iperf_port; then
-                                        passed_tests=$((passed_tests + 1))
-                                        test_passed=1
-                                        echo "  Test passed on attempt $attempt - skipping remaining attempts"
-                                        break  # Exit early on first pass
-                                else
-                                        failed_tests=$((failed_tests + 1))
-                                        if [ $attempt -lt $MAX_ATTEMPTS ]; then
-                                                echo "  Attempt $attempt failed - reconnecting WiFi for next attempt"
+                fi
+                
+                # Display updated connection info
+                #echo ""
+                #echo "Connection established:"
+                #iwconfig $IFACE 2>/dev/null | grep -E "ESSID|Frequency|Bit Rate|Link Quality|Signal level"
+                #echo ""
+                
+                # Perform up to 3 throughput tests (early exit on first pass)
+                local passed_tests=0
+                local failed_tests=0
+                local test_passed=0
+                
+                echo "Performing throughput tests (up to $MAX_ATTEMPTS attempts, early exit on pass):"
+                for attempt in $(seq 1 $MAX_ATTEMPTS); do
+                        if perform_single_test $attempt $iperf_port; then
+                                passed_tests=$((passed_tests + 1))
+                                test_passed=1
+                                echo "  Test passed on attempt $attempt - skipping remaining attempts"
+                                break  # Exit early on first pass
+                        else
+                                failed_tests=$((failed_tests + 1))
+                                if [ $attempt -lt $MAX_ATTEMPTS ]; then
+                                        echo "  Attempt $attempt failed - reconnecting WiFi for next attempt"
+                                        if [ "$RECONNECT_MODE" != "fast" ]; then
                                                 echo "  Disconnecting from $band band..."
                                                 disconnect
                                                 sleep 2
-                                                
-                                                echo "  Reconnecting to $band band..."
-                                                if ( is_ap_connected "$config_file" ); then
-                                                        if ( is_ipget ); then
-                                                                echo "  Reconnected successfully. IP address: $(getipaddr)"
-                                                                sleep 1
-                                                        else
-                                                                echo "  ERROR: Failed to get IP address after reconnection"
-                                                                echo "  Continuing to next attempt anyway..."
-                                                                sleep 1
-                                                        fi
-                                                else
-                                                        echo "  ERROR: Failed to reconnect to WiFi"
-                                                        echo "  Continuing to next attempt anyway..."
-                                                        sleep 1
-                                                fi
                                         fi
+                                        
+                                        echo "  Reconnecting to $band band..."
+                                        connect_wifi "$config_file"
+                                        case $? in
+                                        0)
+                                                echo "  Reconnected successfully. IP address: $(getipaddr)"
+                                                [ "$RECONNECT_MODE" = "fast" ] || sleep 1
+                                                ;;
+                                        2)
+                                                echo "  ERROR: Failed to get IP address after reconnection"
+                                                echo "  Continuing to next attempt anyway..."
+                                                sleep 1
+                                                ;;
+                                        *)
+                                                echo "  ERROR: Failed to reconnect to WiFi"
+                                                echo "  Continuing to next attempt anyway..."
+                                                sleep 1
+                                                ;;
+                                        esac
                                 fi
-                        done
-                        
-                        # Display final WiFi connection status
-                        echo ""
-                        echo "Final WiFi Connection Status:"
-                        iwconfig $IFACE 2>/dev/null | grep -E "ESSID|Frequency|Bit Rate|Link Quality|Signal level"
-                        
-                        # Evaluate results
-                        echo ""
-                        echo "Test Summary for $band Band:"
-                        echo "  Passed: $passed_tests"
-                        echo "  Failed: $failed_tests"
-                        echo "  Total Attempts: $((passed_tests + failed_tests))"
-                        
-                        if [ $test_passed -eq 1 ]; then
-                                echo -e "  \033[0;32mOVERALL RESULT: PASSED\033[0m (At least one test met threshold)"
-                                return 0
-                        else
-                                echo -e "  \033[0;31mOVERALL RESULT: FAILED\033[0m (All $MAX_ATTEMPTS attempts failed)"
-                                return 1
                         fi
+                done
+                
+                # Display final WiFi connection status
+                echo ""
+                echo "Final WiFi Connection Status:"
+                iwconfig $IFACE 2>/dev/null | grep -E "ESSID|Frequency|Bit Rate|Link Quality|Signal level"
+                
+                # Evaluate results
+                echo ""
+                echo "Test Summary for $band Band:"
+                echo "  Passed: $passed_tests"
+                echo "  Failed: $failed_tests"
+                echo "  Total Attempts: $((passed_tests + failed_tests))"
+                
+                if [ $test_passed -eq 1 ]; then
+                        echo -e "  \033[0;32mOVERALL RESULT: PASSED\033[0m (At least one test met threshold)"
+                        qc_marker end phase=$band result=PASS attempts=$((passed_tests + failed_tests))
+                        return 0
                 else
-                        echo -e "\033[0;31mERROR: Failed to get IP address for $band band\033[0m"
+                        echo -e "  \033[0;31mOVERALL RESULT: FAILED\033[0m (All $MAX_ATTEMPTS attempts failed)"
+                        qc_marker end phase=$band result=FAIL attempts=$((passed_tests + failed_tests))
                         return 1
                 fi
+        elif [ $connect_rc -eq 2 ]; then
+                echo -e "\033[0;31mERROR: Failed to get IP address for $band band\033[0m"
+                qc_marker end phase=$band result=FAIL attempts=0 reason=ip
+                return 1
         else
                 echo -e "\033[0;31mERROR: Failed to connect to $band band WiFi\033[0m"
+                qc_marker end phase=$band result=FAIL attempts=0 reason=connect
                 return 1
         fi
 }
@@ -705,6 +1350,8 @@ reset_wifi_connection() {
 # Main execution
 main() {
 
+        qc_marker begin phase=wifi duration=$IPERF_DURATION priority=$BAND_PRIORITY ssid=$SSID_GROUP
+
         # Stop existing processes after interface check
         stop_existing_processes
 
@@ -785,6 +1432,16 @@ main() {
                 echo "Current IP ($current_ip) is already in correct network range"
         fi
         
+        if [ "$TUNE_SECONDS" -gt 0 ]; then
+                # Tuning is not a unit test: no verdict marker
+                QC_VERDICT_SENT=1
+                tune_iperf_profile
+                local tune_result=$?
+                disconnect
+                led_off
+                exit $tune_result
+        fi
+        
         local overall_result=0
         
         # Test bands based on priority setting
@@ -797,9 +1454,11 @@ main() {
                         overall_result=1
                 fi
                 
-                # Disconnect before testing next band
-                disconnect
-                sleep 1
+                # Disconnect before testing next band (the fast path switches in place)
+                if [ "$RECONNECT_MODE" != "fast" ]; then
+                        disconnect
+                        sleep 1
+                fi
                 
                 # Test 5G band second
                 if test_band "$WIFI_5G_CONF" "5G" "$THROUGHPUT_5G_LIMIT" "$IPERF_PORT_5G"; then
@@ -816,9 +1475,11 @@ main() {
                         overall_result=1
                 fi
                 
-                # Disconnect before testing next band
-                disconnect
-                sleep 1
+                # Disconnect before testing next band (the fast path switches in place)
+                if [ "$RECONNECT_MODE" != "fast" ]; then
+                        disconnect
+                        sleep 1
+                fi
                 
                 # Test 2.4G band second
                 if test_band "$WIFI_24G_CONF" "2.4G" "$THROUGHPUT_24G_LIMIT" "$IPERF_PORT_24G"; then
@@ -851,9 +1512,13 @@ main() {
         
         if [ $overall_result -eq 0 ]; then
             echo "WiFi Test Result: PASSED"
+            qc_marker end phase=wifi result=PASS elapsed=$elapsed_seconds
+            qc_verdict PASS
             echo "All WiFi validation tests completed successfully."
         else
             echo "WiFi Test Result: FAILED"
+            qc_marker end phase=wifi result=FAIL elapsed=$elapsed_seconds
+            qc_verdict FAIL
             echo "One or more WiFi validation tests failed."
             echo "Please check the test output above for details."
         fi
@@ -8,6 +8,59 @@ Description: UART-based WiFi throughput test tool for QCA9377 on SoM platforms.
 
 Change Log:
 -----------
+2026-10-19: WiFi + BT Coexistence Mode
+  - New BT priority "WiFi+BT": runs coex_test.sh on the DUT, which starts
+    bt_ping.sh in the background as soon as iperf starts
+  - SerialWorker splits the "[WIFI] " / "[BT] " tagged lines into the WiFi and
+    BT streams and judges each on its own; the saved log keeps the WiFi output
+    followed by the BT output, as in the sequential modes
+
+2026-10-19: RF Samples in the Throughput Chart
+  - With --rf-sample SECONDS (or WIFI_RF_SAMPLE) the tool runs wifi_test.sh
+    -R SECONDS; its "@@QC rf" samples (RSSI, link quality, bit rate) are kept
+    in the saved log and the chart draws the RSSI next to the throughput
+  - Each throughput interval keeps the lowest RSSI sampled in it, so an RF dip
+    lines up with the throughput dip it caused
+
+2026-10-19: Adaptive Test Duration
+  - With --adaptive MIN[:CONF] (or WIFI_ADAPTIVE) the tool runs wifi_test.sh
+    -A MIN[:CONF]: an iperf attempt stops after at least MIN seconds once the
+    lower CONF% confidence bound of its throughput clears the band threshold
+
+2026-10-19: Early Abort Switch
+  - With --early-abort PCT[:N] (or WIFI_EARLY_ABORT) the tool runs wifi_test.sh
+    -a PCT[:N]; the DUT script no longer aborts by default
+
+2026-10-19: Live Throughput Chart
+  - SerialWorker parses the iperf [SUM] interval lines and the band's
+    "Throughput Threshold" line; a chart under Test Status plots the interval
+    throughput against the band limit while the test runs
+  - Fixed-size ring buffer (CHART_POINTS samples); runs longer than the widget
+    is wide are drawn as per-pixel min/max; repaint capped at CHART_FPS
+
+2026-10-19: Machine-readable Test Markers
+  - With --qc-markers (or QC_MARKERS=1) the tool runs wifi_test.sh -m and
+    bt_ping.sh -m, which print "@@QC <event> key=value ..." lines
+  - SerialWorker dispatches the markers through a handler dict; the WiFi/BT
+    verdicts come from the verdict markers instead of the human result lines
+  - Band begin/attempt/end markers update the WiFi status label; marker lines
+    stay in the saved log but are not shown in the log view
+
+2026-10-19: Server-side Throughput in the Saved Log
+  - Tails the iperf2 server logs (/var/log/iperf2-server-*.log, or the glob in
+    IPERF_SERVER_LOGS) while the GUI runs (iperf_server_log.py)
+  - save_log() adds an "iperf Server-side Throughput" section: each iperf
+    attempt's DUT [SUM] next to the rate the server received from the DUT IP,
+    with stalls and DUT/server mismatches flagged
+
+2026-10-19: iperf Server Pool Lease
+  - With --iperf-pool HOST:PORT (or IPERF_POOL) each test leases its own iperf
+    server port from iperf_pool.py and runs wifi_test.sh -p <port>
+  - SerialWorker leases and releases the port in its own thread, so an
+    unreachable pool never freezes the window; the lease is released when the
+    test completes or the window closes
+  - Pool unreachable / exhausted: falls back to the fixed 5001/5002 servers
+
 2026-01-02: Log Filename Format Enhancement
   - Modified log filename format to support dual MAC addresses
   - Format changed from: DATE_TIME_SN_MAC_RESULT.txt
@@ -68,11 +121,26 @@ def parse_startup_options(argv):
       - Environment variable: WIFI_STATION=STA-A|STA-B|SOLO
       - CLI argument: --station STA-A|STA-B|SOLO
       - CLI argument: --station=STA-A|STA-B|SOLO
+      - Environment variable: IPERF_POOL=HOST:PORT (iperf_pool.py lease socket)
+      - CLI argument: --iperf-pool HOST:PORT / --iperf-pool=HOST:PORT
+      - Environment variable: QC_MARKERS=1 (scripts on the DUT support -m)
+      - CLI argument: --qc-markers
+      - Environment variable: WIFI_ADAPTIVE=MIN[:CONF] (wifi_test.sh -A)
+      - CLI argument: --adaptive MIN[:CONF] / --adaptive=MIN[:CONF]
+      - Environment variable: WIFI_RF_SAMPLE=SECONDS (wifi_test.sh -R)
+      - CLI argument: --rf-sample SECONDS / --rf-sample=SECONDS
+      - Environment variable: WIFI_EARLY_ABORT=PCT[:N] (wifi_test.sh -a)
+      - CLI argument: --early-abort PCT[:N] / --early-abort=PCT[:N]
 
     Returns:
-      (startup_station, qt_argv)
+      (startup_station, iperf_pool, qc_markers, adaptive, rf_sample, early_abort, qt_argv)
     """
     station_raw = os.environ.get("WIFI_STATION", "")
+    iperf_pool_addr = os.environ.get("IPERF_POOL", "")
+    qc_markers = os.environ.get("QC_MARKERS", "") == "1"
+    adaptive = os.environ.get("WIFI_ADAPTIVE", "")
+    rf_sample = os.environ.get("WIFI_RF_SAMPLE", "")
+    early_abort = os.environ.get("WIFI_EARLY_ABORT", "")
 
     qt_argv = [argv[0]] if argv else []
     i = 1
@@ -92,10 +160,80 @@ def parse_startup_options(argv):
                 i += 1
             continue
 
+        if isinstance(arg, str) and arg.startswith("--iperf-pool="):
+            iperf_pool_addr = arg.split("=", 1)[1]
+            i += 1
+            continue
+
+        if arg == "--iperf-pool":
+            if i + 1 < len(argv):
+                iperf_pool_addr = argv[i + 1]
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if arg == "--qc-markers":
+            qc_markers = True
+            i += 1
+            continue
+
+        if isinstance(arg, str) and arg.startswith("--adaptive="):
+            adaptive = arg.split("=", 1)[1]
+            i += 1
+            continue
+
+        if arg == "--adaptive":
+            if i + 1 < len(argv):
+                adaptive = argv[i + 1]
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if isinstance(arg, str) and arg.startswith("--rf-sample="):
+            rf_sample = arg.split("=", 1)[1]
+            i += 1
+            continue
+
+        if arg == "--rf-sample":
+            if i + 1 < len(argv):
+                rf_sample = argv[i + 1]
+                i += 2
+            else:
+                i += 1
+            continue
+
+        if isinstance(arg, str) and arg.startswith("--early-abort="):
+            early_abort = arg.split("=", 1)[1]
+            i += 1
+            continue
+
+        if arg == "--early-abort":
+            if i + 1 < len(argv):
+                early_abort = argv[i + 1]
+                i += 2
+            else:
+                i += 1
+            continue
+
         qt_argv.append(arg)
         i += 1
 
-    return _normalize_startup_station(station_raw), qt_argv
+    adaptive = adaptive.strip()
+    if adaptive and not ADAPTIVE_RE.match(adaptive):
+        print(f"Ignoring adaptive duration {adaptive!r} (use MIN_SECONDS[:90|95|99|99.9])", file=sys.stderr)
+        adaptive = ""
+    rf_sample = rf_sample.strip()
+    if rf_sample and (not RF_SAMPLE_RE.match(rf_sample) or 0 < float(rf_sample) < 0.1):
+        print(f"Ignoring RF sample period {rf_sample!r} (use seconds, e.g. 1 or 0.5, min 0.1)", file=sys.stderr)
+        rf_sample = ""
+    early_abort = early_abort.strip()
+    if early_abort and not EARLY_ABORT_RE.match(early_abort):
+        print(f"Ignoring early abort policy {early_abort!r} (use PERCENT[:INTERVALS], e.g. 50:10)", file=sys.stderr)
+        early_abort = ""
+    return (_normalize_startup_station(station_raw), iperf_pool_addr.strip(), qc_markers, adaptive, rf_sample,
+            early_abort, qt_argv)
 
 import sys
 import os
@@ -103,17 +241,55 @@ import serial
 import serial.tools.list_ports
 import shutil
 import subprocess
+from array import array
 from datetime import datetime
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QComboBox, QPushButton, 
                              QTextEdit, QLineEdit, QGroupBox, QGridLayout,
                              QSizePolicy, QDialog)
-from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt
-from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap
+from PyQt5.QtCore import QThread, pyqtSignal, QTimer, Qt, QPointF, QLineF
+from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QPainter, QPen
 from PyQt5.QtSvg import QSvgWidget
+import math
 import re
 import time
 
+import iperf_pool
+import iperf_server_log
+
+# wifi_test.sh / bt_ping.sh -m: "@@QC <event> key=value ... t=<DUT uptime>"
+QC_MARKER_PREFIX = "@@QC "
+# Human result lines, used when the scripts run without markers
+RESULT_LINES = {"wifi": "WiFi Test Result:", "bt": "Bluetooth Test Result:"}
+# coex_test.sh output: "[WIFI] <wifi_test.sh line>", "[BT] <bt_ping.sh line>", "[COEX] done ..."
+COEX_TAG_RE = re.compile(r"^\[(WIFI|BT|COEX)\] ?(.*)$", re.S)
+COEX_TAIL_S = 5.0  # both verdicts in: wait this long for "[COEX] done" (trailing output)
+IPERF_POOL_CLOSE_TIMEOUT_S = 0.5  # window closing during a test: give the port back, but do not hang
+
+# iperf client (-f m -P 3) interval sum: "[SUM]  3.0- 4.0 sec  10.5 MBytes  88.1 Mbits/sec"
+SUM_INTERVAL_RE = re.compile(r"\[SUM\]\s+([\d.]+)\s*-\s*([\d.]+) sec\s+\S+ \w?Bytes\s+([\d.]+) Mbits/sec")
+BAND_INFO_RE = re.compile(r"WiFi Connection Information - (\S+) Band")
+THRESHOLD_RE = re.compile(r"Throughput Threshold: (\d+(?:\.\d+)?) MBits/sec")
+CHART_POINTS = 3600  # samples kept per band (1 hour at -i 1)
+CHART_FPS = 5  # chart repaints per second at most
+ADAPTIVE_RE = re.compile(r"^\d+(:(90|95|99|99\.9))?$")  # wifi_test.sh -A MIN[:CONF]
+RF_SAMPLE_RE = re.compile(r"^\d+(\.\d+)?$")  # wifi_test.sh -R SECONDS
+EARLY_ABORT_RE = re.compile(r"^(100|\d{1,2})(:[1-9]\d*)?$")  # wifi_test.sh -a PERCENT[:INTERVALS]
+RF_RSSI_RANGE = (-95.0, -20.0)  # dBm span of the chart's RSSI line
+
+
+def parse_qc_marker(line):
+    """'@@QC attempt phase=5G n=1 mbits=85' -> ('attempt', {'phase': '5G', ...}); None for other lines."""
+    line = line.strip()
+    if not line.startswith(QC_MARKER_PREFIX):
+        return None
+    event, _, rest = line[len(QC_MARKER_PREFIX):].partition(" ")
+    fields = {}
+    for item in rest.split():
+        key, _, value = item.partition("=")
+        fields[key] = value
+    return event, fields
+
 
 class ResultDialog(QDialog):
     """測試結果彈出對話框"""
@@ -229,6 +405,158 @@ class ResultDialog(QDialog):
             self.accept()  # 自動關閉對話框
 
 
+class ThroughputChart(QWidget):
+    """iperf interval throughput of the running band against its limit."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(110)
+        self.setMaximumHeight(140)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        # 固定大小的環形緩衝區：只保留最近 CHART_POINTS 個取樣
+        self._buf = array("f", bytes(4 * CHART_POINTS))
+        # 每個吞吐量取樣期間的最低 RSSI（沒有 RF 取樣時為 NaN）
+        self._rssi = array("f", [math.nan]) * CHART_POINTS
+        self._attempt_starts = []  # sample numbers where an iperf attempt started
+        self.band = ""
+        self.limit = 0.0
+        self.clear()
+        self._dirty = False
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.timeout.connect(self._repaint_if_dirty)
+        self._repaint_timer.start(1000 // CHART_FPS)
+    
+    def clear(self, band="", limit=0.0):
+        self.band = band
+        self.limit = limit
+        self._total = 0  # samples added since clear()
+        self._attempt_starts = []
+        self.rf_rssi = self.rf_rate = self.rf_quality = math.nan  # latest RF sample
+        self._rf_min = math.nan  # lowest RSSI since the last throughput sample
+        self._dirty = True
+    
+    def add_sample(self, mbits, attempt_start=False):
+        if attempt_start:
+            self._attempt_starts = [n for n in self._attempt_starts if n > self._total - CHART_POINTS]
+            self._attempt_starts.append(self._total)
+        self._buf[self._total % CHART_POINTS] = mbits
+        # RF slower than iperf: hold the last RSSI
+        self._rssi[self._total % CHART_POINTS] = self.rf_rssi if math.isnan(self._rf_min) else self._rf_min
+        self._rf_min = math.nan
+        self._total += 1
+        self._dirty = True
+    
+    def add_rf_sample(self, rssi, rate, quality):
+        self.rf_rssi, self.rf_rate, self.rf_quality = rssi, rate, quality
+        if not math.isnan(rssi) and not rssi >= self._rf_min:
+            self._rf_min = rssi
+        self._dirty = True
+    
+    def _repaint_if_dirty(self):
+        if self._dirty and self.isVisible():
+            self._dirty = False
+            self.update()
+    
+    def samples(self):
+        """Kept samples, oldest first."""
+        return self._ordered(self._buf)
+    
+    def rssi_samples(self):
+        """Lowest RSSI of each kept sample (NaN without RF samples), oldest first."""
+        return self._ordered(self._rssi)
+    
+    def _ordered(self, buf):
+        if self._total <= CHART_POINTS:
+            return buf[:self._total]
+        head = self._total % CHART_POINTS
+        return buf[head:] + buf[:head]
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#2c3e50"))
+        values = self.samples()
+        left, top = 6, 18
+        w, h = self.width() - 2 * left, self.height() - top - 6
+        if w <= 0 or h <= 0:
+            painter.end()
+            return
+        
+        peak = max(values) if values else 0.0
+        y_max = max(peak, self.limit * 1.5, 1.0) * 1.1
+        
+        def y(v):
+            return top + h - v / y_max * h
+        
+        n = len(values)
+        first = self._total - n  # sample number of values[0]
+        
+        def x(i):
+            return left + (i * w / (n - 1) if n > 1 else w / 2)
+        
+        # 每次 iperf 嘗試的起點
+        painter.setPen(QPen(QColor("#7f8c8d"), 1, Qt.DotLine))
+        for start in self._attempt_starts:
+            if start > first:
+                painter.drawLine(QLineF(x(start - first), top, x(start - first), top + h))
+        
+        if self.limit > 0:
+            painter.setPen(QPen(QColor("#e74c3c"), 1, Qt.DashLine))
+            painter.drawLine(QLineF(left, y(self.limit), left + w, y(self.limit)))
+        
+        painter.setPen(QPen(QColor("#2ecc71"), 1.5))
+        if n > w:
+            # 取樣多於像素寬度：每個像素欄畫 min/max，瞬間斷線不會被平均掉
+            for col in range(w):
+                lo = col * n // w
+                chunk = values[lo:max((col + 1) * n // w, lo + 1)]
+                painter.drawLine(QLineF(left + col, y(min(chunk)), left + col, y(max(chunk))))
+        elif n > 1:
+            painter.drawPolyline(*[QPointF(x(i), y(v)) for i, v in enumerate(values)])
+        elif n == 1:
+            painter.drawEllipse(QPointF(x(0), y(values[0])), 2, 2)
+        
+        # RSSI 以自己的刻度 (RF_RSSI_RANGE) 畫在同一時間軸上
+        rssi = self.rssi_samples()
+        lo_dbm, hi_dbm = RF_RSSI_RANGE
+        
+        def ry(v):
+            return top + h - (min(max(v, lo_dbm), hi_dbm) - lo_dbm) / (hi_dbm - lo_dbm) * h
+        
+        painter.setPen(QPen(QColor("#5dade2"), 1))
+        if n > w:
+            for col in range(w):
+                lo = col * n // w
+                chunk = [v for v in rssi[lo:max((col + 1) * n // w, lo + 1)] if not math.isnan(v)]
+                if chunk:
+                    painter.drawLine(QLineF(left + col, ry(min(chunk)), left + col, ry(max(chunk))))
+        else:
+            run = []
+            for i, v in enumerate(rssi):
+                if math.isnan(v):
+                    if len(run) > 1:
+                        painter.drawPolyline(*run)
+                    run = []
+                else:
+                    run.append(QPointF(x(i), ry(v)))
+            if len(run) > 1:
+                painter.drawPolyline(*run)
+        
+        painter.setPen(QColor("white"))
+        title = f"{self.band or 'WiFi'} throughput"
+        if n:
+            title += f"   last {values[-1]:.1f} Mbits/sec"
+        if self.limit > 0:
+            title += f"   limit {self.limit:g}"
+        if not math.isnan(self.rf_rssi):
+            title += f"   RSSI {self.rf_rssi:g} dBm"
+        if not math.isnan(self.rf_rate):
+            title += f"   rate {self.rf_rate:g} Mb/s"
+        if not math.isnan(self.rf_quality):
+            title += f"   quality {self.rf_quality:g}"
+        painter.drawText(left, 13, title)
+        painter.end()
+
+
 class SerialWorker(QThread):
     """串口工作線程"""
     log_received = pyqtSignal(str)
@@ -238,6 +566,10 @@ class SerialWorker(QThread):
     bt_started = pyqtSignal()  # bt test started signal
     bt_completed = pyqtSignal(str)  # bt test completed signal with result
     wifi_started = pyqtSignal()  # wifi test started signal (for BT first mode)
+    marker_received = pyqtSignal(str, object)  # @@QC event, fields
+    band_started = pyqtSignal(str, float)  # band, throughput limit (Mbits/sec)
+    throughput_sample = pyqtSignal(float, bool)  # interval Mbits/sec, first interval of an attempt
+    rf_sample = pyqtSignal(float, float, float)  # RSSI dBm, bit rate Mb/s, link quality (NaN if missing)
     
     @staticmethod
     def clean_terminal_output(text):
@@ -265,7 +597,8 @@ class SerialWorker(QThread):
         
         return text
     
-    def __init__(self, port, baudrate=115200, test_command="bash wifi_test.sh", bt_mac="", bt_first=False):
+    def __init__(self, port, baudrate=115200, test_command="bash wifi_test.sh", bt_mac="", bt_first=False,
+                 qc_markers=False, coex=False, iperf_lease=None):
         super().__init__()
         self.port = port
         self.baudrate = baudrate
@@ -276,9 +609,101 @@ class SerialWorker(QThread):
         self.test_command = test_command
         self.bt_mac = bt_mac
         self.bt_first = bt_first
+        self.coex = coex  # WiFi and BT at the same time (coex_test.sh)
+        # (pool address, owner, ttl): lease a private iperf server port in this thread, not the GUI's
+        self.iperf_lease = iperf_lease
+        self.iperf_port = None
         self.wifi_result = "UNKNOWN"
         self.bt_result = "UNKNOWN"
-        
+        # 腳本輸出 @@QC 標記時，結果只由 verdict 標記決定
+        self.qc_markers = qc_markers
+        self._verdicts = {}  # test ("wifi"/"bt") -> PASS/FAIL from its verdict marker
+        self._marker_handlers = {"verdict": self._on_verdict_marker, "rf": self._on_rf_marker}
+        self._band = ""
+        self._sum_last_t1 = 0.0  # end of the last [SUM] interval of the running iperf attempt
+        
+    def _lease_iperf_port(self):
+        """Lease a private iperf server port from iperf_pool.py and add it to the test command."""
+        if not self.iperf_lease:
+            return
+        address, owner, ttl = self.iperf_lease
+        try:
+            self.iperf_port = iperf_pool.lease_port(address, owner, ttl)
+        except (iperf_pool.PoolError, ValueError) as e:
+            self.log_received.emit(f"WARNING: iperf pool: {e} - using the default iperf ports")
+            return
+        self.test_command += f" -p {self.iperf_port}"
+        self.log_received.emit(f"iperf server port: {self.iperf_port} (leased from {address})")
+    
+    def release_iperf_port(self, timeout=iperf_pool.CLIENT_TIMEOUT_S):
+        if self.iperf_port is None:
+            return
+        port, self.iperf_port = self.iperf_port, None
+        address, owner, _ttl = self.iperf_lease
+        try:
+            # with the owner, so a late release cannot free a port since leased to another station
+            if not iperf_pool.release_port(address, port, owner=owner, timeout=timeout):
+                self.log_received.emit(f"WARNING: iperf port {port} was no longer leased to {owner}")
+        except (iperf_pool.PoolError, ValueError) as e:
+            self.log_received.emit(f"WARNING: could not release iperf port {port}: {e}")
+    
+    def _on_verdict_marker(self, fields):
+        self._verdicts[fields.get("test", "")] = fields.get("result", "UNKNOWN")
+    
+    def _on_rf_marker(self, fields):
+        def value(key):
+            try:
+                return float(fields.get(key, ""))
+            except ValueError:
+                return math.nan  # "NA": not reported by this driver
+        self.rf_sample.emit(value("rssi"), value("rate"), value("quality"))
+    
+    def _show_line(self, line, tag=""):
+        """Display a script output line; @@QC markers are dispatched instead of displayed."""
+        marker = parse_qc_marker(line)
+        if marker is None:
+            self.log_received.emit(tag + line.rstrip())
+            if not tag:
+                self._chart_line(line)
+            return
+        event, fields = marker
+        handler = self._marker_handlers.get(event)
+        if handler:
+            handler(fields)
+        self.marker_received.emit(event, fields)
+    
+    def _chart_line(self, line):
+        """Feed the throughput chart from the iperf [SUM] interval and band threshold lines."""
+        if "[SUM]" in line:
+            m = SUM_INTERVAL_RE.search(line)
+            if not m:
+                return
+            t0, t1 = float(m.group(1)), float(m.group(2))
+            if t0 == 0.0 and self._sum_last_t1 > 0.0:
+                # "0.0-120.0 sec": the attempt's total, not an interval
+                self._sum_last_t1 = 0.0
+                return
+            self._sum_last_t1 = t1
+            self.throughput_sample.emit(float(m.group(3)), t0 == 0.0)
+        elif "WiFi Connection Information" in line:
+            m = BAND_INFO_RE.search(line)
+            if m:
+                self._band = m.group(1)
+        elif "Throughput Threshold:" in line:
+            m = THRESHOLD_RE.search(line)
+            if m:
+                self._sum_last_t1 = 0.0
+                self.band_started.emit(self._band, float(m.group(1)))
+    
+    def test_verdict(self, line, test):
+        """PASS/FAIL once `line` ends the WiFi ("wifi") or BT ("bt") test, else None."""
+        if self.qc_markers:
+            # _show_line() has already dispatched this line's marker, if any
+            return self._verdicts.pop(test, None)
+        if RESULT_LINES[test] in line and (test == "bt" or "PASSED" in line or "FAILED" in line):
+            return self.parse_test_result(line)
+        return None
+    
     def run(self):
         """執行測試流程"""
         try:
@@ -308,6 +733,8 @@ class SerialWorker(QThread):
                 self.cleanup()
                 return
             
+            self._lease_iperf_port()
+            
             # 根據 bt_first 決定測試順序
             if self.bt_first and self.bt_mac:
                 # BT 優先測試
@@ -319,6 +746,15 @@ class SerialWorker(QThread):
                 self.run_bt_test_first()
                 # BT First 模式自己處理完整流程，直接返回
                 return
+            elif self.coex and self.bt_mac:
+                # WiFi + BT 同時測試
+                self.log_received.emit("\n" + "=" * 60)
+                self.log_received.emit("WiFi + BT Coexistence Mode: Testing WiFi and BT together")
+                self.log_received.emit("=" * 60)
+                self.status_changed.emit("Testing")
+                self.bt_started.emit()
+                self.run_coex_test()
+                return
             else:
                 # WiFi 優先測試（原有邏輯）
                 self.status_changed.emit("Testing")
@@ -364,20 +800,21 @@ class SerialWorker(QThread):
                         # 只在有實際內容時才記錄和顯示
                         if line and line.strip():
                             self.full_log += line
-                            self.log_received.emit(line.rstrip())
+                            self._show_line(line)
                             
                             # WiFi 測試完成行
-                            if line and "WiFi Test Result:" in line and ("PASSED" in line or "FAILED" in line):
+                            wifi_verdict = self.test_verdict(line, "wifi")
+                            if wifi_verdict:
                                 # 多讀取幾行以確保完整捕獲測試結果
                                 for _ in range(5):
                                     extra = self.serial_conn.readline().decode('utf-8', errors='ignore')
                                     extra = self.clean_terminal_output(extra)
                                     if extra and extra.strip():
                                         self.full_log += extra
-                                        self.log_received.emit(extra.rstrip())
+                                        self._show_line(extra)
                                 
                                 # 解析 WiFi 結果
-                                self.wifi_result = self.parse_test_result(line)
+                                self.wifi_result = wifi_verdict
                                 self.log_received.emit("\n" + "=" * 60)
                                 self.log_received.emit(f"WiFi Test Result: {self.wifi_result}")
                                 self.log_received.emit("=" * 60)
@@ -413,6 +850,7 @@ class SerialWorker(QThread):
             self.status_changed.emit("Stop")
             self.test_completed.emit("FAIL", "SKIP", self.full_log, "")
         finally:
+            self.release_iperf_port()
             self.cleanup()
     
     def run_bt_test_first(self):
@@ -427,7 +865,7 @@ class SerialWorker(QThread):
                 return
             
             # 發送 BT 測試命令
-            bt_command = f"bash bt_ping.sh {self.bt_mac}\n"
+            bt_command = f"bash bt_ping.sh {'-m ' if self.qc_markers else ''}{self.bt_mac}\n"
             self.serial_conn.write(bt_command.encode('utf-8'))
             self.log_received.emit(f">>> Sent command: {bt_command.strip()}")
             time.sleep(0.5)
@@ -441,19 +879,20 @@ class SerialWorker(QThread):
                         line = self.clean_terminal_output(line)
                         self.full_log += line
                         if line.strip():
-                            self.log_received.emit(line.rstrip())
+                            self._show_line(line)
                         
                         # 檢測 BT 測試結果
-                        if "Bluetooth Test Result:" in line:
+                        bt_verdict = self.test_verdict(line, "bt")
+                        if bt_verdict:
                             # 讀取剩餘幾行
                             for _ in range(3):
                                 extra = self.serial_conn.readline().decode('utf-8', errors='ignore')
                                 extra = self.clean_terminal_output(extra)
                                 self.full_log += extra
-                                self.log_received.emit(extra.rstrip())
+                                self._show_line(extra)
                             
                             # 解析 BT 結果
-                            self.bt_result = self.parse_test_result(line)
+                            self.bt_result = bt_verdict
                             self.log_received.emit("\n" + "=" * 60)
                             self.log_received.emit(f"Bluetooth Test Result: {self.bt_result}")
                             self.log_received.emit("=" * 60)
@@ -508,20 +947,21 @@ class SerialWorker(QThread):
                         # 只在有實際內容時才記錄和顯示
                         if line and line.strip():
                             self.full_log += line
-                            self.log_received.emit(line.rstrip())
+                            self._show_line(line)
                         
                         # 檢測 WiFi 測試結果
-                        if line and "WiFi Test Result:" in line and ("PASSED" in line or "FAILED" in line):
+                        wifi_verdict = self.test_verdict(line, "wifi") if line else None
+                        if wifi_verdict:
                             # 讀取剩餘幾行
                             for _ in range(5):
                                 extra = self.serial_conn.readline().decode('utf-8', errors='ignore')
                                 extra = self.clean_terminal_output(extra)
                                 if extra and extra.strip():
                                     self.full_log += extra
-                                    self.log_received.emit(extra.rstrip())
+                                    self._show_line(extra)
                             
                             # 解析 WiFi 結果
-                            self.wifi_result = self.parse_test_result(line)
+                            self.wifi_result = wifi_verdict
                             self.log_received.emit("\n" + "=" * 60)
                             self.log_received.emit(f"WiFi Test Result: {self.wifi_result}")
                             self.log_received.emit("=" * 60)
@@ -544,6 +984,94 @@ class SerialWorker(QThread):
             self.is_running = False
             self.test_completed.emit(self.wifi_result, self.bt_result, self.full_log, self.bt_mac)
     
+    def run_coex_test(self):
+        """WiFi + BT 同時測試：依 [WIFI] / [BT] 標籤分流輸出，兩個結果各自判定"""
+        try:
+            wifi_args = self.test_command.split("wifi_test.sh", 1)[1]
+            command = f"bash coex_test.sh {'-m ' if self.qc_markers else ''}{self.bt_mac}{wifi_args}\n"
+            self.serial_conn.write(command.encode('utf-8'))
+            self.log_received.emit(f">>> Sent command: {command.strip()}")
+            
+            bt_log = ""
+            pending = {"wifi", "bt"}
+            last_verdict = 0.0
+            self.is_running = True
+            while self.is_running:
+                if self.should_terminate:
+                    # coex_test.sh 收到 Ctrl+C 會一併結束 WiFi 與 BT 測試
+                    self.serial_conn.write(b'\x03')
+                    self.log_received.emit("\n>>> Sent Ctrl+C (Termination signal)")
+                    if self.wait_for_prompt():
+                        self.log_received.emit(">>> Prompt detected - Test fully terminated")
+                    else:
+                        self.log_received.emit(">>> Warning: Prompt not detected after termination")
+                    self.status_changed.emit("Terminated")
+                    self.test_completed.emit("TERMINATED", "SKIP", self.full_log + bt_log, "")
+                    return
+                
+                if not pending and time.time() - last_verdict > COEX_TAIL_S:
+                    break
+                
+                if self.serial_conn.in_waiting > 0:
+                    try:
+                        line = self.serial_conn.readline().decode('utf-8', errors='ignore')
+                        line = self.clean_terminal_output(line)
+                        if not line or not line.strip():
+                            continue
+                        m = COEX_TAG_RE.match(line)
+                        source, body = (m.group(1), m.group(2)) if m else ("WIFI", line)
+                        
+                        if source == "COEX":
+                            # coex_test.sh 結束：沒有結果的測試判為 FAIL
+                            self.log_received.emit(line.rstrip())
+                            for test in sorted(pending):
+                                self.log_received.emit(f"ERROR: no {test.upper()} result from coex_test.sh")
+                                self._coex_result(test, "FAIL")
+                            break
+                        
+                        if source == "BT":
+                            bt_log += body
+                            self._show_line(body, "[BT] ")
+                        else:
+                            self.full_log += body
+                            self._show_line(body)
+                        test = "bt" if source == "BT" else "wifi"
+                        verdict = self.test_verdict(body, test)
+                        if verdict and test in pending:
+                            pending.discard(test)
+                            last_verdict = time.time()
+                            self._coex_result(test, verdict)
+                    except Exception as e:
+                        self.log_received.emit(f"Error reading coex test: {str(e)}")
+                
+                time.sleep(0.01)
+            
+            # 存檔格式與循序模式相同：WiFi 輸出後接 BT 輸出
+            self.full_log += bt_log
+            self.is_running = False
+            final_result = "PASS" if self.wifi_result == "PASS" and self.bt_result == "PASS" else "FAIL"
+            self.status_changed.emit(final_result)
+            self.test_completed.emit(self.wifi_result, self.bt_result, self.full_log, self.bt_mac)
+        
+        except Exception as e:
+            self.log_received.emit(f"Coex test error: {str(e)}")
+            self.is_running = False
+            self.test_completed.emit("FAIL", "FAIL", self.full_log, self.bt_mac)
+    
+    def _coex_result(self, test, result):
+        if test == "wifi":
+            self.wifi_result = result
+            self.log_received.emit("\n" + "=" * 60)
+            self.log_received.emit(f"WiFi Test Result: {result}")
+            self.log_received.emit("=" * 60)
+            self.wifi_completed.emit(result)
+        else:
+            self.bt_result = result
+            self.log_received.emit("\n" + "=" * 60)
+            self.log_received.emit(f"Bluetooth Test Result: {result}")
+            self.log_received.emit("=" * 60)
+            self.bt_completed.emit(result)
+    
     def run_bt_test(self):
         """執行藍牙測試"""
         try:
@@ -556,7 +1084,7 @@ class SerialWorker(QThread):
                 return
             
             # 發送 BT 測試命令
-            bt_command = f"bash bt_ping.sh {self.bt_mac}\n"
+            bt_command = f"bash bt_ping.sh {'-m ' if self.qc_markers else ''}{self.bt_mac}\n"
             self.serial_conn.write(bt_command.encode('utf-8'))
             time.sleep(0.5)
             
@@ -571,21 +1099,22 @@ class SerialWorker(QThread):
                         # 只在有實際內容時才記錄和顯示
                         if line and line.strip():
                             self.full_log += line
-                            self.log_received.emit(line.rstrip())
+                            self._show_line(line)
                         
                         # 檢測 BT 測試結果
-                        if line and "Bluetooth Test Result:" in line:
+                        bt_verdict = self.test_verdict(line, "bt") if line else None
+                        if bt_verdict:
                             # 讀取剩餘幾行
                             for _ in range(3):
                                 extra = self.serial_conn.readline().decode('utf-8', errors='ignore')
                                 extra = self.clean_terminal_output(extra)
                                 if extra and extra.strip():
                                     self.full_log += extra
-                                    self.log_received.emit(extra.rstrip())
-                                    self.log_received.emit(extra.rstrip())
+                                    self._show_line(extra)
+                                    self._show_line(extra)
                             
                             # 解析 BT 結果
-                            self.bt_result = self.parse_test_result(line)
+                            self.bt_result = bt_verdict
                             self.log_received.emit("\n" + "=" * 60)
                             self.log_received.emit(f"Bluetooth Test Result: {self.bt_result}")
                             self.log_received.emit("=" * 60)
@@ -751,9 +1280,29 @@ class ConsoleWatchWorker(QThread):
 class WiFiTestGUI(QMainWindow):
     """WiFi壓力測試主視窗"""
     
-    def __init__(self, startup_station: str = "SOLO"):
+    def __init__(self, startup_station: str = "SOLO", iperf_pool_addr: str = "", qc_markers: bool = False,
+                 adaptive: str = "", rf_sample: str = "", early_abort: str = ""):
         super().__init__()
         self.startup_station = startup_station
+        # wifi_test.sh -a PERCENT[:INTERVALS]; empty = the script's default (off)
+        self.early_abort = early_abort
+        # wifi_test.sh -A MIN[:CONF]; empty = full iperf duration
+        self.adaptive = adaptive
+        # wifi_test.sh -R SECONDS; empty = no RF samples during iperf
+        self.rf_sample = rf_sample
+        # wifi_test.sh / bt_ping.sh on the DUT print @@QC markers (-m)
+        self.qc_markers = qc_markers
+        self._qc_marker_handlers = {
+            "begin": self._on_phase_begin_marker,
+            "attempt": self._on_attempt_marker,
+            "end": self._on_phase_end_marker,
+        }
+        # iperf_pool.py lease socket (HOST:PORT); empty = fixed 5001/5002 servers
+        self.iperf_pool_addr = iperf_pool_addr
+        # iperf2 server logs on this PC; tailed so each test can be joined to what the server received
+        self.iperf_server_logs = iperf_server_log.IperfServerLogs(
+            os.environ.get("IPERF_SERVER_LOGS", iperf_server_log.DEFAULT_LOG_GLOB))
+        self.test_start_ts = 0.0
         self.serial_worker = None
         self.watch_worker = None
         self.watch_mode = False
@@ -1308,6 +1857,33 @@ class WiFiTestGUI(QMainWindow):
         """)
         btprio_layout.addWidget(self.bt_first_btn)
         
+        self.bt_coex_btn = QPushButton("WiFi+BT")
+        self.bt_coex_btn.setCheckable(True)
+        self.bt_coex_btn.setChecked(False)
+        self.bt_coex_btn.setToolTip("Run WiFi and BT at the same time (coex_test.sh on the DUT)")
+        self.bt_coex_btn.clicked.connect(lambda: self.select_bt_priority("WiFi+BT"))
+        self.bt_coex_btn.setMinimumHeight(40)
+        self.bt_coex_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #95a5a6;
+                color: white;
+                font-size: 12px;
+                font-weight: bold;
+                border: none;
+                border-radius: 5px;
+            }
+            QPushButton:checked {
+                background-color: #16a085;
+            }
+            QPushButton:hover {
+                background-color: #7f8c8d;
+            }
+            QPushButton:checked:hover {
+                background-color: #138d75;
+            }
+        """)
+        btprio_layout.addWidget(self.bt_coex_btn)
+        
         self.bt_disable_btn = QPushButton("Disable")
         self.bt_disable_btn.setCheckable(True)
         self.bt_disable_btn.setChecked(False)
@@ -1553,6 +2129,10 @@ class WiFiTestGUI(QMainWindow):
         
         main_layout.addWidget(status_group)
         
+        # 即時吞吐量圖 (iperf [SUM] 每個 interval)
+        self.throughput_chart = ThroughputChart()
+        main_layout.addWidget(self.throughput_chart)
+        
         # Log顯示區
         log_group = QGroupBox("Test Execution Log")
         log_group.setStyleSheet("""
@@ -1652,6 +2232,11 @@ class WiFiTestGUI(QMainWindow):
         self.test_timer.timeout.connect(self.update_test_time)
         self.test_timer.setInterval(1000)  # 每秒更新
         
+        # iperf 伺服器 log 追蹤 (server 輸出沒有時間戳記，需即時讀取)
+        self.server_log_timer = QTimer()
+        self.server_log_timer.timeout.connect(self.iperf_server_logs.poll)
+        self.server_log_timer.start(1000)
+        
         # 快捷鍵序列追蹤
         self.key_sequence = []
         self.key_sequence_timer = QTimer()
@@ -1828,8 +2413,9 @@ class WiFiTestGUI(QMainWindow):
     
     def select_bt_priority(self, priority):
         """選擇 BT Test Priority"""
-        if priority == "WiFi First":
-            self.bt_wifi_first_btn.setChecked(True)
+        self.bt_coex_btn.setChecked(priority == "WiFi+BT")
+        if priority in ("WiFi First", "WiFi+BT"):
+            self.bt_wifi_first_btn.setChecked(priority == "WiFi First")
             self.bt_first_btn.setChecked(False)
             self.bt_disable_btn.setChecked(False)
             # 重新啟用 WiFi Band Priority 按鈕
@@ -2334,6 +2920,7 @@ class WiFiTestGUI(QMainWindow):
         
         # 保存測試開始時間和端口資訊
         self.test_start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.test_start_ts = time.time()
         self.test_port = port
         
         # 清空Log
@@ -2360,6 +2947,7 @@ class WiFiTestGUI(QMainWindow):
         # 檢查 BT 測試優先順序
         bt_first = self.bt_first_btn.isChecked()
         bt_disabled = self.bt_disable_btn.isChecked()
+        bt_coex = self.bt_coex_btn.isChecked()
         
         # 檢查 Test Level
         test_level = "l2"  # 預設
@@ -2408,17 +2996,30 @@ class WiFiTestGUI(QMainWindow):
         else:  # 2.4G
             test_command = f"bash wifi_test.sh -d {test_level} -c bgn -s {ssid_param}"
             band_info = "2.4G"
+
+        if self.qc_markers:
+            test_command += " -m"
+        if self.early_abort:
+            test_command += f" -a {self.early_abort}"
+        if self.adaptive and self.adaptive != "0":
+            test_command += f" -A {self.adaptive}"
+        if self.rf_sample and float(self.rf_sample) > 0:
+            test_command += f" -R {self.rf_sample}"
         
         self.log_display.append(f"Band: {band_info}")
         self.log_display.append(f"Test Level: {test_level.upper()}")
         self.log_display.append(f"WIFI Station: {self.station_combo.currentText()}")
         self.log_display.append(f"Command: {test_command}")
+        iperf_lease = self._iperf_lease(test_level)
+        if iperf_lease:
+            self.log_display.append(f"iperf server port: leased from {self.iperf_pool_addr} when the test starts")
         self.log_display.append("=" * 60)
         
         # 重置並啟動測試計時器
         self.test_elapsed_seconds = 0
         self.time_label.setText("0 sec")
         self.test_timer.start()
+        self.throughput_chart.clear()
         
         # 根據測試優先順序更新狀態
         if bt_disabled:
@@ -2432,6 +3033,11 @@ class WiFiTestGUI(QMainWindow):
             self.update_test_status_color(self.bt_status_label, "Testing")
             self.update_test_status_color(self.wifi_status_label, "IDLE")
             bt_mac_to_use = self.host_bt_mac
+        elif bt_coex and self.host_bt_mac:
+            self.log_display.append("Test Priority: WiFi + BT together (coexistence)")
+            self.update_test_status_color(self.wifi_status_label, "Testing")
+            self.update_test_status_color(self.bt_status_label, "Testing")
+            bt_mac_to_use = self.host_bt_mac
         else:
             self.log_display.append("Test Priority: WiFi First")
             self.update_test_status_color(self.wifi_status_label, "Testing")
@@ -2441,7 +3047,12 @@ class WiFiTestGUI(QMainWindow):
         self.log_display.append("=" * 60)
         
         # 啟動串口工作線程
-        self.serial_worker = SerialWorker(port, test_command=test_command, bt_mac=bt_mac_to_use, bt_first=bt_first)
+        self.serial_worker = SerialWorker(port, test_command=test_command, bt_mac=bt_mac_to_use, bt_first=bt_first,
+                                          qc_markers=self.qc_markers, coex=bt_coex, iperf_lease=iperf_lease)
+        self.serial_worker.marker_received.connect(self.on_qc_marker)
+        self.serial_worker.band_started.connect(self.throughput_chart.clear)
+        self.serial_worker.throughput_sample.connect(self.throughput_chart.add_sample)
+        self.serial_worker.rf_sample.connect(self.throughput_chart.add_rf_sample)
         self.serial_worker.log_received.connect(self.append_log)
         self.serial_worker.status_changed.connect(self.on_status_changed)
         self.serial_worker.wifi_completed.connect(self.on_wifi_completed)
@@ -2461,6 +3072,32 @@ class WiFiTestGUI(QMainWindow):
             self.serial_worker.terminate_test()
             self.terminate_btn.setEnabled(False)
     
+    def on_qc_marker(self, event, fields):
+        """@@QC marker from the running script (verdicts are handled by SerialWorker)."""
+        handler = self._qc_marker_handlers.get(event)
+        if handler:
+            handler(fields)
+
+    def _wifi_band_phase(self, fields):
+        phase = fields.get("phase", "")
+        return phase if phase in ("5G", "2.4G") else ""
+
+    def _on_phase_begin_marker(self, fields):
+        band = self._wifi_band_phase(fields)
+        if band:
+            self.update_test_status_color(self.wifi_status_label, "Testing")
+            self.wifi_status_label.setText(f"{band} ...")
+
+    def _on_attempt_marker(self, fields):
+        band = self._wifi_band_phase(fields)
+        if band:
+            self.wifi_status_label.setText(f"{band} #{fields.get('n', '?')}: {fields.get('mbits', '?')} Mbps")
+
+    def _on_phase_end_marker(self, fields):
+        band = self._wifi_band_phase(fields)
+        if band:
+            self.wifi_status_label.setText(f"{band} {fields.get('result', '')}")
+
     def append_log(self, text):
         """添加Log"""
         self.log_display.append(text)
@@ -2492,6 +3129,35 @@ class WiFiTestGUI(QMainWindow):
         """狀態改變處理"""
         self.update_status_color(status)
     
+    def _iperf_lease(self, test_level):
+        """(pool address, owner, ttl) of the iperf port lease; SerialWorker leases it off the GUI thread."""
+        if not self.iperf_pool_addr:
+            return None
+        seconds = {"l0": 10, "l1": 30, "l2": 120, "l3": 180}.get(test_level) or int(test_level)
+        # Up to 3 attempts per band; the worker releases the port as soon as the test ends.
+        ttl = max(iperf_pool.LEASE_TTL_S, 6 * seconds + 600)
+        owner = f"{self.station_combo.currentText()} {self.port_combo.currentText()}"
+        return self.iperf_pool_addr, owner, ttl
+
+    def closeEvent(self, event):
+        if self.serial_worker and self.serial_worker.isRunning():
+            # The worker may not get to its own release; the lease TTL covers an unreachable pool.
+            self.serial_worker.release_iperf_port(timeout=IPERF_POOL_CLOSE_TIMEOUT_S)
+        self.server_log_timer.stop()
+        self.iperf_server_logs.close()
+        super().closeEvent(event)
+
+    def _server_throughput_lines(self, log_content):
+        """Server-side rate of each iperf attempt of this test (empty without server logs)."""
+        if not self.iperf_server_logs:
+            return []
+        client_ips = iperf_server_log.dut_client_ips(log_content)
+        if not client_ips:
+            return []
+        self.iperf_server_logs.poll()  # pick up the final reports written since the last tick
+        segments = self.iperf_server_logs.match(client_ips, self.test_start_ts, time.time())
+        return iperf_server_log.format_server_section(segments, log_content)
+
     def on_test_completed(self, wifi_result, bt_result, full_log, bt_mac):
         """測試完成處理"""
         # 停止測試計時器
@@ -2579,6 +3245,8 @@ class WiFiTestGUI(QMainWindow):
         filename = f"{date_str}_{sn_clean}_{mac1_clean}_{mac2_clean}_{final_result}.txt"
         filepath = os.path.join(log_dir, filename)
         
+        server_lines = self._server_throughput_lines(log_content)
+        
         # 寫入文件
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -2594,6 +3262,12 @@ class WiFiTestGUI(QMainWindow):
                 f.write("=" * 60 + "\n\n")
                 # 寫入測試執行 log
                 f.write(log_content)
+                # 寫入 iperf 伺服器端吞吐量 (與 DUT [SUM] 對照)
+                if server_lines:
+                    f.write("\n" + "=" * 60 + "\n")
+                    f.write("iperf Server-side Throughput\n")
+                    f.write("=" * 60 + "\n")
+                    f.write("\n".join(server_lines) + "\n")
                 # 寫入測試結果
                 f.write("\n" + "=" * 60 + "\n")
                 f.write("Test Results Summary\n")
@@ -2610,13 +3284,15 @@ class WiFiTestGUI(QMainWindow):
 
 
 def main():
-    startup_station, qt_argv = parse_startup_options(sys.argv)
+    startup_station, iperf_pool_addr, qc_markers, adaptive, rf_sample, early_abort, qt_argv = \
+        parse_startup_options(sys.argv)
     app = QApplication(qt_argv)
     
     # 設置應用樣式
     app.setStyle('Fusion')
     
-    window = WiFiTestGUI(startup_station=startup_station)
+    window = WiFiTestGUI(startup_station=startup_station, iperf_pool_addr=iperf_pool_addr, qc_markers=qc_markers,
+                         adaptive=adaptive, rf_sample=rf_sample, early_abort=early_abort)
     window.show()
     
     sys.exit(app.exec_())